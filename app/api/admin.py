@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Query
+from app.db.retention import retention_manager, database_stats
+
+router = APIRouter()
+
+def _policy():
+    return {
+        "max_age_days": retention_manager.max_age_days,
+        "max_rows": retention_manager.max_rows,
+        "archive_dir": retention_manager.archive_dir,
+        "maintenance_window": "{}-{}".format(*retention_manager.window)
+    }
+
+@router.get("/storage")
+async def storage_report():
+    """Database size, row counts and what the last retention run reclaimed"""
+    return {
+        "database": database_stats(),
+        "retention": _policy(),
+        "last_run": retention_manager.last_run
+    }
+
+@router.post("/retention/run")
+def run_retention(vacuum: bool = Query(True, description="Also return freed pages to the filesystem")):
+    """Apply the retention policy now instead of waiting for the maintenance window"""
+    return {
+        "run": retention_manager.run(vacuum=vacuum),
+        "database": database_stats()
+    }
@@ -1,48 +1,298 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.schema import JobCreate
+from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import StreamingResponse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from app.core.schema import JobCreate, BatchCreate, Intent, ExecutionResult
 from app.core.agent_core import DeskMateAgent
-from app.db.database import get_db
-from app.db.models import Job
+from app.core.job_runner import JobRunner, job_status
+from app.core.profiler import PROFILE_HEADER, should_profile
+from app.db.job_writer import job_writer
+import os
 import uuid
 import json
+import time
+import asyncio
+
+# Lines a shell stream may queue for a slow client before it starts dropping them
+SHELL_STREAM_BACKLOG = 1000
+
+BATCH_MAX_COMMANDS = int(os.getenv("DESKMATE_BATCH_MAX_COMMANDS", "100"))
+BATCH_CONCURRENCY = int(os.getenv("DESKMATE_BATCH_CONCURRENCY", "4"))
 
 router = APIRouter()
 agent = DeskMateAgent()
+job_runner = JobRunner(agent)
 
 @router.post("/query")
-async def process_agent_query(request: JobCreate, db: Session = Depends(get_db)):
-    """Process a natural language command through the agent"""
+async def process_agent_query(request: JobCreate, profile: Optional[str] = Header(None, alias=PROFILE_HEADER)):
+    """Queue a natural language command for the agent and return its job id immediately.
+
+    Send the X-DeskMate-Profile: 1 header (or set DESKMATE_PROFILE_SAMPLE=N to
+    sample 1 in N commands) to record a cProfile of the run, downloadable
+    from /api/v1/jobs/{job_id}/profile.
+    """
     
     # Generate job ID
     job_id = str(uuid.uuid4())
     
-    # Process command
-    result = agent.process_command(request.command)
+    # Queue the row ahead of any update a worker makes; it is committed in the background
+    db_job = job_writer.insert(job_id, command=request.command, status="pending")
     
-    # Store job in database
-    db_job = Job(
-        job_id=job_id,
-        command=request.command,
-        intent=result["intent"]["intent"],
-        status="completed",
-        result=json.dumps(result)
-    )
+    # Hand the command to the worker pool; poll or wait on /api/v1/jobs/{job_id}
+    profiled = should_profile(profile)
+    job_runner.submit(job_id, request.command, profile=profiled)
+    
+    return {
+        "job_id": job_id,
+        "command": request.command,
+        "status": "pending",
+        "profiled": profiled,
+        "created_at": db_job["created_at"].isoformat()
+    }
+
+@router.post("/batch")
+def process_agent_batch(request: BatchCreate):
+    """Run a list of commands and return every result, in the order submitted.
+
+    Identical commands (ignoring surrounding whitespace) run once and share a
+    job. Distinct commands run concurrently, at most max_concurrency at a
+    time, and all of their Job rows are committed in one transaction. If that
+    transaction fails the rows go through the write-behind queue one by one
+    instead, and "persisted" says whether they were all committed.
+    """
+    if not request.commands:
+        raise HTTPException(status_code=400, detail="No commands given")
+    if len(request.commands) > BATCH_MAX_COMMANDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_COMMANDS} commands per batch")
+    
+    start_time = time.time()
+    unique = list(dict.fromkeys(command.strip() for command in request.commands))
+    workers = max(1, min(request.max_concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY, len(unique)))
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deskmate-batch") as pool:
+        outcomes = list(pool.map(_run_batch_command, unique))
+    
+    rows = {}
+    by_command = {}
+    for command, result in zip(unique, outcomes):
+        job_id = str(uuid.uuid4())
+        result["job_id"] = job_id
+        rows[job_id] = {
+            "command": command,
+            "intent": (result.get("intent") or {}).get("intent"),
+            "status": job_status(result),
+            "result": json.dumps(result)
+        }
+        by_command[command] = (job_id, result)
+    persisted = _persist_batch(rows)
+    
+    results = []
+    seen = set()
+    for index, command in enumerate(request.commands):
+        job_id, result = by_command[command.strip()]
+        results.append({
+            "index": index,
+            "command": command,
+            "job_id": job_id,
+            "status": rows[job_id]["status"],
+            "duplicate": job_id in seen,
+            "result": result
+        })
+        seen.add(job_id)
+    
+    return {
+        "total": len(request.commands),
+        "unique": len(unique),
+        "succeeded": sum(1 for r in results if r["result"].get("success")),
+        "results": results,
+        "persisted": persisted,
+        "execution_time": round(time.time() - start_time, 2)
+    }
+
+def _persist_batch(rows: dict) -> bool:
+    """Commit the batch's Job rows; the results are returned either way"""
+    try:
+        job_writer.insert_many(rows)
+        return True
+    except Exception as e:
+        # One bad row (or a locked database) must not lose the results that already ran
+        print(f"⚠️ Batch insert failed, queueing {len(rows)} job(s) individually: {e}")
+        for job_id, fields in rows.items():
+            job_writer.insert(job_id, **fields)
+        return job_writer.flush(timeout=10)
+
+def _run_batch_command(command: str) -> dict:
+    try:
+        return agent.process_command(command)
+    except Exception as e:
+        print(f"❌ Batch command failed: {e}")
+        return {"command": command, "success": False, "error": f"Error processing command: {str(e)}"}
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/answer/stream")
+async def stream_answer(request: JobCreate):
+    """Answer a question over Server-Sent Events, forwarding Gemini tokens as they arrive.
+
+    Events: "job" (job_id), "token" (text), "error", and "done" with the same
+    payload /query stores; the Job row is persisted when the stream ends.
+    """
+    job_id = str(uuid.uuid4())
+    job_writer.insert(job_id, command=request.command, intent="general_qa", status="running")
     
-    db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    def event_stream():
+        start_time = time.time()
+        parts = []
+        answer_type = "ai_generated"
+        error = None
+        finished = False
+        try:
+            yield _sse("job", {"job_id": job_id, "status": "running"})
+            for text, answer_type in agent.executor.stream_answer(request.command):
+                parts.append(text)
+                yield _sse("token", {"text": text})
+            finished = True
+        except Exception as e:
+            error = f"Answer stream failed: {str(e)}"
+        finally:
+            # Runs on normal completion, errors and client disconnects alike
+            result = _answer_result(job_id, request.command, "".join(parts).strip(), answer_type,
+                                    finished, error or (None if finished else "Client disconnected"),
+                                    round(time.time() - start_time, 2))
+            _finish_job(job_id, result)
+        
+        if error:
+            yield _sse("error", {"error": error})
+        yield _sse("done", result)
     
-    # Return the complete result
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def _answer_result(job_id: str, question: str, answer: str, answer_type: str,
+                   success: bool, error: Optional[str], execution_time: float) -> dict:
+    """Shape a streamed answer like a process_command result"""
+    intent = Intent(
+        intent="general_qa",
+        target=question,
+        steps=[{"action": "answer_question", "params": {"question": question}}],
+        assumptions=["question is answerable"]
+    )
+    output = {
+        "success": success,
+        "answer": answer,
+        "question": question,
+        "answer_type": answer_type,
+        "is_conversational": True
+    }
+    return _stream_result(job_id, question, intent, output, success, error, answer, execution_time)
+
+def _stream_result(job_id: str, command: str, intent: Intent, output: dict, success: bool,
+                   error: Optional[str], message: str, execution_time: float) -> dict:
+    """The process_command result for a single-step command that was streamed"""
+    step = intent.steps[0]
     return {
-        **result,
+        "command": command,
+        "intent": intent.dict(),
+        "results": [{
+            "action": step["action"],
+            "params": step["params"],
+            "result": ExecutionResult(success=success, output=output, error=error).dict()
+        }],
+        "success": success,
+        "requires_confirmation": intent.confirmation_required,
         "job_id": job_id,
-        "status": "completed",
-        "created_at": db_job.created_at.isoformat()
+        "friendly_response": f"{message}\n\n(Executed in {execution_time}s)",
+        "execution_time": execution_time
     }
 
+@router.post("/shell/stream")
+async def stream_shell(request: JobCreate):
+    """Run a whitelisted shell command, streaming its output over Server-Sent Events.
+
+    Events: "job" (job_id), "stdout"/"stderr" (one per line), and "done" with
+    the same payload /query stores. Only the tail of the output is persisted;
+    POST /api/v1/jobs/{job_id}/cancel stops the command.
+    """
+    shell_runner = agent.executor.shell_runner
+    job_id = str(uuid.uuid4())
+    job_writer.insert(job_id, command=request.command, intent="run_shell_command", status="running")
+    
+    async def event_stream():
+        start_time = time.time()
+        lines: asyncio.Queue = asyncio.Queue()
+        dropped = 0
+        
+        def on_line(stream: str, line: str):
+            # A client that reads slower than the command writes loses lines, not memory
+            nonlocal dropped
+            if lines.qsize() >= SHELL_STREAM_BACKLOG:
+                dropped += 1
+            else:
+                lines.put_nowait((stream, line))
+        
+        task = asyncio.create_task(shell_runner.execute(request.command, on_line=on_line, job_id=job_id))
+        task.add_done_callback(lambda _: lines.put_nowait(None))
+        output = None
+        try:
+            yield _sse("job", {"job_id": job_id, "status": "running"})
+            while True:
+                item = await lines.get()
+                if item is None:
+                    break
+                if dropped:
+                    yield _sse("dropped", {"lines": dropped})
+                    dropped = 0
+                yield _sse(item[0], {"line": item[1]})
+            output = task.result()
+        except Exception as e:
+            output = {"success": False, "error": f"Shell stream failed: {str(e)}", "output": None}
+        finally:
+            # Runs on normal completion, errors and client disconnects alike
+            if not task.done():
+                task.cancel()
+            if output is None:
+                output = {"success": False, "error": "Client disconnected", "output": None, "cancelled": True}
+            intent = Intent(
+                intent="run_shell_command",
+                target=request.command,
+                steps=[{"action": "run_shell", "params": {"command": request.command}}],
+                confirmation_required=True,
+                assumptions=["command is safe and whitelisted"]
+            )
+            result = _stream_result(job_id, request.command, intent, output, output["success"],
+                                    None if output["success"] else output.get("error"),
+                                    output.get("friendly_message") or output.get("error", ""),
+                                    round(time.time() - start_time, 2))
+            _finish_job(job_id, result)
+        
+        yield _sse("done", result)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def _finish_job(job_id: str, result: dict):
+    job_writer.update(job_id, status=job_status(result), result=json.dumps(result))
+
 @router.get("/intent/{command}")
 async def parse_intent_only(command: str):
     """Parse command intent without execution (for testing)"""
     intent = agent.llm_client.parse_intent(command)
-    return intent.dict()
\ No newline at end of file
+    return intent.dict()
+
+
+@router.get("/intent-cache")
+async def intent_cache_stats():
+    """Hit/miss counters and size of the Gemini intent-parse cache"""
+    cache = getattr(agent.llm_client, "intent_cache", None)
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+@router.delete("/intent-cache")
+async def invalidate_intent_cache(command: Optional[str] = None):
+    """Invalidate one cached command, or the whole cache when no command is given"""
+    cache = getattr(agent.llm_client, "intent_cache", None)
+    if cache is None:
+        return {"enabled": False, "removed": 0}
+    return {"enabled": True, "removed": cache.invalidate(command)}
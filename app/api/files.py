@@ -1,19 +1,81 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks, Query
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 import os
-import shutil
 from app.db.database import get_db
 from app.db.models import File as FileModel
 from app.core.schema import FileUploadResponse
+from app.core.upload_store import UPLOAD_DIR, MAX_UPLOAD_BYTES, UploadTooLarge, store_upload
+from app.core.content_index import content_index
 
 router = APIRouter()
 
 # Create uploads directory if it doesn't exist
-UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Multipart framing around the file itself
+UPLOAD_OVERHEAD_BYTES = 64 * 1024
+
+class UploadSizeLimit:
+    """ASGI middleware that caps upload bodies as they arrive.
+
+    Starlette spools the whole multipart body before the endpoint runs, so the
+    limit has to be enforced here: a declared Content-Length over the limit is
+    refused before anything is read, and chunked or undeclared bodies are cut
+    off with a 413 as soon as the bytes received pass it.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_UPLOAD_BYTES + UPLOAD_OVERHEAD_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].endswith("/files/upload"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        declared = headers.get(b"content-length", b"").decode()
+        if declared.isdigit() and int(declared) > self.max_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Answer now; the endpoint sees a disconnected client and its own reply is dropped
+                    rejected = True
+                    await self._reject(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+    async def _reject(self, scope, receive, send):
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": f"File too large. Maximum upload size is {MAX_UPLOAD_BYTES} bytes."}
+        )
+        await response(scope, receive, send)
+
 @router.post("/upload", response_model=FileUploadResponse)
-async def upload_file(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def upload_file(background_tasks: BackgroundTasks, file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Upload a file for processing"""
     
     # Validate file type
@@ -23,31 +85,55 @@ async def upload_file(file: UploadFile = File(...), db: Session = Depends(get_db
     if file_extension not in allowed_types:
         raise HTTPException(status_code=400, detail="File type not supported. Only PDF and TXT files are supported.")
     
-    # Save file
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Stream to content-addressed storage; identical content is only stored once
+    try:
+        file_path, content_hash, size, duplicate = await store_upload(file, file_extension)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail=f"File too large. Maximum upload size is {MAX_UPLOAD_BYTES} bytes.")
     
     # Store file metadata in database
     db_file = FileModel(
         filename=file.filename,
         file_path=file_path,
-        file_type=file_extension
+        file_type=file_extension,
+        content_hash=content_hash,
+        size=size
     )
     
     db.add(db_file)
     db.commit()
     db.refresh(db_file)
     
+    # Extract and full-text index the content once the response is sent
+    background_tasks.add_task(content_index.index_file, content_hash, file_path)
+    
     return FileUploadResponse(
         filename=file.filename,
         file_path=file_path,
-        message="File uploaded successfully"
+        message="File already stored, linked to existing copy" if duplicate else "File uploaded successfully",
+        content_hash=content_hash,
+        size=size,
+        duplicate=duplicate
     )
 
 @router.get("/list")
 async def list_uploaded_files(db: Session = Depends(get_db)):
     """List all uploaded files"""
     files = db.query(FileModel).all()
-    return [{"filename": f.filename, "file_path": f.file_path, "uploaded_at": f.uploaded_at} for f in files]
\ No newline at end of file
+    return [{"filename": f.filename, "file_path": f.file_path, "uploaded_at": f.uploaded_at} for f in files]
+
+
+@router.get("/search")
+async def search_file_contents(
+    q: str = Query(..., min_length=1, description="Words to find inside uploaded documents"),
+    limit: int = Query(10, ge=1, le=100)
+):
+    """Full-text search over the contents of uploaded files, ranked with snippets"""
+    results = content_index.search(q, limit)
+    return {"query": q, "results": results, "result_count": len(results)}
+
+@router.post("/reindex")
+async def reindex_files(background_tasks: BackgroundTasks):
+    """Index any registered files that are missing from the full-text index"""
+    background_tasks.add_task(content_index.index_missing)
+    return {"message": "Reindexing started"}
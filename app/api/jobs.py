@@ -1,33 +1,154 @@
-from fastapi import APIRouter, HTTPException, Depends
+import json
+import base64
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.db.models import Job
+from app.db.job_writer import job_writer
+from app.db.result_store import load_result
 from app.core.schema import JobResponse
+from app.core.profiler import load_profile, profile_report
+from app.api.agent import job_runner
 
 router = APIRouter()
 
-@router.get("/{job_id}", response_model=JobResponse)
-async def get_job_status(job_id: str, db: Session = Depends(get_db)):
-    """Get job status and result"""
+JOB_FIELDS = ("job_id", "command", "intent", "status", "result", "result_ref", "result_size", "progress", "created_at")
+
+def _load_job(db: Session, job_id: str) -> Optional[dict]:
+    """The job as committed, overlaid with changes the write-behind queue has not committed yet"""
     job = db.query(Job).filter(Job.job_id == job_id).first()
+    pending = job_writer.pending(job_id)
+    if job is None and not (pending and pending.get("_insert")):
+        return None
+    
+    fields = {name: getattr(job, name) for name in JOB_FIELDS} if job else {"job_id": job_id}
+    fields.update({k: v for k, v in (pending or {}).items() if k in JOB_FIELDS})
+    if pending and "result" in pending:
+        # Not packed yet; the queued result replaces whatever was offloaded before
+        fields["result_ref"] = None
+        fields["result_size"] = len(pending["result"].encode("utf-8")) if pending["result"] is not None else None
+    return fields
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job_status(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for a queued job to finish"),
+    include_result: bool = Query(False, description="Also fetch a large offloaded result (result_offloaded is true)"),
+    db: Session = Depends(get_db)
+):
+    """Get job status and result.
+
+    Large results live compressed in job_results and are only read and
+    decompressed when asked for with include_result=true; small results are
+    always returned inline.
+    """
+    job = _load_job(db, job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    if wait and job["status"] in ("pending", "running"):
+        await job_runner.wait(job_id, wait)
+        db.expire_all()
+        job = _load_job(db, job_id)
+    
+    result = job.get("result")
+    offloaded = result is None and bool(job.get("result_ref"))
+    if offloaded and include_result:
+        result = load_result(db.connection(), job["result_ref"])
+    
     return JobResponse(
-        job_id=job.job_id,
-        status=job.status,
-        result=job.result,
-        created_at=job.created_at
+        job_id=job["job_id"],
+        status=job["status"],
+        result=result,
+        result_size=job.get("result_size"),
+        result_offloaded=offloaded,
+        progress=json.loads(job["progress"]) if job.get("progress") else None,
+        created_at=job["created_at"]
     )
 
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: str, db: Session = Depends(get_db)):
+    """Cancel a queued job or stop the shell command a job is running"""
+    job = _load_job(db, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    cancelled = job_runner.cancel(job_id)
+    if not cancelled and job["status"] in ("pending", "running"):
+        raise HTTPException(status_code=409, detail="Job is running a step that cannot be cancelled")
+    
+    return {"job_id": job_id, "cancelled": cancelled, "status": "cancelled" if cancelled else job["status"]}
+
+@router.get("/{job_id}/profile")
+async def get_job_profile(
+    job_id: str,
+    format: str = Query("pstats", pattern="^(pstats|text)$", description="pstats dump for snakeviz/pstats, or a text listing"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    limit: int = Query(40, ge=1, le=500)
+):
+    """Download the cProfile trace recorded for a profiled job"""
+    raw = load_profile(job_id)
+    if raw is None:
+        raise HTTPException(status_code=404, detail="No profile recorded for this job")
+    
+    if format == "text":
+        return PlainTextResponse(profile_report(raw, limit, sort))
+    return Response(content=raw, media_type="application/octet-stream",
+                    headers={"Content-Disposition": f'attachment; filename="{job_id}.prof"'})
+
+def encode_cursor(row_id: int) -> str:
+    raw = json.dumps([row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        (row_id,) = json.loads(raw)
+        return int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/")
-async def list_jobs(db: Session = Depends(get_db)):
-    """List all jobs"""
-    jobs = db.query(Job).order_by(Job.created_at.desc()).limit(50).all()
+def list_jobs(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    status: Optional[str] = None,
+    intent: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """List jobs newest first (by id, the order they were written), one keyset page at a time.
+
+    The next page's cursor is returned in the X-Next-Cursor header (absent on
+    the last page), so the body stays a plain list.
+    """
+    # Include jobs still waiting in the write-behind queue (a plain def, so the wait runs in the threadpool)
+    job_writer.flush(timeout=1)
+    
+    # Only the listed columns; never the (potentially huge) result text
+    query = db.query(Job.id, Job.job_id, Job.command, Job.intent, Job.status, Job.created_at)
+    if status:
+        query = query.filter(Job.status == status)
+    if intent:
+        query = query.filter(Job.intent == intent)
+    if cursor:
+        # Keyed on id alone: created_at is stored as text with or without fractional
+        # seconds, so comparing it against a bound datetime misorders same-second rows
+        query = query.filter(Job.id < decode_cursor(cursor))
+    
+    rows = query.order_by(Job.id.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].id)
+    
     return [{
         "job_id": j.job_id,
         "command": j.command,
+        "intent": j.intent,
         "status": j.status,
         "created_at": j.created_at
-    } for j in jobs]
\ No newline at end of file
+    } for j in rows]
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Query
+from app.core.metrics_sampler import host_info, metrics_sampler
+
+router = APIRouter()
+
+@router.get("/info")
+async def system_info():
+    """Static host facts plus the latest CPU/RAM/disk sample"""
+    return {
+        "host": host_info(),
+        "latest": metrics_sampler.latest(),
+        "sampling": metrics_sampler.available
+    }
+
+@router.get("/history")
+async def system_history(minutes: float = Query(5, gt=0, le=1440, description="How far back to return samples")):
+    """CPU/RAM/disk samples from the last N minutes, oldest first"""
+    samples = metrics_sampler.history(minutes)
+    return {
+        "minutes": minutes,
+        "interval_seconds": metrics_sampler.interval,
+        "count": len(samples),
+        "samples": samples
+    }
@@ -1,22 +1,49 @@
+import os
 import uuid
-from typing import Dict, Any
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional
 from app.core.schema import Intent, ActionStep, ExecutionResult
 from app.core.llm_client import GeminiLLMClient
 from app.core.executor import ActionExecutor
+from app.core.profiler import run_profiled
 
 class DeskMateAgent:
     """Main AI agent that coordinates intent parsing and execution"""
     
     def __init__(self):
-        try:
-            self.llm_client = GeminiLLMClient()
-            print("✅ Using Gemini LLM for intent parsing")
-        except Exception as e:
-            from app.core.llm_client import RobustMockLLMClient
-            self.llm_client = RobustMockLLMClient()
-            print(f"⚠️ Using Mock LLM (Gemini not available): {e}")
+        # Built on the first command, so constructing the agent does not configure Gemini
+        self._llm_client = None
+        self._llm_lock = threading.Lock()
         
         self.executor = ActionExecutor()
+        self.step_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("DESKMATE_STEP_WORKERS", "4")),
+            thread_name_prefix="deskmate-step"
+        )
+    
+    @property
+    def llm_client(self):
+        if self._llm_client is None:
+            with self._llm_lock:
+                if self._llm_client is None:
+                    try:
+                        self._llm_client = GeminiLLMClient()
+                        print("✅ Using Gemini LLM for intent parsing")
+                    except Exception as e:
+                        from app.core.llm_client import RobustMockLLMClient
+                        self._llm_client = RobustMockLLMClient()
+                        print(f"⚠️ Using Mock LLM (Gemini not available): {e}")
+        return self._llm_client
+    
+    @llm_client.setter
+    def llm_client(self, client):
+        self._llm_client = client
+    
+    def warm(self):
+        """Build the intent parser now, so the first command does not pay for it"""
+        self.llm_client
     
     def process_command(self, command: str) -> Dict[str, Any]:
         """Process a natural language command and return results"""
@@ -26,14 +53,20 @@ class DeskMateAgent:
         # Parse intent
         intent = self.llm_client.parse_intent(command)
         
-        # Execute steps
+        # Execute steps, running independent ones concurrently
+        steps = [ActionStep(**step_dict) for step_dict in intent.steps]
+        step_results = self._run_steps(steps)
+        
         results = []
         overall_success = True
         friendly_responses = []
         
-        for step_dict in intent.steps:
-            step = ActionStep(**step_dict)
-            result = self.executor.execute_step(step)
+        for step, result in zip(steps, step_results):
+            if result is None:
+                # Skipped because a step it depends on failed
+                overall_success = False
+                continue
+            
             results.append({
                 "action": step.action,
                 "params": step.params,
@@ -48,7 +81,6 @@ class DeskMateAgent:
             
             if not result.success:
                 overall_success = False
-                break
         
         execution_time = round(time.time() - start_time, 2)
         
@@ -59,7 +91,7 @@ class DeskMateAgent:
             final_response = f"✅ Command executed successfully."
         else:
             final_response = "❌ Command failed to execute completely."
-            
+        
         final_response += f"\n\n(Executed in {execution_time}s)"
         
         return {
@@ -71,4 +103,86 @@ class DeskMateAgent:
             "job_id": str(uuid.uuid4()),
             "friendly_response": final_response,
             "execution_time": execution_time
-        }
\ No newline at end of file
+        }
+    
+    def _step_dependencies(self, steps: List[ActionStep]) -> List[List[int]]:
+        """Dependency indices per step.
+        
+        Plans where no step declares depends_on keep the original behaviour:
+        each step depends on the one before it. Once any step declares
+        depends_on, steps without it are independent. References may be step
+        indices or step ids; a plan with unknown references or a cycle falls
+        back to running sequentially.
+        """
+        sequential = [[i - 1] if i else [] for i in range(len(steps))]
+        if all(step.depends_on is None for step in steps):
+            return sequential
+        
+        ids = {step.id: i for i, step in enumerate(steps) if step.id}
+        deps = []
+        for i, step in enumerate(steps):
+            resolved = []
+            for ref in step.depends_on or []:
+                index = ids.get(ref) if isinstance(ref, str) else ref
+                if index is None or not 0 <= index < len(steps) or index == i:
+                    return sequential
+                resolved.append(index)
+            deps.append(resolved)
+        
+        # Reject cycles: repeatedly peel off steps whose dependencies are all resolved
+        remaining = set(range(len(steps)))
+        while remaining:
+            ready = {i for i in remaining if not set(deps[i]) & remaining}
+            if not ready:
+                return sequential
+            remaining -= ready
+        return deps
+    
+    def _with_inputs(self, step: ActionStep, inputs: List[Optional[ExecutionResult]]) -> ActionStep:
+        """Feed a summarize step the text read by the step it depends on"""
+        if step.action != "summarize" or step.params.get("text"):
+            return step
+        for result in reversed(inputs):
+            output = result.output if result else None
+            if isinstance(output, dict) and output.get("content"):
+                params = dict(step.params, text=output["content"])
+                return step.copy(update={"params": params})
+        return step
+    
+    def _run_steps(self, steps: List[ActionStep]) -> List[Optional[ExecutionResult]]:
+        """Run steps as soon as their dependencies succeed; None marks skipped steps"""
+        if len(steps) == 1:
+            return [self.executor.execute_step(steps[0])]
+        
+        deps = self._step_dependencies(steps)
+        results: List[Optional[ExecutionResult]] = [None] * len(steps)
+        succeeded, failed = set(), set()
+        pending = set(range(len(steps)))
+        running = {}
+        
+        while pending or running:
+            for i in sorted(pending):
+                if any(d in failed for d in deps[i]):
+                    # Stop-on-failure along the dependency chain
+                    pending.discard(i)
+                    failed.add(i)
+                elif all(d in succeeded for d in deps[i]):
+                    pending.discard(i)
+                    step = self._with_inputs(steps[i], [results[d] for d in deps[i]])
+                    # Step threads profile themselves when the command is being profiled
+                    running[self.step_pool.submit(contextvars.copy_context().run, run_profiled,
+                                                  self.executor.execute_step, step)] = i
+            
+            if not running:
+                break
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = ExecutionResult(success=False, output=None, error=f"Error executing {steps[i].action}: {str(e)}")
+                (succeeded if results[i].success else failed).add(i)
+        
+        return results
@@ -0,0 +1,148 @@
+import os
+import re
+import hashlib
+import threading
+from typing import List, Dict, Any
+from sqlalchemy import text
+from app.db.database import engine, SessionLocal
+from app.db.models import File as FileModel
+
+def to_match_query(query: str) -> str:
+    """Turn free text into a safe FTS5 query: every word required, last word as a prefix"""
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+class ContentIndex:
+    """Full-text index over the extracted text of uploaded files"""
+
+    def is_indexed(self, content_hash: str) -> bool:
+        with engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT 1 FROM document_index WHERE content_hash = :h LIMIT 1"), {"h": content_hash}
+            ).first()
+        return row is not None
+
+    def index_text(self, content_hash: str, content: str):
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM document_index WHERE content_hash = :h"), {"h": content_hash})
+            conn.execute(
+                text("INSERT INTO document_index (content_hash, content) VALUES (:h, :c)"),
+                {"h": content_hash, "c": content}
+            )
+
+    def index_file(self, content_hash: str, file_path: str, file_reader=None) -> bool:
+        """Extract and index a stored file unless its content is already indexed"""
+        if self.is_indexed(content_hash):
+            return True
+        if file_reader is None:
+            from app.plugins.file_reader import FileReaderPlugin
+            file_reader = FileReaderPlugin()
+        result = file_reader.read_file(file_path)
+        if not result.get("success"):
+            print(f"⚠️ Could not index {file_path}: {result.get('error')}")
+            return False
+        self.index_text(content_hash, result.get("content", ""))
+        return True
+
+    def backfill_hashes(self) -> int:
+        """Hash uploads registered before content addressing, so index_missing can index them"""
+        db = SessionLocal()
+        hashed = 0
+        try:
+            rows = db.query(FileModel).filter(FileModel.content_hash.is_(None)).all()
+            for row in rows:
+                if not row.file_path or not os.path.isfile(row.file_path):
+                    continue
+                digest = hashlib.sha256()
+                with open(row.file_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+                row.content_hash = digest.hexdigest()
+                row.size = row.size or os.path.getsize(row.file_path)
+                hashed += 1
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️ Could not backfill upload hashes: {e}")
+        finally:
+            db.close()
+        return hashed
+
+    def index_missing(self) -> int:
+        """Index every registered file whose content is not in the index yet, legacy uploads included"""
+        self.backfill_hashes()
+        db = SessionLocal()
+        try:
+            rows = (db.query(FileModel.content_hash, FileModel.file_path)
+                    .filter(FileModel.content_hash.isnot(None))
+                    .all())
+        finally:
+            db.close()
+
+        indexed = 0
+        seen = set()
+        for content_hash, file_path in rows:
+            if content_hash in seen or self.is_indexed(content_hash):
+                continue
+            seen.add(content_hash)
+            if self.index_file(content_hash, file_path):
+                indexed += 1
+        return indexed
+
+    def index_missing_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.index_missing, name="content-backfill", daemon=True)
+        thread.start()
+        return thread
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Ranked (bm25) matches with highlighted snippets, one entry per stored file"""
+        match = to_match_query(query)
+        if not match:
+            return []
+
+        with engine.connect() as conn:
+            hits = conn.execute(text("""
+                SELECT content_hash,
+                       snippet(document_index, 1, '**', '**', '…', 16) AS snippet,
+                       bm25(document_index) AS score
+                FROM document_index
+                WHERE document_index MATCH :q
+                ORDER BY score
+                LIMIT :limit
+            """), {"q": match, "limit": limit}).all()
+
+        if not hits:
+            return []
+
+        db = SessionLocal()
+        try:
+            files = (db.query(FileModel)
+                     .filter(FileModel.content_hash.in_([h.content_hash for h in hits]))
+                     .order_by(FileModel.id.desc())
+                     .all())
+        finally:
+            db.close()
+
+        names: Dict[str, List[str]] = {}
+        paths: Dict[str, str] = {}
+        for f in files:
+            names.setdefault(f.content_hash, [])
+            if f.filename not in names[f.content_hash]:
+                names[f.content_hash].append(f.filename)
+            paths.setdefault(f.content_hash, f.file_path)
+
+        return [{
+            "filename": names.get(h.content_hash, ["(unregistered)"])[0],
+            "also_uploaded_as": names.get(h.content_hash, [])[1:],
+            "file_path": paths.get(h.content_hash),
+            "content_hash": h.content_hash,
+            "snippet": h.snippet,
+            "score": round(-h.score, 4)
+        } for h in hits]
+
+
+content_index = ContentIndex()
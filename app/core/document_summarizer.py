@@ -0,0 +1,146 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+from app.core.gemini_registry import get_gemini_registry, SUMMARY_MODELS
+from app.core.summarizer import extractive_summarizer, split_sentences, sentences_for
+from app.core.metrics import FALLBACKS
+
+# Rough Gemini token estimate; close enough for sizing chunks well under the context window
+CHARS_PER_TOKEN = 4
+
+MAP_PROMPT = """Summarize this section ({index} of {total}) of the document "{title}".
+Keep names, figures, dates and decisions. Use at most {words} words of plain prose.
+
+SECTION:
+{text}"""
+
+REDUCE_PROMPT = """These are summaries of consecutive sections of the document "{title}".
+Merge them into one {style} summary of at most {words} words. Keep the document's order,
+drop repetition, and keep names, figures, dates and decisions.
+
+SECTION SUMMARIES:
+{text}"""
+
+STYLE_WORDS = {"short": 120, "detailed": 350}
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """Split text into chunks of at most max_tokens, breaking between sentences"""
+    budget = max_tokens * CHARS_PER_TOKEN
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for sentence in split_sentences(text):
+        # A single sentence longer than the budget is hard-split
+        while len(sentence) > budget:
+            if current:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+            chunks.append(sentence[:budget])
+            sentence = sentence[budget:]
+        if size + len(sentence) + 1 > budget and current:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(sentence)
+        size += len(sentence) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class MapReduceSummarizer:
+    """Gemini summaries of documents of any length.
+
+    The text is cut into token-budgeted chunks that are summarized
+    concurrently (map), then the partial summaries are merged in groups that
+    fit the same budget, level by level, until one summary is left (reduce).
+    At most max_concurrency chunk requests are in flight, so wall-clock time
+    grows with chunks / max_concurrency. A chunk whose request fails falls
+    back to the offline extractive summary of that chunk.
+    """
+
+    def __init__(self, registry=None, max_concurrency: Optional[int] = None, chunk_tokens: Optional[int] = None):
+        self.registry = registry or get_gemini_registry()
+        self.max_concurrency = max_concurrency or int(os.getenv("DESKMATE_SUMMARY_CONCURRENCY", "4"))
+        self.chunk_tokens = chunk_tokens or int(os.getenv("DESKMATE_SUMMARY_CHUNK_TOKENS", "6000"))
+
+    @property
+    def is_available(self) -> bool:
+        return self.registry.model_for(SUMMARY_MODELS)[1] is not None
+
+    def summarize(self, text: str, style: str = "short", title: str = "document",
+                  progress: Optional[Callable[..., None]] = None) -> Dict:
+        start = time.time()
+        _, model = self.registry.model_for(SUMMARY_MODELS)
+        if model is None:
+            raise RuntimeError("No Gemini model available for summarization")
+        report = progress or (lambda **_: None)
+
+        chunks = chunk_text(text, self.chunk_tokens)
+        final_words = STYLE_WORDS.get(style, STYLE_WORDS["short"])
+        per_chunk_words = max(60, min(250, self.chunk_tokens // 20))
+        # A single chunk is the whole document, so its map output is the final summary
+        map_words = final_words if len(chunks) == 1 else per_chunk_words
+        prompts = [MAP_PROMPT.format(index=i + 1, total=len(chunks), title=title, words=map_words, text=chunk)
+                   for i, chunk in enumerate(chunks)]
+        partials, fallbacks = self._run_level(model, prompts, chunks, "map", report)
+
+        level = 0
+        while len(partials) > 1:
+            level += 1
+            groups = self._group(partials)
+            words = final_words if len(groups) == 1 else per_chunk_words
+            prompts = [REDUCE_PROMPT.format(title=title, style=style, words=words, text="\n\n".join(group))
+                       for group in groups]
+            partials, failed = self._run_level(model, prompts, ["\n\n".join(group) for group in groups], f"reduce_{level}", report)
+            fallbacks += failed
+
+        return {
+            "summary": partials[0] if partials else "",
+            "chunks": len(chunks),
+            "reduce_levels": level,
+            "fallback_chunks": fallbacks,
+            "elapsed": round(time.time() - start, 2)
+        }
+
+    def _group(self, partials: List[str]) -> List[List[str]]:
+        """Consecutive partial summaries packed into groups that fit the chunk budget (at least two per group)"""
+        budget = self.chunk_tokens
+        groups: List[List[str]] = [[]]
+        size = 0
+        for partial in partials:
+            tokens = estimate_tokens(partial)
+            if groups[-1] and size + tokens > budget and len(groups[-1]) >= 2:
+                groups.append([])
+                size = 0
+            groups[-1].append(partial)
+            size += tokens
+        return groups
+
+    def _run_level(self, model, prompts: List[str], sources: List[str], stage: str,
+                   report: Callable[..., None]):
+        """Generate every prompt of one level concurrently; results keep the input order"""
+        if not prompts:
+            return [], 0
+        results: List[Optional[str]] = [None] * len(prompts)
+        fallbacks = 0
+        done = 0
+        report(stage=stage, done=0, total=len(prompts))
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(prompts)),
+                                thread_name_prefix="deskmate-summary") as pool:
+            futures = {pool.submit(self.registry.generate, model, prompt): i for i, prompt in enumerate(prompts)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result().text.strip()
+                except Exception as e:
+                    print(f"⚠️ Summary chunk {i + 1}/{len(prompts)} failed, using extractive summary: {e}")
+                    results[i] = extractive_summarizer.summarize(sources[i], sentences_for("short", 0))["summary"]
+                    fallbacks += 1
+                    FALLBACKS.inc(component="summary_chunk")
+                done += 1
+                report(stage=stage, done=done, total=len(prompts))
+        return results, fallbacks
@@ -1,21 +1,56 @@
-from typing import Dict, Any, List
+import time
+import importlib
+import threading
+from typing import Dict, Any, Iterator, List, Tuple
 from app.core.schema import ActionStep, ExecutionResult
-from app.plugins.file_reader import FileReaderPlugin
-from app.plugins.email_generator import EmailGeneratorPlugin
-from app.plugins.shell_runner import ShellRunnerPlugin
-from app.plugins.system_control import SystemControlPlugin
+from app.core.upload_store import resolve_upload_path
+from app.core.gemini_registry import get_gemini_registry, QA_MODELS
+from app.core.metrics import ACTION_SECONDS, FALLBACKS, FAILURES
+
+# Plugin attribute -> (module, class). Each is imported and built on first use, so PyPDF2,
+# numpy and Gemini model setup stay off the server's startup path.
+PLUGINS = {
+    "file_reader": ("app.plugins.file_reader", "FileReaderPlugin"),
+    "email_generator": ("app.plugins.email_generator", "EmailGeneratorPlugin"),
+    "shell_runner": ("app.plugins.shell_runner", "ShellRunnerPlugin"),
+    "system_control": ("app.plugins.system_control", "SystemControlPlugin"),
+    "document_summarizer": ("app.core.document_summarizer", "MapReduceSummarizer"),
+}
+
+_plugin_lock = threading.Lock()
+
+# Actions execute_step knows; anything else is answered as a question and labelled "unknown" in metrics
+ACTIONS = {
+    "respond_to_greeting", "greet_user", "answer_greeting", "read_file", "summarize", "generate_email",
+    "run_shell", "answer_question", "search_files", "search_content", "open_url", "open_app",
+    "open_explorer", "create_file", "create_folder", "open_terminal", "get_system_info", "get_time"
+}
 
 class ActionExecutor:
     """Executes action steps from the plan"""
     
-    def __init__(self):
-        self.file_reader = FileReaderPlugin()
-        self.email_generator = EmailGeneratorPlugin()
-        self.shell_runner = ShellRunnerPlugin()
-        self.system_control = SystemControlPlugin()
+    def __getattr__(self, name: str):
+        # Only called for attributes not set yet; the plugin is cached on the instance after this
+        if name not in PLUGINS:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        with _plugin_lock:
+            if name not in self.__dict__:
+                module, cls = PLUGINS[name]
+                self.__dict__[name] = getattr(importlib.import_module(module), cls)()
+        return self.__dict__[name]
     
     def execute_step(self, step: ActionStep) -> ExecutionResult:
         """Execute a single action step"""
+        start = time.perf_counter()
+        result = self._execute_step(step)
+        outcome = "success" if result.success else "failure"
+        ACTION_SECONDS.observe(time.perf_counter() - start,
+                               action=step.action if step.action in ACTIONS else "unknown", outcome=outcome)
+        if not result.success:
+            FAILURES.inc(component="step")
+        return result
+    
+    def _execute_step(self, step: ActionStep) -> ExecutionResult:
         action = step.action
         params = step.params
         
@@ -24,11 +59,18 @@ class ActionExecutor:
             if action in ["respond_to_greeting", "greet_user", "answer_greeting"]:
                 result = self._answer_question(params.get("question", "hello"))
             elif action == "read_file":
-                result = self.file_reader.read_file(params.get("file_path", ""))
+                result = self.file_reader.read_file(
+                    resolve_upload_path(params.get("file_path", "")),
+                    start_page=params.get("start_page"),
+                    end_page=params.get("end_page"),
+                    max_chars=params.get("max_chars")
+                )
             elif action == "summarize":
-                text = params.get("text", "")
-                style = params.get("style", "short")
-                result = self.file_reader.summarize_text(text, style)
+                result = self._summarize(
+                    params.get("text", ""),
+                    params.get("style", "short"),
+                    params.get("file_path")
+                )
             elif action == "generate_email":
                 result = self.email_generator.generate_email(
                     params.get("subject", ""),
@@ -40,7 +82,15 @@ class ActionExecutor:
             elif action == "answer_question":
                 result = self._answer_question(params.get("question", ""))
             elif action == "search_files":
-                result = self._search_files(params.get("query", ""), params.get("directory", "."))
+                result = self._search_files(
+                    params.get("query", ""),
+                    params.get("directory", "."),
+                    params.get("limit", 10),
+                    params.get("offset", 0),
+                    params.get("mode", "substring")
+                )
+            elif action == "search_content":
+                result = self._search_content(params.get("query", ""), params.get("limit", 5))
             elif action == "open_url":
                 result = self._open_url(params.get("url", ""))
             elif action == "open_app":
@@ -182,35 +232,30 @@ class ActionExecutor:
     
     def _generate_ai_response(self, question: str) -> dict:
         """Generate real AI responses using Gemini - NO EVASIVE ANSWERS"""
-        import google.generativeai as genai
-        import os
-        
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        registry = get_gemini_registry()
+        _, model = registry.model_for(QA_MODELS)
+        if not model:
             return self._fallback_response(question)
         
         try:
-            genai.configure(api_key=api_key)
-            
-            model_names = [
-                'models/gemini-2.0-flash-lite',
-                'models/gemini-2.0-flash',
-                'models/gemini-pro-latest'
-            ]
-            
-            model = None
-            for model_name in model_names:
-                try:
-                    model = genai.GenerativeModel(model_name)
-                    break
-                except:
-                    continue
+            prompt = self._answer_prompt(question)
+            response = registry.generate(model, prompt)
+            ai_response = response.text.strip()
             
-            if not model:
-                return self._fallback_response(question)
+            return {
+                "success": True,
+                "answer": ai_response,
+                "question": question,
+                "answer_type": "ai_generated",
+                "is_conversational": True
+            }
             
-            # DIRECT PROMPT - NO EVASIVENESS
-            prompt = f"""You are DeskMate AI assistant. Answer the user's question directly and helpfully.
+        except Exception as e:
+            return self._fallback_response(question)
+    
+    def _answer_prompt(self, question: str) -> str:
+        # DIRECT PROMPT - NO EVASIVENESS
+        return f"""You are DeskMate AI assistant. Answer the user's question directly and helpfully.
 
 User: {question}
 
@@ -222,23 +267,37 @@ IMPORTANT:
 - For technical questions, provide detailed technical answers
 
 Answer:"""
-            
-            response = model.generate_content(prompt)
-            ai_response = response.text.strip()
-            
-            return {
-                "success": True,
-                "answer": ai_response,
-                "question": question,
-                "answer_type": "ai_generated",
-                "is_conversational": True
-            }
-            
-        except Exception as e:
-            return self._fallback_response(question)
+    
+    def stream_answer(self, question: str) -> Iterator[Tuple[str, str]]:
+        """Yield (text, answer_type) chunks as Gemini produces them.
+
+        Falls back to the canned answer as a single chunk when Gemini is not
+        configured or fails before the first token; a failure after that is
+        raised so the caller can record a partial answer.
+        """
+        registry = get_gemini_registry()
+        _, model = registry.model_for(QA_MODELS)
+        started = False
+        if model:
+            try:
+                for chunk in registry.generate_stream(model, self._answer_prompt(question)):
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        continue  # chunk carried no text (e.g. safety metadata only)
+                    if text:
+                        started = True
+                        yield text, "ai_generated"
+            except Exception as e:
+                if started:
+                    raise
+                print(f"AI response streaming failed: {e}, using fallback")
+        if not started:
+            yield self._fallback_response(question)["answer"], "fallback"
     
     def _fallback_response(self, question: str) -> dict:
         """Enhanced fallback responses when AI is unavailable"""
+        FALLBACKS.inc(component="answer")
         question_lower = question.lower()
         
         # Enhanced conversational fallbacks - DIRECT ANSWERS
@@ -278,37 +337,117 @@ Answer:"""
             "is_conversational": True
         }
     
-    def _search_files(self, query: str, directory: str = ".") -> dict:
-        """Enhanced file search function"""
+    def _search_files(self, query: str, directory: str = ".", limit: int = 10, offset: int = 0,
+                      mode: str = "substring") -> dict:
+        """Recursive filename search; served from the background index when it covers the directory"""
         import os
         from datetime import datetime
+        from app.core.filename_index import filename_index, search_directory
         
         try:
+            limit = max(1, min(int(limit), 100))
+            offset = max(0, int(offset))
+            if not os.path.exists(directory):
+                matches = {"results": [], "matches_seen": 0, "has_more": False}
+                source = "none"
+            elif filename_index.is_ready and filename_index.covers(directory):
+                matches = filename_index.search(query, directory, mode, limit, offset)
+                source = "index"
+            else:
+                matches = search_directory(directory, query, mode, limit, offset)
+                source = "scan"
+            
+            # Only the page being returned is stat'ed
             results = []
-            if os.path.exists(directory):
-                for item in os.listdir(directory):
-                    item_path = os.path.join(directory, item)
-                    if query.lower() in item.lower():
-                        stat = os.stat(item_path)
-                        results.append({
-                            "name": item,
-                            "path": item_path,
-                            "type": "directory" if os.path.isdir(item_path) else "file",
-                            "size": stat.st_size,
-                            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
-                        })
+            for name, item_path, is_dir in matches["results"]:
+                try:
+                    stat = os.stat(item_path)
+                except OSError:
+                    continue
+                results.append({
+                    "name": name,
+                    "path": item_path,
+                    "type": "directory" if is_dir else "file",
+                    "size": stat.st_size,
+                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
+                })
             
             return {
                 "success": True,
                 "query": query,
                 "directory": directory,
-                "results": results[:10],  # Limit results
+                "results": results,
                 "result_count": len(results),
-                "message": f"Found {len(results)} items matching '{query}'"
+                "offset": offset,
+                "limit": limit,
+                "has_more": matches["has_more"],
+                "source": source,
+                "message": f"Found {len(results)}{'+' if matches['has_more'] else ''} items matching '{query}'"
             }
         except Exception as e:
             return {
                 "success": False,
                 "error": f"Search error: {str(e)}",
                 "results": []
+            }
+    
+    def _summarize(self, text: str, style: str = "short", file_path: str = None) -> dict:
+        """Summarize text (or a file): map-reduce over Gemini when available, extractive offline"""
+        import os
+        from app.core.job_runner import progress_reporter
+        
+        if not text and file_path:
+            read = self.file_reader.read_file(resolve_upload_path(file_path))
+            if not read.get("success"):
+                return read
+            text = read.get("content", "")
+        
+        word_count = len(text.split())
+        if word_count > 100 and self.document_summarizer.is_available:
+            try:
+                title = os.path.basename(file_path) if file_path else "document"
+                mapped = self.document_summarizer.summarize(text, style, title, progress=progress_reporter())
+                return {
+                    "success": True,
+                    "summary": mapped["summary"],
+                    "method": "map_reduce",
+                    "original_length": word_count,
+                    "summary_length": len(mapped["summary"].split()),
+                    "chunks": mapped["chunks"],
+                    "reduce_levels": mapped["reduce_levels"],
+                    "fallback_chunks": mapped["fallback_chunks"],
+                    "friendly_message": f"📝 Summary:\n{mapped['summary']}"
+                }
+            except Exception as e:
+                print(f"⚠️ Map-reduce summary failed, using extractive summary: {e}")
+                FALLBACKS.inc(component="summary")
+        
+        result = self.file_reader.summarize_text(text, style)
+        if result.get("success"):
+            result["friendly_message"] = f"📝 Summary:\n{result['summary']}"
+        return result
+    
+    def _search_content(self, query: str, limit: int = 5) -> dict:
+        """Full-text search inside uploaded documents"""
+        from app.core.content_index import content_index
+        
+        try:
+            results = content_index.search(query, limit)
+            if results:
+                lines = [f"📄 {r['filename']}: {r['snippet']}" for r in results]
+                friendly = f"🔎 Found '{query}' in {len(results)} document(s):\n" + "\n".join(lines)
+            else:
+                friendly = f"🔎 No uploaded documents mention '{query}'"
+            return {
+                "success": True,
+                "query": query,
+                "results": results,
+                "result_count": len(results),
+                "friendly_message": friendly
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Content search error: {str(e)}",
+                "results": []
             }
\ No newline at end of file
@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import glob
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.core.metrics import CACHE_REQUESTS
+
+class ExtractionCache:
+    """Extracted-text cache keyed by file content hash and extractor version.
+
+    Two tiers: an in-memory LRU bounded by total payload size, and JSON files
+    on disk under uploads/ so results survive restarts. Content hashes are
+    memoized per path by (size, mtime) so a repeat read does not rehash the file.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or os.getenv(
+            "DESKMATE_EXTRACT_CACHE_DIR", os.path.join(os.getenv("DESKMATE_UPLOAD_DIR", "uploads"), ".extracted"))
+        self.max_bytes = max_bytes or int(os.getenv("DESKMATE_EXTRACT_CACHE_BYTES", str(64 * 1024 * 1024)))
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[int, dict]]" = OrderedDict()  # key -> (size, result)
+        self._bytes = 0
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}  # abs path -> (size, mtime_ns, sha256)
+        self._lock = threading.Lock()
+
+    def content_hash(self, file_path: str) -> str:
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        memo = self._hashes.get(path)
+        if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+            return memo[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        sha = digest.hexdigest()
+        self._hashes[path] = (stat.st_size, stat.st_mtime_ns, sha)
+        return sha
+
+    def key_for(self, file_path: str, version: int, **options) -> str:
+        """Cache key for one file's content read with a given extractor version and options"""
+        params = ",".join(f"{k}={options[k]}" for k in sorted(options))
+        params_digest = hashlib.sha256(params.encode("utf-8")).hexdigest()[:12]
+        return f"{self.content_hash(file_path)}-v{version}-{params_digest}"
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.inc(cache="extraction", result="hit")
+                return entry[1]
+
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            CACHE_REQUESTS.inc(cache="extraction", result="miss")
+            return None
+
+        with self._lock:
+            self.hits += 1
+        CACHE_REQUESTS.inc(cache="extraction", result="hit")
+        self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: dict):
+        self._remember(key, result)
+
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Failed to write extraction cache entry: {e}")
+
+    def _remember(self, key: str, result: dict):
+        size = sys.getsizeof(result.get("content", ""))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[0]
+            self._entries[key] = (size, result)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def invalidate(self, file_path: str) -> int:
+        """Forget everything cached for the content currently at file_path.
+
+        Call this before the file is overwritten, so the old content hash is
+        still known even if this process never read the file.
+        """
+        path = os.path.abspath(file_path)
+        if path not in self._hashes and not os.path.exists(path):
+            return 0
+        sha = self._hashes[path][2] if path in self._hashes else self.content_hash(path)
+        self._hashes.pop(path, None)
+
+        removed = 0
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(sha)]:
+                self._bytes -= self._entries.pop(key)[0]
+                removed += 1
+        for cached_file in glob.glob(os.path.join(self.cache_dir, sha[:2], f"{sha}-*.json")):
+            try:
+                os.remove(cached_file)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Shared by FileReaderPlugin and the upload endpoint, which invalidates on re-upload
+extraction_cache = ExtractionCache()
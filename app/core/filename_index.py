@@ -0,0 +1,245 @@
+import os
+import time
+import heapq
+import bisect
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Iterator
+
+# Directories that are never worth descending into
+SKIP_DIRS = {"node_modules", "__pycache__", ".git", ".hg", ".svn", ".venv", "venv", ".cache", "AppData", "$Recycle.Bin"}
+
+def default_roots() -> List[str]:
+    configured = os.getenv("DESKMATE_INDEX_ROOTS")
+    if configured:
+        return [os.path.abspath(os.path.expanduser(p)) for p in configured.split(os.pathsep) if p]
+    home = os.path.expanduser("~")
+    return [os.path.join(home, d) for d in ("Desktop", "Documents", "Downloads") if os.path.isdir(os.path.join(home, d))]
+
+def scan_directory(directory: str) -> Tuple[List[Tuple[str, str, bool]], List[str]]:
+    """One os.scandir pass: ([(name, path, is_dir)], [subdirectories to descend into])"""
+    entries, subdirs = [], []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries.append((entry.name, entry.path, is_dir))
+                if is_dir and not entry.name.startswith(".") and entry.name not in SKIP_DIRS:
+                    subdirs.append(entry.path)
+    except OSError:
+        pass
+    return entries, subdirs
+
+def walk_tree(root: str, max_entries: Optional[int] = None) -> Iterator[Tuple[str, List[Tuple[str, str, bool]]]]:
+    """Yield (directory, entries) breadth-first, stopping after max_entries entries"""
+    seen = 0
+    queue = deque([root])
+    while queue:
+        directory = queue.popleft()
+        entries, subdirs = scan_directory(directory)
+        yield directory, entries
+        seen += len(entries)
+        if max_entries is not None and seen >= max_entries:
+            return
+        queue.extend(subdirs)
+
+
+class _Snapshot:
+    """Immutable, query-optimized view of the indexed names.
+
+    Lower-cased names are joined into one newline-separated string so a
+    substring query is a loop of C-level str.find calls, and a sorted copy of
+    the names answers prefix queries with bisect.
+    """
+
+    def __init__(self, entries: List[Tuple[str, str, bool]]):
+        self.names = [name for name, _, _ in entries]
+        self.paths = [path for _, path, _ in entries]
+        self.is_dir = [is_dir for _, _, is_dir in entries]
+        lowered = [name.lower() for name in self.names]
+        self.offsets = []
+        position = 0
+        for name in lowered:
+            self.offsets.append(position)
+            position += len(name) + 1
+        self.blob = "\n".join(lowered) + "\n"
+        self.sorted_names = sorted((name, i) for i, name in enumerate(lowered))
+        self.lowered = lowered
+
+    def __len__(self):
+        return len(self.names)
+
+    def _rank(self, i: int, query: str) -> Tuple[int, int, str]:
+        """Exact name, then prefix, then word start, then anywhere; shorter names first"""
+        name = self.lowered[i]
+        if name == query:
+            tier = 0
+        elif name.startswith(query):
+            tier = 1
+        else:
+            at = name.find(query)
+            tier = 2 if at > 0 and not name[at - 1].isalnum() else 3
+        return tier, len(name), name
+
+    def _substring_matches(self, query: str) -> Iterator[int]:
+        blob, offsets = self.blob, self.offsets
+        position = blob.find(query)
+        while position != -1:
+            i = bisect.bisect_right(offsets, position) - 1
+            yield i
+            # Skip the rest of this name; one hit per entry is enough
+            position = blob.find(query, offsets[i] + len(self.lowered[i]) + 1)
+
+    def _prefix_matches(self, query: str) -> Iterator[int]:
+        sorted_names = self.sorted_names
+        for position in range(bisect.bisect_left(sorted_names, (query,)), len(sorted_names)):
+            name, i = sorted_names[position]
+            if not name.startswith(query):
+                return
+            yield i
+
+    def search(self, query: str, mode: str = "substring", under: Optional[str] = None,
+               limit: int = 10, offset: int = 0, max_candidates: int = 5000) -> Tuple[List[int], int, bool]:
+        """Top-k entry indices for a page of results: (indices, matches_seen, exhausted)"""
+        query = query.lower().replace("\n", " ")
+        matches = self._prefix_matches(query) if mode == "prefix" else self._substring_matches(query)
+        prefix = None if under is None else under.rstrip(os.sep) + os.sep
+
+        wanted = offset + limit
+        best_tier_hits = 0
+        candidates = []
+        exhausted = True
+        for i in matches:
+            if prefix is not None and not self.paths[i].startswith(prefix):
+                continue
+            rank = self._rank(i, query)
+            candidates.append((rank, i))
+            if rank[0] == 0:
+                best_tier_hits += 1
+            # Early termination: enough exact hits to fill the page, or candidate cap reached
+            if best_tier_hits >= wanted or len(candidates) >= max_candidates:
+                exhausted = False
+                break
+
+        top = heapq.nsmallest(wanted, candidates)
+        return [i for _, i in top[offset:]], len(candidates), exhausted
+
+
+class FilenameIndex:
+    """Background-built filename index over configured roots, kept current by mtime polling"""
+
+    def __init__(self, roots: Optional[List[str]] = None, poll_seconds: Optional[float] = None):
+        self.roots = [os.path.abspath(r) for r in (roots if roots is not None else default_roots())]
+        self.poll_seconds = poll_seconds or float(os.getenv("DESKMATE_INDEX_POLL_SECONDS", "30"))
+        self._dirs: Dict[str, Tuple[int, List[Tuple[str, str, bool]]]] = {}  # dir -> (mtime_ns, entries)
+        self._snapshot = _Snapshot([])
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def covers(self, directory: str) -> bool:
+        path = os.path.abspath(directory)
+        return any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in self.roots)
+
+    def start(self) -> threading.Thread:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="filename-index", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        start = time.time()
+        self.build()
+        print(f"🗂️ Filename index ready: {len(self._snapshot)} entries in {time.time() - start:.1f}s")
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Filename index refresh failed: {e}")
+
+    def build(self):
+        """Full scan of every root"""
+        dirs = {}
+        for root in self.roots:
+            for directory, entries in walk_tree(root):
+                dirs[directory] = (self._mtime(directory), entries)
+        self._dirs = dirs
+        self._publish()
+        self._ready.set()
+
+    def refresh(self) -> int:
+        """Rescan only directories whose mtime changed; returns how many were rescanned"""
+        dirs = dict(self._dirs)
+        changed = 0
+        for directory, (mtime, entries) in list(dirs.items()):
+            current = self._mtime(directory)
+            if current == mtime:
+                continue
+            changed += 1
+            if current is None:
+                # Directory is gone, drop it and everything below it
+                for d in [d for d in dirs if d == directory or d.startswith(directory + os.sep)]:
+                    del dirs[d]
+                continue
+
+            new_entries, subdirs = scan_directory(directory)
+            dirs[directory] = (current, new_entries)
+            old_subdirs = {path for _, path, is_dir in entries if is_dir}
+            for path in old_subdirs - set(subdirs):
+                for d in [d for d in dirs if d == path or d.startswith(path + os.sep)]:
+                    del dirs[d]
+            for path in set(subdirs) - set(dirs):
+                for sub, sub_entries in walk_tree(path):
+                    dirs[sub] = (self._mtime(sub), sub_entries)
+
+        if changed:
+            self._dirs = dirs
+            self._publish()
+        return changed
+
+    def _mtime(self, directory: str) -> Optional[int]:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _publish(self):
+        entries = [entry for _, dir_entries in self._dirs.values() for entry in dir_entries]
+        self._snapshot = _Snapshot(entries)
+
+    def search(self, query: str, directory: Optional[str] = None, mode: str = "substring",
+               limit: int = 10, offset: int = 0) -> Dict:
+        snapshot = self._snapshot
+        under = os.path.abspath(directory) if directory else None
+        indices, matches, exhausted = snapshot.search(query, mode, under, limit, offset)
+        return {
+            "results": [(snapshot.names[i], snapshot.paths[i], snapshot.is_dir[i]) for i in indices],
+            "matches_seen": matches,
+            "has_more": not exhausted or matches > offset + limit
+        }
+
+
+def search_directory(directory: str, query: str, mode: str = "substring", limit: int = 10,
+                     offset: int = 0, max_entries: int = 50000) -> Dict:
+    """Search a directory that is not indexed with a bounded one-off scan of its subtree"""
+    entries = [entry for _, dir_entries in walk_tree(os.path.abspath(directory), max_entries) for entry in dir_entries]
+    snapshot = _Snapshot(entries)
+    indices, matches, exhausted = snapshot.search(query, mode, None, limit, offset)
+    return {
+        "results": [(snapshot.names[i], snapshot.paths[i], snapshot.is_dir[i]) for i in indices],
+        "matches_seen": matches,
+        "has_more": not exhausted or matches > offset + limit
+    }
+
+
+filename_index = FilenameIndex()
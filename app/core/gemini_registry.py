@@ -0,0 +1,104 @@
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Model preference per call site; the first model that can be constructed wins
+INTENT_MODELS = ['models/gemini-2.0-flash', 'models/gemini-pro']
+QA_MODELS = ['models/gemini-2.0-flash-lite', 'models/gemini-2.0-flash', 'models/gemini-pro-latest']
+EMAIL_MODELS = ['gemini-pro']
+SUMMARY_MODELS = ['models/gemini-2.0-flash', 'models/gemini-2.0-flash-lite']
+
+class GeminiModelRegistry:
+    """Process-wide Gemini models shared by intent parsing, Q&A and email drafting.
+
+    genai.configure() runs once and each GenerativeModel is built once and
+    reused, so every call site shares the same underlying client connection.
+    generate() caps how many Gemini requests are in flight at the same time.
+    Passing genai (e.g. gemini_standin.StandInGenAI) replaces the SDK module.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, max_concurrency: Optional[int] = None, genai: Any = None):
+        self.api_key = api_key if api_key is not None else os.getenv("GEMINI_API_KEY")
+        self.max_concurrency = max_concurrency or int(os.getenv("DESKMATE_GEMINI_MAX_CONCURRENCY", "4"))
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._models: Dict[str, Any] = {}
+        self._genai = genai
+        self._lock = threading.Lock()
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.api_key) or self._genai is not None
+
+    def _configure(self):
+        if self._genai is None:
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            self._genai = genai
+        return self._genai
+
+    def model_for(self, candidates: List[str]) -> Tuple[Optional[str], Any]:
+        """Return (name, model) for the first usable candidate, or (None, None) without Gemini"""
+        if not self.is_configured:
+            return None, None
+
+        with self._lock:
+            # Candidates are in preference order: a model built for another call site
+            # must not win over an earlier candidate that simply has not been built yet
+            for name in candidates:
+                if name in self._models:
+                    return name, self._models[name]
+                try:
+                    genai = self._configure()
+                except Exception as e:
+                    print(f"Gemini Init Error: {e}")
+                    return None, None
+                try:
+                    self._models[name] = genai.GenerativeModel(name)
+                    return name, self._models[name]
+                except Exception:
+                    continue
+        return None, None
+
+    def generate(self, model: Any, prompt: str, **kwargs) -> Any:
+        """model.generate_content() bounded by the shared in-flight request cap"""
+        with self._slots:
+            return model.generate_content(prompt, **kwargs)
+
+    def generate_stream(self, model: Any, prompt: str, **kwargs) -> Iterator[Any]:
+        """Streaming generate_content(); the request slot is held until the stream ends"""
+        with self._slots:
+            yield from model.generate_content(prompt, stream=True, **kwargs)
+
+    def warm(self, connect: bool = True):
+        """Build every call site's model and, optionally, open the connection with a cheap request"""
+        if not self.is_configured:
+            return
+        models = [self.model_for(candidates)[1] for candidates in (INTENT_MODELS, QA_MODELS, EMAIL_MODELS, SUMMARY_MODELS)]
+        if connect and models[0] is not None:
+            try:
+                with self._slots:
+                    models[0].count_tokens("ping")
+                print("✅ Gemini connection warmed")
+            except Exception as e:
+                print(f"⚠️ Gemini warm-up failed: {e}")
+
+
+_registry: Optional[GeminiModelRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_gemini_registry() -> GeminiModelRegistry:
+    """The shared registry, created on first use; DESKMATE_GEMINI_STANDIN swaps in the local stand-in"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                if os.getenv("DESKMATE_GEMINI_STANDIN"):
+                    from app.core.gemini_standin import StandInGenAI
+                    print("🧪 Using the local Gemini stand-in")
+                    _registry = GeminiModelRegistry(genai=StandInGenAI())
+                else:
+                    _registry = GeminiModelRegistry()
+    return _registry
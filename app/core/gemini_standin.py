@@ -0,0 +1,178 @@
+"""Local stand-in for google.generativeai, for load tests and offline runs.
+
+Start the server with DESKMATE_GEMINI_STANDIN=1 (or the path of a JSON
+config file) and every Gemini call site gets these models instead of the
+real SDK. Nothing leaves the machine; latency and failures are simulated.
+
+Config (JSON file and/or environment, environment wins):
+
+    {
+      "latency": "lognormal:0.4,0.5",   # DESKMATE_STANDIN_LATENCY
+      "error_rate": 0.02,               # DESKMATE_STANDIN_ERROR_RATE
+      "stream_chunks": 8,
+      "seed": 7,
+      "intents": {"check my disk": {"intent": "get_system_info", "steps": [...]}}
+    }
+
+Latency specs: "fixed:S", "uniform:LOW,HIGH", "normal:MEAN,SD" and
+"lognormal:MEDIAN,SIGMA", all in seconds. Intent prompts get the canned
+intent for the command when there is one, otherwise the offline parser's
+intent, as JSON. Summary prompts get the opening words of their section;
+anything else gets a short canned answer.
+"""
+import os
+import re
+import json
+import math
+import time
+import random
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+MODEL_PREFIX = "standin:"
+
+_COMMAND = re.compile(r'^Analyze command: "(.*)"\s*$', re.MULTILINE)
+_SECTION = re.compile(r'\n(?:SECTION|SECTION SUMMARIES):\n(.*)$', re.DOTALL)
+_WORDS_LIMIT = re.compile(r'at most (\d+) words')
+
+
+class StandInError(Exception):
+    """A simulated Gemini failure (quota, timeout, server error)"""
+
+
+class LatencyModel:
+    """Seconds to wait per request, drawn from a named distribution"""
+
+    def __init__(self, spec: str = "fixed:0", rng: Optional[random.Random] = None):
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        self.kind = kind.strip().lower()
+        self.args = [float(a) for a in args.split(",") if a.strip()] or [0.0]
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            if self.kind == "fixed":
+                value = self.args[0]
+            elif self.kind == "uniform":
+                value = self._rng.uniform(self.args[0], self.args[1])
+            elif self.kind == "normal":
+                value = self._rng.gauss(self.args[0], self.args[1])
+            else:
+                value = self._rng.lognormvariate(math.log(max(self.args[0], 1e-6)), self.args[1])
+        return max(0.0, value)
+
+
+class StandInConfig:
+    def __init__(self, latency: str = "fixed:0", error_rate: float = 0.0, stream_chunks: int = 8,
+                 seed: Optional[int] = None, intents: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency, self.rng)
+        self.error_rate = error_rate
+        self.stream_chunks = max(1, stream_chunks)
+        self.intents = {command.strip().lower(): intent for command, intent in (intents or {}).items()}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, setting: Optional[str] = None) -> "StandInConfig":
+        """Config from the DESKMATE_GEMINI_STANDIN file (if it names one) plus environment overrides"""
+        setting = setting if setting is not None else os.getenv("DESKMATE_GEMINI_STANDIN", "")
+        options: Dict[str, Any] = {}
+        if setting and os.path.isfile(setting):
+            with open(setting, "r", encoding="utf-8") as f:
+                options = json.load(f)
+        if os.getenv("DESKMATE_STANDIN_LATENCY"):
+            options["latency"] = os.environ["DESKMATE_STANDIN_LATENCY"]
+        if os.getenv("DESKMATE_STANDIN_ERROR_RATE"):
+            options["error_rate"] = float(os.environ["DESKMATE_STANDIN_ERROR_RATE"])
+        return cls(**options)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.rng.random() < self.error_rate
+
+
+class StandInResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StandInTokenCount:
+    def __init__(self, total_tokens: int):
+        self.total_tokens = total_tokens
+
+
+class StandInModel:
+    """Quacks like genai.GenerativeModel for the calls DeskMate makes"""
+
+    def __init__(self, model_name: str, config: StandInConfig):
+        # Marked, so state keyed by model name (the intent cache) never mixes with real Gemini's
+        self.model_name = MODEL_PREFIX + model_name
+        self.config = config
+        self._parser = None
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        if stream:
+            return self._stream(prompt)
+        self._wait_and_maybe_fail()
+        return StandInResponse(self.respond(prompt))
+
+    def _stream(self, prompt: str) -> Iterator[StandInResponse]:
+        # Time to first token is the sampled latency; the rest trickles in after it
+        self._wait_and_maybe_fail()
+        words = self.respond(prompt).split(" ")
+        size = max(1, math.ceil(len(words) / self.config.stream_chunks))
+        for i in range(0, len(words), size):
+            if i:
+                time.sleep(0.01)
+            yield StandInResponse(" ".join(words[i:i + size]) + (" " if i + size < len(words) else ""))
+
+    def count_tokens(self, text: str) -> StandInTokenCount:
+        return StandInTokenCount(len(text) // 4 + 1)
+
+    def _wait_and_maybe_fail(self):
+        delay = self.config.latency.sample()
+        if delay:
+            time.sleep(delay)
+        if self.config.should_fail():
+            raise StandInError(f"Simulated failure from {self.model_name}")
+
+    def respond(self, prompt: str) -> str:
+        command = _COMMAND.match(prompt)
+        if command:
+            return json.dumps(self._intent_for(command.group(1)))
+        section = _SECTION.search(prompt)
+        if section:
+            limit = _WORDS_LIMIT.search(prompt)
+            words = section.group(1).split()
+            return " ".join(words[:int(limit.group(1)) if limit else 120])
+        return "This is a stand-in answer generated locally for load testing. " \
+               "It has roughly the length of a short Gemini reply and no real content."
+
+    def _intent_for(self, command: str) -> Dict[str, Any]:
+        canned = self.config.intents.get(command.strip().lower())
+        if canned is not None:
+            return canned
+        if self._parser is None:
+            from app.core.llm_client import RobustMockLLMClient
+            self._parser = RobustMockLLMClient()
+        return self._parser.parse_intent(command).dict()
+
+
+class StandInGenAI:
+    """The slice of the google.generativeai module the registry uses"""
+
+    def __init__(self, config: Optional[StandInConfig] = None):
+        self.config = config or StandInConfig.from_env()
+        self.models: List[StandInModel] = []
+
+    def configure(self, **kwargs):
+        pass
+
+    def GenerativeModel(self, model_name: str) -> StandInModel:
+        model = StandInModel(model_name, self.config)
+        self.models.append(model)
+        return model
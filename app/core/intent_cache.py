@@ -0,0 +1,149 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
+from app.core.schema import Intent
+from app.core.metrics import CACHE_REQUESTS
+from app.db.database import SessionLocal
+from app.db.models import IntentCacheEntry
+
+# Tokens that look like file paths keep their casing ("read Report.pdf")
+_PATH_TOKEN = re.compile(r'[\\/]|\.\w{1,5}$')
+
+def normalize_command(command: str) -> str:
+    """Collapse whitespace and trailing punctuation so repeats share one cache key"""
+    normalized = " ".join(command.split()).rstrip("?!. ")
+    if any(_PATH_TOKEN.search(token) for token in normalized.split()):
+        return normalized
+    return normalized.lower()
+
+def cache_namespace(prompt: str, model_name: str) -> str:
+    """Entries are only valid for the prompt template and model that produced them"""
+    return hashlib.sha256(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()[:16]
+
+class IntentCache:
+    """LRU + TTL cache of parsed intents, mirrored to SQLite so it survives restarts"""
+
+    def __init__(self, namespace: str, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.namespace = namespace
+        self.max_entries = max_entries or int(os.getenv("DESKMATE_INTENT_CACHE_SIZE", "1000"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("DESKMATE_INTENT_CACHE_TTL", "86400"))
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, intent json)
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _load(self):
+        """Pull persisted entries into memory on first use, dropping stale namespaces"""
+        self._loaded = True
+        db = SessionLocal()
+        try:
+            db.query(IntentCacheEntry).filter(IntentCacheEntry.namespace != self.namespace).delete()
+            db.commit()
+            rows = (db.query(IntentCacheEntry)
+                    .filter(IntentCacheEntry.namespace == self.namespace)
+                    .order_by(IntentCacheEntry.created_at.desc())
+                    .limit(self.max_entries)
+                    .all())
+            now = time.time()
+            for row in reversed(rows):
+                created = row.created_at.replace(tzinfo=timezone.utc).timestamp()
+                if created + self.ttl_seconds > now:
+                    self._entries[row.command_key] = (created + self.ttl_seconds, row.intent)
+        except Exception as e:
+            print(f"⚠️ Intent cache unavailable, continuing in memory only: {e}")
+        finally:
+            db.close()
+
+    def get(self, command: str) -> Optional[Intent]:
+        key = normalize_command(command)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                CACHE_REQUESTS.inc(cache="intent", result="miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        CACHE_REQUESTS.inc(cache="intent", result="hit")
+        return Intent(**json.loads(entry[1]))
+
+    def put(self, command: str, intent: Intent):
+        key = normalize_command(command)
+        now = time.time()
+        payload = json.dumps(intent.dict())
+        evicted = []
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+
+        db = SessionLocal()
+        try:
+            db.query(IntentCacheEntry).filter(
+                IntentCacheEntry.namespace == self.namespace,
+                IntentCacheEntry.command_key.in_(evicted + [key])
+            ).delete(synchronize_session=False)
+            db.add(IntentCacheEntry(
+                namespace=self.namespace,
+                command_key=key,
+                intent=payload,
+                created_at=datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None)
+            ))
+            db.commit()
+        except Exception as e:
+            print(f"⚠️ Failed to persist intent cache entry: {e}")
+        finally:
+            db.close()
+
+    def invalidate(self, command: Optional[str] = None) -> int:
+        """Drop one command, or everything when no command is given"""
+        with self._lock:
+            # Load first so a later get() cannot bring back rows whose delete fails below
+            if not self._loaded:
+                self._load()
+            if command is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                removed = 1 if self._entries.pop(normalize_command(command), None) else 0
+
+        db = SessionLocal()
+        try:
+            query = db.query(IntentCacheEntry)
+            if command is not None:
+                query = query.filter(
+                    IntentCacheEntry.namespace == self.namespace,
+                    IntentCacheEntry.command_key == normalize_command(command)
+                )
+            query.delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️ Failed to invalidate persisted intent cache entries: {e}")
+        finally:
+            db.close()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
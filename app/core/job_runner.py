@@ -0,0 +1,142 @@
+import os
+import json
+import asyncio
+import threading
+from contextlib import nullcontext
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Optional
+from app.db.job_writer import job_writer
+from app.core.metrics import FAILURES
+from app.core.profiler import ProfileCollector, profiling, save_profile
+
+# Job being processed by the current worker; copied into step threads with the context
+current_job_id: ContextVar[Optional[str]] = ContextVar("current_job_id", default=None)
+
+def progress_reporter() -> Callable[..., None]:
+    """Callback that records progress on the current job's row (a no-op outside a job)"""
+    job_id = current_job_id.get()
+    if job_id is None:
+        return lambda **progress: None
+
+    def report(**progress):
+        job_writer.update(job_id, progress=json.dumps(progress))
+    return report
+
+def job_status(result: dict) -> str:
+    """Final Job status for a process_command result"""
+    if result.get("success"):
+        return "completed"
+    for step in result.get("results", []):
+        output = step.get("result", {}).get("output")
+        if isinstance(output, dict) and output.get("cancelled"):
+            return "cancelled"
+    return "failed"
+
+class JobRunner:
+    """Runs agent commands on a bounded worker pool and tracks their Job rows"""
+
+    def __init__(self, agent, max_workers: Optional[int] = None):
+        self.agent = agent
+        self.max_workers = max_workers or int(os.getenv("DESKMATE_MAX_WORKERS", "4"))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="deskmate-job")
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: str, command: str, profile: bool = False) -> Future:
+        """Queue a command whose pending Job row was handed to job_writer.insert.
+
+        The row may still be queued rather than committed; readers overlay it
+        with job_writer.pending() until the write-behind thread lands it.
+        """
+        future = self._pool.submit(self._run, job_id, command, profile)
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+        return future
+
+    def _forget(self, job_id: str):
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def _run(self, job_id: str, command: str, profile: bool = False) -> dict:
+        """Worker body: pending -> running -> completed/failed"""
+        job_writer.update(job_id, status="running")
+        current_job_id.set(job_id)
+
+        collector = None
+        try:
+            with profiling() if profile else nullcontext() as collector:
+                result = self.agent.process_command(command)
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {e}")
+            FAILURES.inc(component="job")
+            self._store_profile(job_id, collector)
+            job_writer.update(job_id, wait=True, status="failed", result=json.dumps({
+                "command": command,
+                "success": False,
+                "error": f"Error processing command: {str(e)}"
+            }))
+            raise
+
+        # The final state is committed before the job counts as finished, so
+        # anyone woken by wait() reads the result from the database
+        result["job_id"] = job_id
+        if collector is not None and collector.error:
+            result["profile_error"] = collector.error
+        self._store_profile(job_id, collector)
+        status = job_status(result)
+        if status == "failed":
+            FAILURES.inc(component="job")
+        job_writer.update(
+            job_id,
+            wait=True,
+            status=status,
+            intent=result["intent"]["intent"],
+            result=json.dumps(result)
+        )
+        return result
+
+    def _store_profile(self, job_id: str, collector: Optional[ProfileCollector]):
+        if collector is None:
+            return
+        try:
+            if not save_profile(job_id, collector):
+                print(f"⚠️ No profile recorded for job {job_id}: {collector.error or 'nothing was captured'}")
+        except Exception as e:
+            print(f"⚠️ Could not save profile for job {job_id}: {e}")
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job, or the shell command a running job is executing"""
+        from app.plugins.shell_runner import shell_sessions
+
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            job_writer.update(job_id, status="cancelled")
+            return True
+        return shell_sessions.cancel(job_id)
+
+    def is_active(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._futures
+
+    async def wait(self, job_id: str, timeout: float) -> bool:
+        """Wait up to timeout seconds for a queued job; True once it is no longer active"""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is None:
+            return True
+
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            return False
+        except Exception:
+            # The failure has already been recorded on the Job row
+            pass
+        return True
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally let queued jobs finish"""
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,61 @@
+import re
+from typing import Dict, FrozenSet, Set, Tuple
+
+class KeywordMatcher:
+    """Finds every keyword contained in a text with a single compiled regex scan.
+
+    Each keyword carries a bitmask of the intent buckets it belongs to. The
+    keywords are folded into a character trie and compiled into one regex, so
+    at each position the engine follows a single branch instead of trying every
+    keyword. The pattern is a zero-width lookahead and the trie prefers the
+    longest keyword, so one left-to-right pass reports the longest keyword
+    starting at every position.
+    A match also implies every shorter keyword it contains ("directory" implies
+    "dir", "chatgpt" implies "gpt"), which is precomputed, so the result is the
+    exact set of keywords that `keyword in text` would report.
+    """
+
+    def __init__(self, keyword_masks: Dict[str, int]):
+        keywords = sorted(keyword_masks, key=len, reverse=True)
+        self._pattern = re.compile("(?=(" + _trie_pattern(keywords) + "))")
+        self._implied: Dict[str, FrozenSet[str]] = {}
+        self._masks: Dict[str, int] = {}
+        for keyword in keywords:
+            implied = frozenset(k for k in keywords if k in keyword)
+            mask = 0
+            for k in implied:
+                mask |= keyword_masks[k]
+            self._implied[keyword] = implied
+            self._masks[keyword] = mask
+
+    def scan(self, text: str) -> Tuple[int, Set[str]]:
+        """Return the combined bucket mask and the set of keywords found in text"""
+        mask = 0
+        found = set()
+        for keyword in self._pattern.findall(text):
+            mask |= self._masks[keyword]
+            found |= self._implied[keyword]
+        return mask, found
+
+
+def _trie_pattern(keywords) -> str:
+    """Build a regex for the keywords that shares common prefixes ("cat|cmd" -> "c(?:at|md)")"""
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        is_end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        # Optional suffix is greedy, so the longest keyword wins at each position
+        return group + "?" if is_end else group
+
+    return build(trie)
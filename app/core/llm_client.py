@@ -1,8 +1,13 @@
 import os
 import json
 import re
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Set
 from app.core.schema import Intent
+from app.core.intent_cache import IntentCache, cache_namespace
+from app.core.keyword_matcher import KeywordMatcher
+from app.core.gemini_registry import GeminiModelRegistry, get_gemini_registry, INTENT_MODELS
+from app.core.metrics import PARSE_INTENT_SECONDS, FALLBACKS
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,62 +26,114 @@ class RobustMockLLMClient:
             "shell": ["run", "execute", "command", "terminal", "shell", "cmd", "pwd", "ls", "dir"],
             "open_resource": ["open", "launch", "start", "visit", "go to", "play", "ask"],
             "create_file": ["create file", "make file", "new file", "write file"],
-            "create_folder": ["create folder", "make folder", "new folder", "make directory", "new directory"]
+            "create_folder": ["create folder", "make folder", "new folder", "make directory", "new directory"],
+            "search_content": ["in my documents", "in documents", "in my uploads", "inside documents", "search documents", "search content"]
         }
+        
+        # Deep links: "search X on Y", "ask gemini ..."
+        self.deep_link_words = ["search", "find", "look for", "ask"]
+        self.ask_platforms = ["gemini", "chatgpt", "perplexity", "claude", "gpt"]
+        self.system_words = ['system info', 'specs', 'cpu', 'ram', 'memory', 'what time', 'current time', 'clock']
+        
+        # Search/ask templates used by _create_open_resource_intent
+        self.action_words = ['search', 'ask', 'find', 'look for', 'query']
+        self.platform_map = {
+            'youtube': 'https://www.youtube.com/results?search_query={}',
+            'google': 'https://www.google.com/search?q={}',
+            'amazon': 'https://www.amazon.in/s?k={}',
+            'bing': 'https://www.bing.com/search?q={}',
+            'duckduckgo': 'https://duckduckgo.com/?q={}',
+            'github': 'https://github.com/search?q={}',
+            'stackoverflow': 'https://stackoverflow.com/search?q={}',
+            'perplexity': 'https://www.perplexity.ai/search?q={}',
+            'gemini': 'https://gemini.google.com/app?q={}',
+            'chatgpt': 'https://chat.openai.com/?q={}',
+            'gpt': 'https://chat.openai.com/?q={}',
+        }
+        
+        # Known websites that should be opened via open_url, not open_app
+        self.known_sites = frozenset([
+            "gemini", "chatgpt", "perplexity", "claude", "youtube", "google", "amazon", 
+            "netflix", "github", "stackoverflow", "woxsen", "gmail", "whatsapp", "spotify",
+            "facebook", "twitter", "instagram", "linkedin"
+        ])
+        self._url_hint = re.compile(r"\.com|\.org|\.net|\.edu|\.in|http")
+        self._explorer_hint = re.compile(r"explorer|folder|directory|file explorer")
+        self._terminal_hint = re.compile(r"terminal|cmd|command prompt|powershell")
+        
+        self._greetings = frozenset(self.intent_patterns["greeting"])
+        self._compile_keyword_tables()
+
+    def _compile_keyword_tables(self):
+        """Compile every keyword table into one matcher; each table gets a bucket bit"""
+        tables = {name: words for name, words in self.intent_patterns.items() if name != "greeting"}
+        tables.update({
+            "on": ["on"],
+            "read_or_summarize": ["read", "summarize"],
+            "deep_link": self.deep_link_words,
+            "ask_platform": self.ask_platforms,
+            "system": self.system_words,
+            "platform": list(self.platform_map),
+        })
+        
+        self._bits = {name: 1 << i for i, name in enumerate(tables)}
+        keyword_masks: Dict[str, int] = {}
+        for name, words in tables.items():
+            for word in words:
+                keyword_masks[word] = keyword_masks.get(word, 0) | self._bits[name]
+        self._matcher = KeywordMatcher(keyword_masks)
+        
+        # Generic buckets checked after the specific ones, in priority order
+        self._bucket_routes = [
+            (self._bits["help"], self._create_help_intent),
+            (self._bits["summarize"], self._create_summarize_intent),
+            (self._bits["read_file"], self._create_read_file_intent),
+            (self._bits["search_files"], self._create_search_intent),
+            (self._bits["email"], self._create_email_intent),
+            (self._bits["shell"], self._create_shell_intent),
+            (self._bits["system"], self._create_system_intent),
+        ]
 
     def parse_intent(self, command: str) -> Intent:
         """Parse command using robust pattern matching"""
         command_lower = command.lower()
+        mask, found = self._matcher.scan(command_lower)
+        bits = self._bits
         
         # 1. Check for file/folder creation (Specific)
-        for pattern in self.intent_patterns["create_file"]:
-            if pattern in command_lower:
-                return self._create_file_operation_intent(command, "create_file")
+        if mask & bits["create_file"]:
+            return self._create_file_operation_intent(command, "create_file")
         
-        for pattern in self.intent_patterns["create_folder"]:
-            if pattern in command_lower:
-                return self._create_file_operation_intent(command, "create_folder")
+        if mask & bits["create_folder"]:
+            return self._create_file_operation_intent(command, "create_folder")
+        
+        # Searching inside uploaded documents beats web search and filename search
+        if mask & bits["search_content"]:
+            return self._create_content_search_intent(command)
 
         # 2. Check for Deep Links (Search X on Y) - Prioritize over generic search
         # If command has "search"/"find" AND "on", it's likely a web search
-        if "on" in command_lower and any(w in command_lower for w in ["search", "find", "look for", "ask"]):
-             return self._create_open_resource_intent(command)
+        if mask & bits["on"] and mask & bits["deep_link"]:
+             return self._create_open_resource_intent(command, found)
              
         # Check for "Ask [Platform]" even without "on"
-        if command_lower.startswith("ask ") and any(p in command_lower for p in ["gemini", "chatgpt", "perplexity", "claude", "gpt"]):
-             return self._create_open_resource_intent(command)
+        if command_lower.startswith("ask ") and mask & bits["ask_platform"]:
+             return self._create_open_resource_intent(command, found)
 
         # 3. Check for open resource (Specific)
-        if any(p in command_lower for p in self.intent_patterns["open_resource"]):
+        if mask & bits["open_resource"]:
             # Avoid capturing "open file" as open_resource if it's actually read_file
-            if not ("read" in command_lower or "summarize" in command_lower):
-                return self._create_open_resource_intent(command)
+            if not mask & bits["read_or_summarize"]:
+                return self._create_open_resource_intent(command, found)
 
         # 4. Check for other intents
-        if any(p == command_lower for p in self.intent_patterns["greeting"]): # Exact match for greeting
+        if command_lower in self._greetings: # Exact match for greeting
             return self._create_greeting_intent(command)
-            
-        if any(p in command_lower for p in self.intent_patterns["help"]):
-            return self._create_help_intent(command)
-            
-        if any(p in command_lower for p in self.intent_patterns["summarize"]):
-            return self._create_summarize_intent(command)
-            
-        if any(p in command_lower for p in self.intent_patterns["read_file"]):
-            return self._create_read_file_intent(command)
-            
-        if any(p in command_lower for p in self.intent_patterns["search_files"]):
-            return self._create_search_intent(command)
-            
-        if any(p in command_lower for p in self.intent_patterns["email"]):
-            return self._create_email_intent(command)
-            
-        if any(p in command_lower for p in self.intent_patterns["shell"]):
-            return self._create_shell_intent(command)
-            
-        # Check for system info/time
-        if any(w in command_lower for w in ['system info', 'specs', 'cpu', 'ram', 'memory', 'what time', 'current time', 'clock']):
-             return self._create_system_intent(command)
+        
+        # Help, summarize, read, search, email, shell, then system info/time
+        for bit, create_intent in self._bucket_routes:
+            if mask & bit:
+                return create_intent(command)
             
         # Default to QA
         return self._create_qa_intent(command)
@@ -162,6 +219,19 @@ class RobustMockLLMClient:
             assumptions=["search directory exists"]
         )
 
+    def _create_content_search_intent(self, command: str) -> Intent:
+        query = command.lower()
+        for phrase in self.intent_patterns["search_content"]:
+            query = query.replace(phrase, " ")
+        query = self._extract_search_query(query) or command
+        return Intent(
+            intent="search_content",
+            target=query,
+            steps=[{"action": "search_content", "params": {"query": query}}],
+            confirmation_required=False,
+            assumptions=["documents have been uploaded"]
+        )
+
     def _create_email_intent(self, command: str) -> Intent:
         return Intent(
             intent="draft_email",
@@ -190,7 +260,8 @@ class RobustMockLLMClient:
     def _determine_shell_command(self, command: str, is_windows: bool) -> str:
         command_lower = command.lower()
         if 'pwd' in command_lower:
-            return "echo %CD%" if is_windows else "pwd"
+            # The shell runner translates pwd for cmd.exe itself
+            return "pwd"
         elif 'whoami' in command_lower:
             return "whoami"
         elif 'dir' in command_lower or 'ls' in command_lower:
@@ -200,33 +271,22 @@ class RobustMockLLMClient:
         else:
             return "dir" if is_windows else "ls"
 
-    def _create_open_resource_intent(self, command: str) -> Intent:
+    def _create_open_resource_intent(self, command: str, found: Optional[Set[str]] = None) -> Intent:
         command_lower = command.lower()
+        if found is None:
+            _, found = self._matcher.scan(command_lower)
         
         # 1. Handle "Search/Ask X on Y" pattern (Deep Linking)
         # Keywords: search, ask, find, query, look up
-        action_words = ['search', 'ask', 'find', 'look for', 'query']
-        platform_map = {
-            'youtube': 'https://www.youtube.com/results?search_query={}',
-            'google': 'https://www.google.com/search?q={}',
-            'amazon': 'https://www.amazon.in/s?k={}',
-            'bing': 'https://www.bing.com/search?q={}',
-            'duckduckgo': 'https://duckduckgo.com/?q={}',
-            'github': 'https://github.com/search?q={}',
-            'stackoverflow': 'https://stackoverflow.com/search?q={}',
-            'perplexity': 'https://www.perplexity.ai/search?q={}',
-            'gemini': 'https://gemini.google.com/app?q={}',
-            'chatgpt': 'https://chat.openai.com/?q={}',
-            'gpt': 'https://chat.openai.com/?q={}',
-        }
+        has_action_word = not found.isdisjoint(self.action_words)
         
-        for platform, template in platform_map.items():
-            if platform in command_lower:
+        for platform, template in self.platform_map.items():
+            if platform in found:
                 # Check if it's a search/ask command
-                if any(w in command_lower for w in action_words) or f"on {platform}" in command_lower or f"ask {platform}" in command_lower:
+                if has_action_word or f"on {platform}" in command_lower or f"ask {platform}" in command_lower:
                     # Extract query
                     query = command_lower
-                    for w in action_words + [platform, 'on', 'in', 'at', 'for', 'about', 'to', 'write', 'a']:
+                    for w in self.action_words + [platform, 'on', 'in', 'at', 'for', 'about', 'to', 'write', 'a']:
                         query = query.replace(w, ' ')
                     query = query.strip()
                     
@@ -245,14 +305,7 @@ class RobustMockLLMClient:
         # 2. Handle simple "Open X" where X is a known website
         resource = command_lower.replace('open', '').replace('launch', '').replace('start', '').replace('visit', '').replace('go to', '').strip()
         
-        # Known websites that should be opened via open_url, not open_app
-        known_sites = [
-            "gemini", "chatgpt", "perplexity", "claude", "youtube", "google", "amazon", 
-            "netflix", "github", "stackoverflow", "woxsen", "gmail", "whatsapp", "spotify",
-            "facebook", "twitter", "instagram", "linkedin"
-        ]
-        
-        if resource in known_sites or any(x in resource for x in ['.com', '.org', '.net', '.edu', '.in', 'http']):
+        if resource in self.known_sites or self._url_hint.search(resource):
             return Intent(
                 intent="open_website",
                 target=resource,
@@ -261,7 +314,7 @@ class RobustMockLLMClient:
                 assumptions=["url is valid"]
             )
             
-        elif any(x in resource for x in ['explorer', 'folder', 'directory', 'file explorer']):
+        elif self._explorer_hint.search(resource):
             path = os.path.expanduser("~")
             return Intent(
                 intent="open_explorer",
@@ -271,7 +324,7 @@ class RobustMockLLMClient:
                 assumptions=["path exists"]
             )
             
-        elif any(x in resource for x in ['terminal', 'cmd', 'command prompt', 'powershell']):
+        elif self._terminal_hint.search(resource):
             return Intent(
                 intent="run_shell_command",
                 target="terminal",
@@ -345,37 +398,9 @@ class RobustMockLLMClient:
         return ' '.join(query_words) if query_words else ""
 
 
-class GeminiLLMClient:
-    """Real LLM client using Google Gemini with robust error handling"""
-    
-    def __init__(self):
-        self.api_key = os.getenv("GEMINI_API_KEY")
-        self.model = None
-        self.is_available = False
-        self.fallback_client = RobustMockLLMClient()
-        
-        if self.api_key:
-            try:
-                import google.generativeai as genai
-                genai.configure(api_key=self.api_key)
-                model_names = ['models/gemini-2.0-flash', 'models/gemini-pro']
-                for model_name in model_names:
-                    try:
-                        self.model = genai.GenerativeModel(model_name)
-                        self.is_available = True
-                        break
-                    except:
-                        continue
-            except Exception as e:
-                print(f"Gemini Init Error: {e}")
-                self.is_available = False
-    
-    def parse_intent(self, command: str) -> Intent:
-        if not self.is_available or not self.model:
-            return self.fallback_client.parse_intent(command)
-        
-        try:
-            prompt = f"""Analyze command: "{command}"
+# Prompt sent to Gemini for intent parsing. Any change here (or to the model)
+# changes the intent cache namespace, which invalidates previously cached parses.
+INTENT_PROMPT = """Analyze command: "{command}"
             Return JSON with intent, target, and steps.
             
             Capabilities:
@@ -385,12 +410,15 @@ class GeminiLLMClient:
             4. Terminal: "open terminal" -> open_terminal()
             5. Q&A: "explain ML" -> answer_question("explain ML")
             6. System: "system info" -> get_system_info(), "what time is it" -> get_time()
+            7. Document contents: "find GST invoices in my documents" -> search_content("GST invoices")
+            8. Summaries: "summarize report.pdf" -> summarize(file_path="uploads/report.pdf", style="short")
             
             Rules:
             - **CRITICAL**: If command is "Ask Gemini...", "Ask ChatGPT...", "Ask Perplexity...", "Search on Google...", ALWAYS use `open_url` with the search URL. Do NOT use `answer_question`.
             - For "search X on Y", construct the search URL.
             - For "open gemini", "open perplexity", use open_url with just the name (e.g. "gemini") or full URL.
             - For file paths, keep them exactly as written (preserve casing/slashes).
+            - Steps run in order by default. When some steps do not need each other (e.g. opening several sites), give EVERY step a "depends_on" list of the 0-based indices of steps it needs ([] if none) so independent steps run in parallel.
             
             JSON Format:
             {{
@@ -399,11 +427,48 @@ class GeminiLLMClient:
                 "steps": [{{"action": "action_name", "params": {{...}}}}]
             }}
             """
-            response = self.model.generate_content(prompt)
+
+
+class GeminiLLMClient:
+    """Real LLM client using Google Gemini with robust error handling"""
+    
+    def __init__(self, registry: Optional[GeminiModelRegistry] = None):
+        self.registry = registry or get_gemini_registry()
+        self.api_key = self.registry.api_key
+        self.fallback_client = RobustMockLLMClient()
+        self.model_name, self.model = self.registry.model_for(INTENT_MODELS)
+        self.is_available = self.model is not None
+        
+        # The model's own name where it has one, so a stand-in model gets its own namespace
+        cache_model = getattr(self.model, "model_name", None) or self.model_name or ""
+        self.intent_cache = IntentCache(cache_namespace(INTENT_PROMPT, cache_model))
+    
+    def parse_intent(self, command: str) -> Intent:
+        start = time.perf_counter()
+        intent, source = self._parse_intent(command)
+        PARSE_INTENT_SECONDS.observe(time.perf_counter() - start, source=source)
+        return intent
+    
+    def _parse_intent(self, command: str):
+        """The Intent and where it came from: gemini, cache or mock"""
+        if not self.is_available or not self.model:
+            return self.fallback_client.parse_intent(command), "mock"
+        
+        cached = self.intent_cache.get(command)
+        if cached is not None:
+            return cached, "cache"
+        
+        try:
+            prompt = INTENT_PROMPT.format(command=command)
+            response = self.registry.generate(self.model, prompt)
             text = response.text.strip()
             match = re.search(r'\{.*\}', text, re.DOTALL)
             if match:
-                return Intent(**json.loads(match.group()))
-            return self.fallback_client.parse_intent(command)
+                intent = Intent(**json.loads(match.group()))
+                # Only Gemini parses are cached; fallback parses are cheap and may be degraded
+                self.intent_cache.put(command, intent)
+                return intent, "gemini"
         except:
-            return self.fallback_client.parse_intent(command)
\ No newline at end of file
+            pass
+        FALLBACKS.inc(component="intent")
+        return self.fallback_client.parse_intent(command), "mock"
\ No newline at end of file
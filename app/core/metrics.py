@@ -0,0 +1,245 @@
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Seconds; spans a cached intent lookup (~µs) to a long Gemini map-reduce (~minutes)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class _Sharded:
+    """Per-thread value shards, so recording never takes a lock.
+
+    Each thread writes only to its own shard (a list of numbers); the lock is
+    taken once per thread per metric, to register the shard. Shards of
+    threads that have exited are folded into one, so short-lived pool
+    threads do not grow memory. Readers sum the shards, which may miss an
+    observation that is in flight but never double-counts one.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._local = threading.local()
+        self._retired = factory()
+        self._shards: List[Tuple[threading.Thread, list]] = []
+        self._lock = threading.Lock()
+
+    def shard(self) -> list:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = self._factory()
+            with self._lock:
+                self._compact()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _compact(self):
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                for i, value in enumerate(shard):
+                    self._retired[i] += value
+        self._shards = live
+
+    def shards(self) -> List[list]:
+        with self._lock:
+            self._compact()
+            return [self._retired] + [shard for _, shard in self._shards]
+
+
+class _Metric:
+    kind = ""
+    suffix = ""  # appended to the name for the exposed family, as prometheus_client does
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_text(self, key: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        family = self.name + self.suffix
+        lines = [f"# HELP {family} {self.documentation}", f"# TYPE {family} {self.kind}"]
+        with self._lock:
+            children = sorted(self._children.items())
+        for key, child in children:
+            lines.extend(self._render_child(key, child))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self._values = _Sharded(lambda: [0.0])
+
+    def inc(self, amount: float = 1):
+        self._values.shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return sum(shard[0] for shard in self._values.shards())
+
+
+class Counter(_Metric):
+    kind = "counter"
+    suffix = "_total"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1, **labels):
+        self.labels(**labels).inc(amount)
+
+    def _render_child(self, key, child):
+        return [f"{self.name}_total{self._label_text(key)} {_number(child.value)}"]
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # Per shard: one count per bucket plus +Inf, then the running sum
+        self._values = _Sharded(lambda: [0] * (len(buckets) + 1) + [0.0])
+
+    def observe(self, value: float):
+        shard = self._values.shard()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """Per-bucket (non-cumulative) counts, with +Inf last, and the sum"""
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for shard in self._values.shards():
+            for i in range(len(counts)):
+                counts[i] += shard[i]
+            total += shard[-1]
+        return counts, total
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float, **labels):
+        self.labels(**labels).observe(value)
+
+    def time(self, **labels):
+        return self.labels(**labels).time()
+
+    def _render_child(self, key, child):
+        counts, total = child.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = 'le="%s"' % ("+Inf" if bound == float("inf") else _number(bound))
+            lines.append(f"{self.name}_bucket{self._label_text(key, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{self._label_text(key)} {_number(total)}")
+        lines.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+registry = MetricsRegistry()
+
+PARSE_INTENT_SECONDS = registry.histogram(
+    "deskmate_parse_intent_seconds", "Time to turn a command into an Intent", ["source"])
+ACTION_SECONDS = registry.histogram(
+    "deskmate_action_seconds", "Time to execute one plan step", ["action", "outcome"])
+PLUGIN_SECONDS = registry.histogram(
+    "deskmate_plugin_call_seconds", "Time spent in plugin methods", ["plugin", "method"])
+DB_COMMIT_SECONDS = registry.histogram(
+    "deskmate_db_commit_seconds", "Time to commit a transaction of job writes", ["kind"])
+HTTP_SECONDS = registry.histogram(
+    "deskmate_http_request_seconds", "Time for an HTTP handler to produce its response", ["method", "route", "status"])
+FALLBACKS = registry.counter(
+    "deskmate_fallbacks", "Times a Gemini-backed path fell back to an offline answer", ["component"])
+FAILURES = registry.counter(
+    "deskmate_failures", "Failed steps, jobs and database writes", ["component"])
+CACHE_REQUESTS = registry.counter(
+    "deskmate_cache_requests", "Cache lookups by outcome", ["cache", "result"])
+
+def observe_plugin(func):
+    """Record a plugin method's duration in PLUGIN_SECONDS, labelled by class and method"""
+    plugin, _, method = func.__qualname__.rpartition(".")
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            PLUGIN_SECONDS.observe(time.perf_counter() - start, plugin=plugin, method=method)
+    return wrapper
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import platform
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+GB = 1024 ** 3
+
+@lru_cache(maxsize=1)
+def host_info() -> Dict[str, Any]:
+    """Facts about the machine that do not change while the server runs, computed once"""
+    os_name = platform.system()
+    os_release = platform.release()
+    os_version = platform.version()
+
+    # Windows 11 still reports release "10"; it has build number >= 22000
+    if os_name == "Windows" and os_release == "10":
+        build_number = int(os_version.split('.')[-1]) if os_version else 0
+        os_display = "Windows 11" if build_number >= 22000 else "Windows 10"
+    else:
+        os_display = f"{os_name} {os_release}"
+
+    # Simplify processor name if too long
+    processor = platform.processor()
+    if len(processor) > 50:
+        processor = processor.split(',')[0]
+
+    info = {
+        "system": os_display,
+        "release": os_release,
+        "version": os_version,
+        "machine": platform.machine(),
+        "processor": processor,
+        "python_version": platform.python_version(),
+        "architecture": "64-bit" if sys.maxsize > 2**32 else "32-bit",
+        # Storage info (C: drive on Windows, / on Unix)
+        "disk_path": "C:\\" if os_name == "Windows" else "/"
+    }
+    if psutil is not None:
+        cpu_freq = psutil.cpu_freq()
+        info.update({
+            "cpu_cores": psutil.cpu_count(logical=False),
+            "cpu_logical_cores": psutil.cpu_count(logical=True),
+            "cpu_max_frequency_mhz": round(cpu_freq.max) if cpu_freq else 0,
+            "ram_total_gb": round(psutil.virtual_memory().total / GB, 2),
+            "disk_total_gb": round(psutil.disk_usage(info["disk_path"]).total / GB, 2)
+        })
+    return info
+
+
+class MetricsSampler:
+    """Samples CPU, RAM and disk usage on a background thread into a fixed-size ring buffer.
+
+    cpu_percent() is read without an interval, i.e. as the average since the
+    previous sample, so neither the sampler nor its readers ever block on it.
+    """
+
+    def __init__(self, interval: Optional[float] = None, capacity: Optional[int] = None):
+        self.interval = interval or float(os.getenv("DESKMATE_METRICS_INTERVAL", "2"))
+        self.capacity = capacity or int(os.getenv("DESKMATE_METRICS_HISTORY", "1800"))
+        self._samples = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._primed = False
+
+    @property
+    def available(self) -> bool:
+        return psutil is not None
+
+    def start(self) -> Optional[threading.Thread]:
+        if not self.available or self._thread is not None:
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"⚠️ Metrics sample failed: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def sample(self) -> Dict[str, Any]:
+        """Take one sample and append it to the history"""
+        with self._lock:
+            if not self._primed:
+                # The first interval-less reading has nothing to compare against; concurrent
+                # first callers wait here instead of each priming and reading 0.0
+                psutil.cpu_percent(interval=0.1)
+                self._primed = True
+
+        cpu_freq = psutil.cpu_freq()
+        ram = psutil.virtual_memory()
+        disk = psutil.disk_usage(host_info()["disk_path"])
+        sample = {
+            "timestamp": time.time(),
+            "cpu_percent": round(psutil.cpu_percent(interval=None), 1),
+            "cpu_frequency_mhz": round(cpu_freq.current) if cpu_freq else 0,
+            "ram_used_gb": round(ram.used / GB, 2),
+            "ram_available_gb": round(ram.available / GB, 2),
+            "ram_percent": round(ram.percent, 1),
+            "disk_used_gb": round(disk.used / GB, 2),
+            "disk_free_gb": round(disk.free / GB, 2),
+            "disk_percent": round(disk.percent, 1)
+        }
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Most recent sample; sampled on demand if the background thread has not produced one"""
+        if not self.available:
+            return None
+        with self._lock:
+            if self._samples:
+                return self._samples[-1]
+        return self.sample()
+
+    def history(self, minutes: float) -> List[Dict[str, Any]]:
+        """Samples from the last `minutes` minutes, oldest first"""
+        since = time.time() - minutes * 60
+        with self._lock:
+            samples = list(self._samples)
+        # The deque is in time order, so only the tail needs scanning
+        start = len(samples)
+        while start > 0 and samples[start - 1]["timestamp"] >= since:
+            start -= 1
+        return samples[start:]
+
+
+metrics_sampler = MetricsSampler()
@@ -0,0 +1,147 @@
+import os
+import io
+import sys
+import zlib
+import marshal
+import pstats
+import cProfile
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+from sqlalchemy import delete, insert, select
+from app.db.database import engine
+from app.db.models import JobProfile
+
+# Requests carrying this header are profiled regardless of sampling
+PROFILE_HEADER = "X-DeskMate-Profile"
+
+# Collector of the process_command run being profiled; copied into step threads with the context
+current_profile: ContextVar[Optional["ProfileCollector"]] = ContextVar("current_profile", default=None)
+
+_requests = itertools.count()
+
+# From Python 3.12 cProfile is built on sys.monitoring: one profiler sees every thread in
+# the process and a second enable() fails. Before that it only sees the thread it runs on.
+PROCESS_WIDE = sys.version_info >= (3, 12)
+# One profiled command at a time, so profiles neither fight over cProfile nor mix jobs
+_profiling_lock = threading.Lock()
+PROFILE_WAIT_SECONDS = float(os.getenv("DESKMATE_PROFILE_WAIT", "10"))
+
+def should_profile(header_value: Optional[str], sample_every: Optional[int] = None) -> bool:
+    """Profile when the header asks for it, or for 1 in DESKMATE_PROFILE_SAMPLE requests (0 = never)"""
+    if header_value and header_value.strip().lower() in ("1", "true", "yes", "on"):
+        return True
+    if sample_every is None:
+        sample_every = int(os.getenv("DESKMATE_PROFILE_SAMPLE", "0"))
+    return sample_every > 0 and next(_requests) % sample_every == 0
+
+
+class ProfileCollector:
+    """cProfile runs for one command, merged on demand.
+
+    Before Python 3.12 cProfile only sees the thread it is enabled on, so the
+    job's worker and each step thread profile themselves and hand their
+    profile in here. From 3.12 the worker's single profile already covers the
+    step threads (and, unavoidably, any unprofiled work running alongside).
+    error says why nothing was recorded, when a profile could not be taken.
+    """
+
+    def __init__(self):
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self.error: Optional[str] = None
+
+    @contextmanager
+    def record(self):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Another profiler (or a debugger) is already active
+            self.error = f"cProfile is unavailable: {e}"
+            print(f"⚠️ Profiling skipped: {self.error}")
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self._profiles.append(profile)
+
+    def stats(self) -> Optional[pstats.Stats]:
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+@contextmanager
+def profiling(wait: Optional[float] = None):
+    """Profile the enclosed block, and any steps it runs, into a new collector.
+
+    Waits up to wait seconds (DESKMATE_PROFILE_WAIT) for another profiled
+    command to finish; after that the block runs unprofiled and the
+    collector's error says so.
+    """
+    collector = ProfileCollector()
+    if not _profiling_lock.acquire(timeout=PROFILE_WAIT_SECONDS if wait is None else wait):
+        collector.error = "another profiled command was still running"
+        print(f"⚠️ Profiling skipped: {collector.error}")
+        yield collector
+        return
+    token = current_profile.set(collector)
+    try:
+        with collector.record():
+            yield collector
+    finally:
+        current_profile.reset(token)
+        _profiling_lock.release()
+
+def run_profiled(func, *args, **kwargs):
+    """Call func, profiling it when the current command is being profiled"""
+    collector = current_profile.get()
+    if collector is None or PROCESS_WIDE:
+        # Not profiled, or already seen by the command's process-wide profile
+        return func(*args, **kwargs)
+    with collector.record():
+        return func(*args, **kwargs)
+
+def save_profile(job_id: str, collector: ProfileCollector) -> bool:
+    """Store the merged profile (pstats dump format, zlib-compressed) for a job"""
+    stats = collector.stats()
+    if stats is None:
+        return False
+    data = zlib.compress(marshal.dumps(stats.stats))
+    with engine.begin() as conn:
+        conn.execute(delete(JobProfile).where(JobProfile.job_id == job_id))
+        conn.execute(insert(JobProfile), [{"job_id": job_id, "data": data, "size": len(data)}])
+    return True
+
+def load_profile(job_id: str) -> Optional[bytes]:
+    """A job's profile in the format pstats.Stats(path) and snakeviz read, or None"""
+    with engine.connect() as conn:
+        data = conn.execute(select(JobProfile.data).where(JobProfile.job_id == job_id)).scalar()
+    return zlib.decompress(data) if data is not None else None
+
+def profile_report(raw: bytes, limit: int = 40, sort: str = "cumulative") -> str:
+    """Plain-text pstats listing of the slowest functions in a stored profile"""
+    stream = io.StringIO()
+    stats = pstats.Stats(_StatsSource(marshal.loads(raw)), stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+class _StatsSource:
+    """Stand-in that lets pstats.Stats load already-unmarshalled stats"""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
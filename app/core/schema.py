@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 
 class Intent(BaseModel):
@@ -13,6 +13,8 @@ class Intent(BaseModel):
 class ActionStep(BaseModel):
     action: str
     params: Dict[str, Any]
+    id: Optional[str] = None
+    depends_on: Optional[List[Union[int, str]]] = None  # step indices or ids this step needs
 
 class ExecutionResult(BaseModel):
     success: bool
@@ -22,13 +24,23 @@ class ExecutionResult(BaseModel):
 class JobCreate(BaseModel):
     command: str
 
+class BatchCreate(BaseModel):
+    commands: List[str]
+    max_concurrency: Optional[int] = None  # capped at DESKMATE_BATCH_CONCURRENCY
+
 class JobResponse(BaseModel):
     job_id: str
     status: str
     result: Optional[str] = None
+    result_size: Optional[int] = None  # uncompressed bytes
+    result_offloaded: bool = False  # stored compressed in job_results rather than inline
+    progress: Optional[Dict[str, Any]] = None
     created_at: datetime
 
 class FileUploadResponse(BaseModel):
     filename: str
     file_path: str
-    message: str
\ No newline at end of file
+    message: str
+    content_hash: Optional[str] = None
+    size: Optional[int] = None
+    duplicate: bool = False
\ No newline at end of file
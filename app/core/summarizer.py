@@ -0,0 +1,156 @@
+import re
+import math
+from typing import Dict, List, Tuple
+import numpy as np
+
+# Sentence ends at . ! ? (optionally followed by a closing quote/bracket) before whitespace, or at a blank line
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])["\')\]]*\s+(?=["\'(\[]?[A-Z0-9])|\n\s*\n')
+TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+out over own same she should so some such than that the their them then there these they this those through to
+too under until up very was we were what when where which while who whom why will with would you your yours
+""".split())
+
+# Abbreviations whose trailing period does not end a sentence
+ABBREVIATIONS = frozenset(["mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "fig", "no", "inc", "ltd", "co"])
+
+# Sentences per style; "detailed" reads like a short abstract
+STYLE_SENTENCES = {"short": 3, "detailed": 8}
+
+def split_sentences(text: str) -> List[str]:
+    """Sentence segmentation in a single regex pass"""
+    sentences = []
+    start = 0
+    for boundary in SENTENCE_BOUNDARY.finditer(text):
+        fragment = text[start:boundary.start()]
+        if fragment.endswith(".") and fragment.rsplit(None, 1)[-1][:-1].lower() in ABBREVIATIONS:
+            continue
+        sentence = " ".join((fragment + boundary.group().strip()).split())
+        if sentence:
+            sentences.append(sentence)
+        start = boundary.end()
+    tail = " ".join(text[start:].split())
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+class ExtractiveSummarizer:
+    """Offline TextRank over sparse TF-IDF sentence vectors.
+
+    The sentence-term matrix is kept in coordinate form (row, column, value
+    arrays) and the sentence-similarity graph X·Xᵀ is never materialized: each
+    PageRank iteration is two sparse matrix-vector products done with
+    np.bincount, so the cost is O(non-zeros) rather than O(sentences²).
+    Inputs longer than chunk_sentences are ranked chunk by chunk and the
+    chunk winners are ranked again, which bounds memory and keeps every part
+    of a long document eligible.
+    """
+
+    def __init__(self, damping: float = 0.85, iterations: int = 30, tolerance: float = 1e-6,
+                 chunk_sentences: int = 2000, min_tokens: int = 4):
+        self.damping = damping
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.chunk_sentences = chunk_sentences
+        self.min_tokens = min_tokens
+
+    def _matrix(self, sentences: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """Row-normalized TF-IDF in coordinate form: (rows, cols, values, vocabulary size)"""
+        vocabulary: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for i, sentence in enumerate(sentences):
+            tokens = [t for t in TOKEN.findall(sentence.lower()) if t not in STOPWORDS and len(t) > 1]
+            if len(tokens) < self.min_tokens:
+                continue
+            for token in tokens:
+                cols.append(vocabulary.setdefault(token, len(vocabulary)))
+            rows.extend([i] * len(tokens))
+
+        n, v = len(sentences), len(vocabulary)
+        if not rows:
+            return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0), v
+
+        # Collapse repeated (sentence, term) pairs into counts
+        keys, counts = np.unique(np.asarray(rows, np.int64) * v + np.asarray(cols, np.int64), return_counts=True)
+        rows_arr, cols_arr = keys // v, keys % v
+
+        document_frequency = np.bincount(cols_arr, minlength=v)
+        idf = np.log((1 + n) / (1 + document_frequency)) + 1.0
+        values = (1.0 + np.log(counts)) * idf[cols_arr]
+        norms = np.sqrt(np.bincount(rows_arr, weights=values ** 2, minlength=n))
+        values /= norms[rows_arr]
+        return rows_arr, cols_arr, values, v
+
+    def rank(self, sentences: List[str]) -> np.ndarray:
+        """TextRank score per sentence; sentences too short to judge score 0"""
+        n = len(sentences)
+        rows, cols, values, v = self._matrix(sentences)
+        if not len(values):
+            return np.zeros(n)
+
+        has_terms = np.bincount(rows, minlength=n) > 0
+
+        def similarity_times(vector: np.ndarray) -> np.ndarray:
+            # (X·Xᵀ - I)·vector without building X·Xᵀ; rows are unit length so the diagonal is 1
+            projected = np.bincount(cols, weights=values * vector[rows], minlength=v)
+            return np.bincount(rows, weights=values * projected[cols], minlength=n) - vector * has_terms
+
+        degree = similarity_times(np.ones(n))
+        active = degree > 1e-12
+        if not active.any():
+            return np.zeros(n)
+        inverse_degree = np.where(active, 1.0 / np.where(active, degree, 1.0), 0.0)
+
+        count = active.sum()
+        scores = np.where(active, 1.0 / count, 0.0)
+        for _ in range(self.iterations):
+            updated = (1 - self.damping) / count + self.damping * similarity_times(scores * inverse_degree)
+            updated = np.where(active, updated, 0.0)
+            if np.abs(updated - scores).sum() < self.tolerance:
+                scores = updated
+                break
+            scores = updated
+        return scores
+
+    def select(self, sentences: List[str], k: int) -> List[int]:
+        """Indices of the top k sentences in document order, ranking long inputs chunk by chunk"""
+        if len(sentences) <= self.chunk_sentences:
+            scores = self.rank(sentences)
+            return sorted(np.argsort(-scores, kind="stable")[:k].tolist())
+
+        # Chunked mode: keep each chunk's best sentences, then rank the survivors together
+        per_chunk = max(k, 2)
+        survivors: List[int] = []
+        for start in range(0, len(sentences), self.chunk_sentences):
+            chunk = sentences[start:start + self.chunk_sentences]
+            scores = self.rank(chunk)
+            survivors.extend(start + i for i in np.argsort(-scores, kind="stable")[:per_chunk].tolist())
+        survivors.sort()
+        final = self.select([sentences[i] for i in survivors], k)
+        return [survivors[i] for i in final]
+
+    def summarize(self, text: str, max_sentences: int = 3) -> Dict:
+        sentences = split_sentences(text)
+        if len(sentences) <= max_sentences:
+            return {"summary": " ".join(sentences), "sentence_count": len(sentences), "selected": list(range(len(sentences)))}
+        selected = self.select(sentences, max_sentences)
+        return {
+            "summary": " ".join(sentences[i] for i in selected),
+            "sentence_count": len(sentences),
+            "selected": selected
+        }
+
+
+def sentences_for(style: str, word_count: int) -> int:
+    """Summary length: the style's base count plus a little more per tenfold growth past 1k words"""
+    base = STYLE_SENTENCES.get(style, STYLE_SENTENCES["short"])
+    return base + int(math.log10(max(word_count, 1000) / 1000)) * max(1, base // 3)
+
+
+extractive_summarizer = ExtractiveSummarizer()
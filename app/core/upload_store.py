@@ -0,0 +1,87 @@
+import os
+import uuid
+import contextlib
+import hashlib
+from typing import Optional, Tuple
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from app.db.database import SessionLocal
+from app.db.models import File as FileModel
+
+UPLOAD_DIR = os.getenv("DESKMATE_UPLOAD_DIR", "uploads")
+CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("DESKMATE_MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload stream passes the configured size limit"""
+
+
+def storage_path(content_hash: str, extension: str, upload_dir: str = UPLOAD_DIR) -> str:
+    """Content-addressed location with a two-level fan-out: uploads/ab/cd/abcd....pdf"""
+    return os.path.join(upload_dir, content_hash[:2], content_hash[2:4], f"{content_hash}{extension}")
+
+
+async def store_upload(file: UploadFile, extension: str, upload_dir: str = UPLOAD_DIR,
+                       max_bytes: int = MAX_UPLOAD_BYTES) -> Tuple[str, str, int, bool]:
+    """Copy an upload to disk in chunks, hashing as it goes.
+
+    The body has already been spooled by Starlette when this runs; the
+    UploadSizeLimit middleware is what stops an oversized upload in flight,
+    and max_bytes here is a second check on the spooled size.
+
+    Returns (file_path, content_hash, size, duplicate). Identical content is
+    stored once; a duplicate upload leaves the existing file in place.
+    """
+    tmp_dir = os.path.join(upload_dir, ".tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as buffer:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds the {max_bytes} byte limit")
+                digest.update(chunk)
+                await run_in_threadpool(buffer.write, chunk)
+    except BaseException:
+        # The file may not exist yet; a cleanup error must not hide the original one
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+    content_hash = digest.hexdigest()
+    file_path = storage_path(content_hash, extension, upload_dir)
+    if os.path.exists(file_path):
+        os.remove(tmp_path)
+        return file_path, content_hash, size, True
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    os.replace(tmp_path, file_path)
+    return file_path, content_hash, size, False
+
+
+def resolve_upload_path(file_path: str) -> str:
+    """Map legacy "uploads/<filename>" paths to the newest stored copy of that filename"""
+    if not file_path or os.path.exists(file_path):
+        return file_path
+
+    filename = os.path.basename(file_path)
+    db = SessionLocal()
+    try:
+        row: Optional[FileModel] = (db.query(FileModel)
+                                    .filter(func.lower(FileModel.filename) == filename.lower())
+                                    .order_by(FileModel.id.desc())
+                                    .first())
+    except Exception:
+        row = None
+    finally:
+        db.close()
+    return row.file_path if row else file_path
@@ -1,20 +1,72 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker
 from app.db.models import Base
 import os
 
 # SQLite database URL - using built-in SQLite
-SQLALCHEMY_DATABASE_URL = "sqlite:///./deskmate.db"
+SQLALCHEMY_DATABASE_URL = os.getenv("DESKMATE_DATABASE_URL", "sqlite:///./deskmate.db")
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
     connect_args={"check_same_thread": False}
 )
 
+# WAL lets readers work while a write is in progress; synchronous=NORMAL only
+# fsyncs at checkpoints, which is safe against corruption in WAL mode.
+# auto_vacuum has to come first: it only takes effect on a new database
+# before anything is written (existing ones are converted by retention)
+SQLITE_PRAGMAS = {
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+    "cache_size": -20000,  # KiB, i.e. ~20 MB page cache per connection
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    create_fts_tables()
+
+def create_fts_tables():
+    """FTS5 full-text index over uploaded document text; one row per stored content hash"""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS document_index USING fts5(
+                content_hash UNINDEXED,
+                content,
+                tokenize = 'porter unicode61'
+            )
+        """))
+
+def add_missing_columns():
+    """create_all() never alters existing tables, so add columns introduced since the DB was created"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
 
 def get_db():
     db = SessionLocal()
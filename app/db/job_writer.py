@@ -0,0 +1,226 @@
+import os
+import time
+import atexit
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from sqlalchemy import insert, update
+from app.db.database import engine
+from app.db.models import Job
+from app.db.result_store import pack_result, store_blob
+from app.core.metrics import DB_COMMIT_SECONDS, FAILURES
+
+def utcnow() -> datetime:
+    """Naive UTC timestamp, matching what SQLite's CURRENT_TIMESTAMP stores"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobWriter:
+    """Write-behind persistence for Job rows.
+
+    insert()/update() only record the change in memory and return; a
+    background thread commits everything queued in one transaction per batch,
+    so request handlers never wait on the database lock or fsync. Changes to
+    the same job are merged before they are written. pending() exposes
+    changes that are not committed yet so readers see their own writes, and
+    flush() blocks until everything queued so far is durable.
+
+    A batch that fails is retried one job at a time, so one bad row cannot
+    take the other jobs' writes down with it. A job that still fails after
+    max_attempts is abandoned; its changes count as resolved for waiters,
+    but flush() and update(wait=True) report them as not durable.
+    """
+
+    def __init__(self, batch_window: Optional[float] = None, max_attempts: int = 3):
+        self.batch_window = batch_window if batch_window is not None else int(os.getenv("DESKMATE_JOB_FLUSH_MS", "20")) / 1000
+        self.max_attempts = max_attempts
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self._queued = 0      # changes accepted so far (each gets the next sequence number)
+        self._committed = 0   # every change up to this sequence number is written or abandoned
+        self._lost = set()    # sequence numbers of abandoned changes
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def insert(self, job_id: str, **fields) -> Dict[str, Any]:
+        """Queue a new job row; returns the fields that will be written"""
+        fields.setdefault("created_at", utcnow())
+        fields.setdefault("updated_at", fields["created_at"])
+        self._queue(job_id, fields, is_insert=True)
+        return fields
+
+    def update(self, job_id: str, wait: bool = False, **fields) -> bool:
+        """Queue changes to a job; wait=True blocks until they are committed and returns False if they were abandoned"""
+        fields["updated_at"] = utcnow()
+        target = self._queue(job_id, fields, is_insert=False)
+        if wait:
+            return self._wait_for(target, since=target - 1)
+        return True
+
+    def _queue(self, job_id: str, fields: Dict[str, Any], is_insert: bool) -> int:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Job writer is closed")
+            entry = self._pending.setdefault(job_id, {"fields": {}, "insert": False, "attempts": 0, "seqs": []})
+            entry["fields"].update(fields)
+            entry["insert"] = entry["insert"] or is_insert
+            self._queued += 1
+            target = self._queued
+            entry["seqs"].append(target)
+            self._ensure_thread()
+            self._condition.notify_all()
+        return target
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="job-writer", daemon=True)
+            self._thread.start()
+
+    def pending(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Uncommitted fields for a job (including an uncommitted insert), or None"""
+        with self._condition:
+            merged = {}
+            for source in (self._inflight, self._pending):
+                if job_id in source:
+                    merged.update(source[job_id]["fields"])
+                    if source[job_id]["insert"]:
+                        merged["_insert"] = True
+        return merged or None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued before this call is resolved.
+
+        Returns False on timeout, or when any change still outstanding at the
+        call was abandoned instead of committed.
+        """
+        with self._condition:
+            target, since = self._queued, self._committed
+        return self._wait_for(target, timeout, since)
+
+    def _wait_for(self, target: int, timeout: Optional[float] = None, since: int = 0) -> bool:
+        """Wait until changes up to target are resolved; True if those after since were all committed"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._committed >= target, timeout):
+                return False
+            return not any(since < seq <= target for seq in self._lost)
+
+    def abandoned(self) -> int:
+        """Number of changes given up on after max_attempts"""
+        with self._condition:
+            return len(self._lost)
+
+    def close(self, timeout: Optional[float] = 10) -> bool:
+        """Flush and stop the writer thread; later writes raise. Returns what flush() returned"""
+        durable = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        return durable
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if self._closed and not self._pending:
+                    return
+            # Let concurrent requests pile into the same transaction
+            if self.batch_window:
+                threading.Event().wait(self.batch_window)
+            with self._condition:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            failed = self._write(batch)
+            if failed:
+                self._requeue(failed)
+            with self._condition:
+                self._inflight = {}
+                # Everything before the oldest change still queued is resolved; a failed
+                # job's changes stay queued, so waiters keep waiting until it lands or is abandoned
+                outstanding = [entry["seqs"][0] for entry in self._pending.values() if entry["seqs"]]
+                self._committed = max(self._committed, min(outstanding) - 1 if outstanding else self._queued)
+                self._condition.notify_all()
+
+    def insert_many(self, jobs: Dict[str, Dict[str, Any]]):
+        """Write complete new job rows now, in a single transaction, bypassing the queue"""
+        now = utcnow()
+        batch = {}
+        for job_id, fields in jobs.items():
+            fields = dict(fields)
+            fields.setdefault("created_at", now)
+            fields.setdefault("updated_at", fields["created_at"])
+            batch[job_id] = {"fields": fields, "insert": True, "attempts": 0, "seqs": []}
+        self._commit(batch, kind="batch")
+
+    def _write(self, batch: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Commit a batch; returns the jobs that could not be written"""
+        try:
+            self._commit(batch, kind="write_behind")
+            return {}
+        except Exception as e:
+            error = e
+            failed = batch
+        if len(batch) > 1:
+            # One bad row fails the whole transaction; write each job alone so only it is retried
+            failed = {}
+            for job_id, entry in batch.items():
+                try:
+                    self._commit({job_id: entry}, kind="write_behind")
+                except Exception as e:
+                    error = e
+                    failed[job_id] = entry
+        if failed:
+            print(f"⚠️ Job write failed for {len(failed)} job(s): {error}")
+            FAILURES.inc(component="db_write")
+        return failed
+
+    def _commit(self, batch: Dict[str, Dict[str, Any]], kind: str):
+        # Large results are compressed off the request path and stored apart from jobs, in the same transaction
+        rows: Dict[str, Dict[str, Any]] = {}
+        blobs = []
+        for job_id, entry in batch.items():
+            fields = dict(entry["fields"])
+            if "result" in fields:
+                columns, blob = pack_result(fields["result"])
+                fields.update(columns)
+                if blob:
+                    blobs.append(blob)
+            rows[job_id] = fields
+        
+        # executemany needs every row to have the same columns
+        inserts: Dict[frozenset, list] = {}
+        for job_id, entry in batch.items():
+            if entry["insert"]:
+                row = dict(rows[job_id], job_id=job_id)
+                inserts.setdefault(frozenset(row), []).append(row)
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            for blob in blobs:
+                store_blob(conn, blob)
+            for group in inserts.values():
+                conn.execute(insert(Job), group)
+            for job_id, entry in batch.items():
+                if not entry["insert"]:
+                    conn.execute(update(Job).where(Job.job_id == job_id).values(**rows[job_id]))
+        DB_COMMIT_SECONDS.observe(time.perf_counter() - start, kind=kind)
+
+    def _requeue(self, failed: Dict[str, Dict[str, Any]]):
+        """Put failed jobs back underneath any newer changes, abandoning jobs that keep failing"""
+        with self._condition:
+            for job_id, entry in failed.items():
+                entry["attempts"] += 1
+                if entry["attempts"] >= self.max_attempts:
+                    print(f"❌ Giving up on persisting job {job_id}")
+                    self._lost.update(entry["seqs"])
+                    continue
+                newer = self._pending.get(job_id)
+                if newer:
+                    entry["fields"].update(newer["fields"])
+                    entry["insert"] = entry["insert"] or newer["insert"]
+                    entry["seqs"].extend(newer["seqs"])
+                self._pending[job_id] = entry
+        threading.Event().wait(0.1)
+
+
+job_writer = JobWriter()
+atexit.register(job_writer.close)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 import datetime
@@ -12,10 +12,19 @@ class Job(Base):
     job_id = Column(String, unique=True, index=True)
     command = Column(Text)
     intent = Column(String)
-    status = Column(String, default="pending")  # pending, running, completed, failed
-    result = Column(Text, nullable=True)
+    status = Column(String, default="pending")  # pending, running, completed, failed, cancelled
+    result = Column(Text, nullable=True)  # JSON, when small enough to keep inline
+    result_ref = Column(String, nullable=True, index=True)  # JobResult.content_hash of an offloaded result
+    result_size = Column(Integer, nullable=True)  # uncompressed bytes
+    progress = Column(Text, nullable=True)  # JSON, latest progress report while running
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Age-based retention; the job history pages newest first by id, optionally by status
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        Index("ix_jobs_status_id", "status", "id"),
+    )
 
 class File(Base):
     __tablename__ = "files"
@@ -24,4 +33,34 @@ class File(Base):
     filename = Column(String, index=True)
     file_path = Column(String)
     file_type = Column(String)
-    uploaded_at = Column(DateTime, default=func.now())
\ No newline at end of file
+    content_hash = Column(String, index=True, nullable=True)  # sha256 of the stored bytes
+    size = Column(Integer, nullable=True)
+    uploaded_at = Column(DateTime, default=func.now())
+
+class IntentCacheEntry(Base):
+    __tablename__ = "intent_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    namespace = Column(String, index=True)  # hash of prompt template + model name
+    command_key = Column(String, index=True)  # normalized command
+    intent = Column(Text)  # Intent serialized as JSON
+    created_at = Column(DateTime, default=func.now())
+
+class JobResult(Base):
+    __tablename__ = "job_results"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String, unique=True, index=True)  # sha256 of the uncompressed JSON
+    data = Column(LargeBinary)  # zlib-compressed JSON
+    size = Column(Integer)
+    compressed_size = Column(Integer)
+    created_at = Column(DateTime, default=func.now())
+
+class JobProfile(Base):
+    __tablename__ = "job_profiles"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String, unique=True, index=True)
+    data = Column(LargeBinary)  # zlib-compressed pstats dump
+    size = Column(Integer)
+    created_at = Column(DateTime, default=func.now())
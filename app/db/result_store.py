@@ -0,0 +1,37 @@
+import os
+import zlib
+import hashlib
+from typing import Dict, Optional, Tuple
+from sqlalchemy import insert, select
+from app.db.models import JobResult
+
+# Results up to this many bytes stay inline in jobs.result
+RESULT_INLINE_BYTES = int(os.getenv("DESKMATE_RESULT_INLINE_BYTES", str(16 * 1024)))
+COMPRESSION_LEVEL = 6
+
+def pack_result(result_json: Optional[str], inline_bytes: int = RESULT_INLINE_BYTES) -> Tuple[Dict, Optional[Dict]]:
+    """Job column values for a result, plus the job_results row when it is offloaded"""
+    if result_json is None:
+        return {"result": None, "result_ref": None, "result_size": None}, None
+    
+    raw = result_json.encode("utf-8")
+    if len(raw) <= inline_bytes:
+        return {"result": result_json, "result_ref": None, "result_size": len(raw)}, None
+    
+    digest = hashlib.sha256(raw).hexdigest()
+    data = zlib.compress(raw, COMPRESSION_LEVEL)
+    blob = {"content_hash": digest, "data": data, "size": len(raw), "compressed_size": len(data)}
+    return {"result": None, "result_ref": digest, "result_size": len(raw)}, blob
+
+def store_blob(conn, blob: Dict):
+    """Insert an offloaded result unless identical content is already stored"""
+    exists = conn.execute(select(JobResult.id).where(JobResult.content_hash == blob["content_hash"])).first()
+    if exists is None:
+        conn.execute(insert(JobResult), [blob])
+
+def load_result(conn, result_ref: str) -> Optional[str]:
+    """Fetch and decompress an offloaded result"""
+    data = conn.execute(select(JobResult.data).where(JobResult.content_hash == result_ref)).scalar()
+    if data is None:
+        return None
+    return zlib.decompress(data).decode("utf-8")
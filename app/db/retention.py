@@ -0,0 +1,228 @@
+import os
+import json
+import gzip
+import time
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import delete, func, or_, select, tuple_
+from app.db.database import SessionLocal, engine
+from app.db.models import Job, JobProfile, JobResult
+from app.db.job_writer import job_writer, utcnow
+from app.db.result_store import load_result
+
+# Jobs in these states are still being worked on and are never expired
+ACTIVE_STATUSES = ("pending", "running")
+
+def _optional_int(name: str, default: str) -> Optional[int]:
+    value = int(os.getenv(name, default))
+    return value if value > 0 else None
+
+def parse_window(window: str) -> Tuple[int, int]:
+    """'1-5' -> (1, 5): local hours [start, end), may wrap past midnight"""
+    start, end = (int(part) % 24 for part in window.split("-"))
+    return start, end
+
+def in_window(hour: int, window: Tuple[int, int]) -> bool:
+    start, end = window
+    if start == end:
+        return True  # "0-0" means any time
+    if start < end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+class RetentionManager:
+    """Expires old job history so the database stops growing without bound.
+
+    A job expires when it is older than max_age_days, or when more than
+    max_rows newer jobs exist. Expired jobs are appended to a gzip-compressed
+    NDJSON archive (one run per file, offloaded results inlined) and only
+    deleted once their batch is on disk. Results no job references any more
+    are removed, and freed pages are handed back to the filesystem with an
+    incremental vacuum. The background thread only does this inside the
+    maintenance window (local hours), at most once per min_interval.
+    """
+
+    def __init__(self, max_age_days: Optional[int] = None, max_rows: Optional[int] = None,
+                 archive_dir: Optional[str] = None, window: Optional[str] = None,
+                 min_interval: Optional[float] = None, batch_size: int = 500):
+        self.max_age_days = max_age_days if max_age_days is not None else _optional_int("DESKMATE_RETENTION_DAYS", "90")
+        self.max_rows = max_rows if max_rows is not None else _optional_int("DESKMATE_RETENTION_MAX_ROWS", "50000")
+        self.archive_dir = archive_dir or os.getenv("DESKMATE_ARCHIVE_DIR", "archive")
+        self.window = parse_window(window or os.getenv("DESKMATE_MAINTENANCE_WINDOW", "2-5"))
+        self.min_interval = min_interval if min_interval is not None else float(os.getenv("DESKMATE_RETENTION_INTERVAL_HOURS", "20")) * 3600
+        self.batch_size = batch_size
+        self.check_seconds = 600
+        self.last_run: Optional[Dict[str, Any]] = None
+        self._last_run_at = 0.0
+        self._lock = threading.Lock()  # one run at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> Optional[threading.Thread]:
+        if self._thread is not None:
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="job-retention", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def due(self, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now()
+        return in_window(now.hour, self.window) and time.time() - self._last_run_at >= self.min_interval
+
+    def _run(self):
+        while not self._stop.wait(self.check_seconds):
+            if not self.due():
+                continue
+            try:
+                self.run()
+            except Exception as e:
+                print(f"⚠️ Job retention failed: {e}")
+
+    def run(self, vacuum: bool = True) -> Dict[str, Any]:
+        """Archive and delete expired jobs, drop orphaned results, then vacuum"""
+        with self._lock:
+            start = time.time()
+            size_before = database_stats()["size_bytes"]
+            # Queued writes may belong to jobs that are about to expire
+            job_writer.flush(timeout=5)
+
+            archived, archive_path = self._archive_expired()
+            orphans = self._delete_orphan_results()
+            pages = incremental_vacuum() if vacuum else 0
+
+            stats = database_stats()
+            self.last_run = {
+                "finished_at": utcnow().isoformat(),
+                "jobs_archived": archived,
+                "results_deleted": orphans,
+                "archive_path": archive_path,
+                "pages_vacuumed": pages,
+                "bytes_reclaimed": max(0, size_before - stats["size_bytes"]),
+                "elapsed": round(time.time() - start, 2)
+            }
+            self._last_run_at = time.time()
+            if archived or orphans:
+                print(f"🧹 Archived {archived} job(s), removed {orphans} result(s), reclaimed {self.last_run['bytes_reclaimed']} bytes")
+            return self.last_run
+
+    def _expired_filter(self, db):
+        """WHERE clause for expired jobs, or None when no policy applies"""
+        conditions = []
+        # created_at is text with or without fractional seconds (or a "T" separator), so
+        # every comparison puts both sides in the same normalized form, never a bound datetime
+        created = func.strftime("%Y-%m-%d %H:%M:%f", Job.created_at)
+        if self.max_age_days:
+            cutoff = utcnow() - timedelta(days=self.max_age_days)
+            conditions.append(created < func.strftime("%Y-%m-%d %H:%M:%f", cutoff))
+        if self.max_rows:
+            # The newest job that falls outside the row limit; it and everything older expire
+            boundary = db.query(created.label("created"), Job.id).order_by(created.desc(), Job.id.desc()) \
+                .offset(self.max_rows).first()
+            if boundary is not None:
+                conditions.append(tuple_(created, Job.id) <= tuple_(boundary.created, boundary.id))
+        if not conditions:
+            return None
+        return or_(*conditions) & Job.status.notin_(ACTIVE_STATUSES)
+
+    def _archive_expired(self) -> Tuple[int, Optional[str]]:
+        db = SessionLocal()
+        archive = None
+        path = None
+        archived = 0
+        try:
+            expired = self._expired_filter(db)
+            if expired is None:
+                return 0, None
+
+            while True:
+                jobs = db.query(Job).filter(expired).order_by(Job.id).limit(self.batch_size).all()
+                if not jobs:
+                    break
+                if archive is None:
+                    os.makedirs(self.archive_dir, exist_ok=True)
+                    path = os.path.join(self.archive_dir, f"jobs-{datetime.now():%Y%m%d-%H%M%S}.ndjson.gz")
+                    archive = gzip.open(path, "ab")
+
+                for job in jobs:
+                    archive.write((json.dumps(self._record(db, job), default=str) + "\n").encode("utf-8"))
+                # Deleting is only safe once the batch is on disk
+                archive.flush()
+                os.fsync(archive.fileobj.fileno())
+
+                db.execute(delete(Job).where(Job.id.in_([job.id for job in jobs])))
+                db.commit()
+                db.expunge_all()
+                archived += len(jobs)
+            return archived, path
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            if archive is not None:
+                archive.close()
+            db.close()
+
+    def _record(self, db, job: Job) -> Dict[str, Any]:
+        record = {column.name: getattr(job, column.name) for column in Job.__table__.columns}
+        if record["result"] is None and record["result_ref"]:
+            record["result"] = load_result(db.connection(), record["result_ref"])
+        return record
+
+    def _delete_orphan_results(self) -> int:
+        """Drop result blobs and profiles whose jobs are gone"""
+        referenced = select(Job.result_ref).where(Job.result_ref.isnot(None))
+        with engine.begin() as conn:
+            conn.execute(delete(JobProfile).where(JobProfile.job_id.notin_(select(Job.job_id))))
+            return conn.execute(delete(JobResult).where(JobResult.content_hash.notin_(referenced))).rowcount
+
+
+def database_stats() -> Dict[str, Any]:
+    """Database file size, free pages and row counts"""
+    with engine.connect() as conn:
+        stats: Dict[str, Any] = {
+            "jobs": conn.execute(select(func.count()).select_from(Job)).scalar(),
+            "job_results": conn.execute(select(func.count()).select_from(JobResult)).scalar(),
+        }
+        if engine.dialect.name == "sqlite":
+            page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+            page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+            freelist = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+            stats.update({
+                "size_bytes": page_size * page_count,
+                "free_bytes": page_size * freelist,
+                "auto_vacuum": {0: "none", 1: "full", 2: "incremental"}.get(conn.exec_driver_sql("PRAGMA auto_vacuum").scalar())
+            })
+        else:
+            stats.update({"size_bytes": 0, "free_bytes": 0, "auto_vacuum": None})
+    return stats
+
+def incremental_vacuum(max_pages: Optional[int] = None) -> int:
+    """Return free pages to the filesystem; returns how many were released.
+
+    A database created before auto_vacuum=INCREMENTAL was enabled gets one
+    full VACUUM to convert it, which rewrites the file and is why this only
+    runs in the maintenance window.
+    """
+    if engine.dialect.name != "sqlite":
+        return 0
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        before = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+            conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.exec_driver_sql("VACUUM")
+        else:
+            # execute() only steps the pragma once (one page); executescript() runs it to completion
+            conn.connection.dbapi_connection.executescript(f"PRAGMA incremental_vacuum({int(max_pages or 0)});")
+        # Move the freed pages out of the WAL so the file itself shrinks
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        return before - conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+
+
+retention_manager = RetentionManager()
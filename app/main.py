@@ -1,18 +1,88 @@
-from fastapi import FastAPI
+import time
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.db.database import create_tables
-from app.api import agent, files, jobs
+from app.db.job_writer import job_writer
+from app.db.retention import retention_manager
+from app.core.gemini_registry import get_gemini_registry
+from app.core.filename_index import filename_index
+from app.core.content_index import content_index
+from app.core.metrics_sampler import metrics_sampler
+from app.core.metrics import registry, HTTP_SECONDS
+from app.api import admin, agent, files, jobs, system
 
-# Create database tables
-create_tables()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tables first, so they exist before any background worker or request touches them
+    create_tables()
+    # Configure Gemini and build the agent's intent parser off the request path
+    threading.Thread(target=warm_agent, name="gemini-warmup", daemon=True).start()
+    # Crawl the search roots in the background; searches fall back to a bounded scan until it is ready
+    filename_index.start()
+    # Index uploads stored before content hashing (and any whose indexing failed) off the request path
+    content_index.index_missing_in_background()
+    # System info reads the latest sample instead of blocking on psutil
+    metrics_sampler.start()
+    # Archives and prunes old job history inside the maintenance window
+    retention_manager.start()
+    
+    try:
+        yield
+    finally:
+        # Let commands that are already queued finish and record their results
+        agent.job_runner.shutdown(wait=True)
+        # Commit every queued job write before the process exits
+        job_writer.close()
+        filename_index.stop()
+        metrics_sampler.stop()
+        retention_manager.stop()
+
+def warm_agent():
+    get_gemini_registry().warm()
+    agent.agent.warm()
 
 app = FastAPI(
     title="DeskMate AI Agent",
     description="Local-first AI Agent for file processing and task automation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Enhanced CORS configuration
+# Reject oversized uploads while the body is still arriving, before it is spooled
+app.add_middleware(files.UploadSizeLimit)
+
+@app.middleware("http")
+async def record_request_time(request: Request, call_next):
+    # Time until the response starts; streamed bodies are not included
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                             route=route_template(request), status=status)
+
+def route_template(request: Request) -> str:
+    """The matched route's path template, so job ids stay out of metric labels"""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Included routers and mounts can report a path relative to their prefix; the prefix is
+    # whatever precedes the part of the request path that the route itself matched
+    path = request.url.path
+    for start in [0] + [i for i, char in enumerate(path) if char == "/" and i]:
+        match = route.path_regex.match(path[start:])
+        if match and {name: route.param_convertors[name].convert(value)
+                      for name, value in match.groupdict().items()} == request.path_params:
+            return path[:start] + route.path
+    return route.path
+
+# Enhanced CORS configuration (added last so it wraps every response)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -35,11 +105,18 @@ app.add_middleware(
 app.include_router(agent.router, prefix="/api/v1/agent", tags=["Agent"])
 app.include_router(files.router, prefix="/api/v1/files", tags=["Files"])
 app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["Jobs"])
+app.include_router(system.router, prefix="/api/v1/system", tags=["System"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
 
 @app.get("/")
 async def root():
     return {"message": "DeskMate AI Agent API", "status": "running"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Latency histograms and counters in the Prometheus text format"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "timestamp": "2024-01-01T00:00:00Z"}
@@ -1,24 +1,15 @@
-import os
-import google.generativeai as genai
-from dotenv import load_dotenv
-
-load_dotenv()
+from app.core.gemini_registry import get_gemini_registry, EMAIL_MODELS
+from app.core.metrics import observe_plugin
 
 class EmailGeneratorPlugin:
     """Plugin for generating email drafts using Gemini"""
     
     def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if api_key:
-            try:
-                genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('gemini-pro')
-                self.use_gemini = True
-            except:
-                self.use_gemini = False
-        else:
-            self.use_gemini = False
+        self.registry = get_gemini_registry()
+        _, self.model = self.registry.model_for(EMAIL_MODELS)
+        self.use_gemini = self.model is not None
     
+    @observe_plugin
     def generate_email(self, subject: str, recipient: str, body: str) -> dict:
         """Generate a professional email draft"""
         if self.use_gemini:
@@ -33,7 +24,7 @@ class EmailGeneratorPlugin:
                 Keep it concise and professional.
                 """
                 
-                response = self.model.generate_content(prompt)
+                response = self.registry.generate(self.model, prompt)
                 email_draft = response.text.strip()
                 
                 return {
@@ -72,6 +63,7 @@ This is a draft email. Please review before sending.
             "generated_with": "Template"
         }
     
+    @observe_plugin
     def generate_email_from_prompt(self, prompt: str) -> dict:
         """Generate complete email from natural language prompt using Gemini"""
         if self.use_gemini:
@@ -90,7 +82,7 @@ This is a draft email. Please review before sending.
                 Format the email properly.
                 """
                 
-                response = self.model.generate_content(email_prompt)
+                response = self.registry.generate(self.model, email_prompt)
                 email_draft = response.text.strip()
                 
                 return {
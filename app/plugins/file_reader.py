@@ -1,14 +1,35 @@
 import os
-from PyPDF2 import PdfReader
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
+from app.core.extraction_cache import extraction_cache
+from app.core.summarizer import extractive_summarizer, sentences_for
+from app.core.metrics import observe_plugin
+
+if TYPE_CHECKING:
+    from PyPDF2 import PdfReader
+
+# Bump whenever extraction output changes so cached text is not reused
+EXTRACTOR_VERSION = 1
+
+def open_pdf(file) -> "PdfReader":
+    # PyPDF2 is imported by the first PDF read rather than at startup
+    from PyPDF2 import PdfReader
+    return PdfReader(file)
 
 class FileReaderPlugin:
     """Plugin for reading PDF and TXT files"""
     
-    def __init__(self):
+    def __init__(self, text_cache=None):
         self.supported_formats = ['.pdf', '.txt']
+        self.text_cache = text_cache or extraction_cache
     
-    def read_file(self, file_path: str) -> dict:
-        """Read text from PDF or TXT files"""
+    @observe_plugin
+    def read_file(self, file_path: str, start_page: Optional[int] = None,
+                  end_page: Optional[int] = None, max_chars: Optional[int] = None) -> dict:
+        """Read text from PDF or TXT files.
+
+        start_page/end_page select an inclusive, 1-based page range (PDF only);
+        max_chars stops extraction once that many characters have been read.
+        """
         if not os.path.exists(file_path):
             return {"success": False, "error": f"File not found: {file_path}"}
         
@@ -18,60 +39,126 @@ class FileReaderPlugin:
             return {"success": False, "error": f"Unsupported file format: {file_extension}. Supported: PDF, TXT"}
         
         try:
+            cache_key = self.text_cache.key_for(
+                file_path, EXTRACTOR_VERSION,
+                start_page=start_page, end_page=end_page, max_chars=max_chars
+            )
+            cached = self.text_cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
+            
             if file_extension == '.pdf':
-                return self._read_pdf(file_path)
-            elif file_extension == '.txt':
-                return self._read_txt(file_path)
+                result = self._read_pdf(file_path, start_page, end_page, max_chars)
+            else:
+                result = self._read_txt(file_path, max_chars)
+            
+            self.text_cache.put(cache_key, result)
+            return result
         except Exception as e:
             return {"success": False, "error": f"Error reading file: {str(e)}"}
     
-    def _read_pdf(self, file_path: str) -> dict:
-        """Extract text from PDF file"""
-        text = ""
+    def get_page_count(self, file_path: str) -> int:
+        """Page count from the PDF page tree, without extracting any text"""
+        with open(file_path, 'rb') as file:
+            reader = open_pdf(file)
+            return self._page_count(reader)
+    
+    def _page_count(self, reader: "PdfReader") -> int:
+        try:
+            # /Count on the root page tree node avoids walking every page object
+            return int(reader.trailer["/Root"]["/Pages"]["/Count"])
+        except Exception:
+            return len(reader.pages)
+    
+    def iter_pdf_pages(self, file_path: str, start_page: Optional[int] = None,
+                       end_page: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (page_number, text) one page at a time for an inclusive 1-based range"""
         with open(file_path, 'rb') as file:
-            reader = PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
+            reader = open_pdf(file)
+            first, last = self._page_range(self._page_count(reader), start_page, end_page)
+            yield from self._extract_pages(reader, first, last)
+    
+    def _extract_pages(self, reader: "PdfReader", first: int, last: int) -> Iterator[Tuple[int, str]]:
+        for page_number in range(first, last + 1):
+            yield page_number, reader.pages[page_number - 1].extract_text() or ""
+    
+    def _page_range(self, page_count: int, start_page: Optional[int], end_page: Optional[int]) -> Tuple[int, int]:
+        first = max(1, start_page or 1)
+        last = min(page_count, end_page or page_count)
+        return first, last
+    
+    def _read_pdf(self, file_path: str, start_page: Optional[int] = None,
+                  end_page: Optional[int] = None, max_chars: Optional[int] = None) -> dict:
+        """Extract text from PDF file page by page, stopping at the character budget"""
+        parts = []
+        chars = 0
+        pages_read = 0
+        truncated = False
+        
+        with open(file_path, 'rb') as file:
+            reader = open_pdf(file)
+            page_count = self._page_count(reader)
+            first, last = self._page_range(page_count, start_page, end_page)
+            
+            for page_number, page_text in self._extract_pages(reader, first, last):
+                pages_read += 1
+                if max_chars is not None and chars + len(page_text) >= max_chars:
+                    parts.append(page_text[:max_chars - chars])
+                    truncated = page_number < last or len(page_text) > max_chars - chars
+                    break
+                parts.append(page_text)
+                chars += len(page_text) + 1  # pages are joined with a newline
         
         return {
             "success": True,
-            "content": text.strip(),
+            "content": "\n".join(parts).strip(),
             "file_type": "PDF",
-            "page_count": len(reader.pages)
+            "page_count": page_count,
+            "pages_read": [first, first + pages_read - 1] if pages_read else [],
+            "truncated": truncated
         }
     
-    def _read_txt(self, file_path: str) -> dict:
+    def _read_txt(self, file_path: str, max_chars: Optional[int] = None) -> dict:
         """Read text from TXT file"""
+        size = -1 if max_chars is None else max_chars + 1
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
+                content = file.read(size)
         except UnicodeDecodeError:
             with open(file_path, 'r', encoding='latin-1') as file:
-                content = file.read()
+                content = file.read(size)
+        
+        truncated = max_chars is not None and len(content) > max_chars
+        if truncated:
+            content = content[:max_chars]
         
         return {
             "success": True,
             "content": content,
-            "file_type": "TXT"
+            "file_type": "TXT",
+            "truncated": truncated
         }
     
+    @observe_plugin
     def summarize_text(self, text: str, style: str = "short") -> dict:
-        """Create a summary of the text"""
+        """Create an extractive summary of the text (runs fully offline)"""
         if not text or not text.strip():
             return {"success": False, "error": "No text provided for summarization"}
         
-        words = text.split()
-        if len(words) <= 100:
+        word_count = len(text.split())
+        if word_count <= 100:
             summary = text
+            sentence_count = None
         else:
-            if style == "short":
-                summary = " ".join(words[:50]) + "..."
-            else:
-                summary = " ".join(words[:150]) + "..."
+            result = extractive_summarizer.summarize(text, sentences_for(style, word_count))
+            summary = result["summary"]
+            sentence_count = result["sentence_count"]
         
         return {
             "success": True,
             "summary": summary,
-            "original_length": len(words),
-            "summary_length": len(summary.split())
-        }
\ No newline at end of file
+            "method": "extractive",
+            "original_length": word_count,
+            "summary_length": len(summary.split()),
+            "sentence_count": sentence_count
+        }
@@ -1,7 +1,99 @@
 import subprocess
 import shlex
+import glob
 import platform
 import os
+import signal
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from app.core.metrics import observe_plugin
+
+# Shell control characters; outside quotes they would let a whitelisted first word chain other commands
+SHELL_OPERATORS = set("();<>|&")
+# Rejected anywhere: command substitution and line breaks, plus cmd.exe escapes and variables on Windows
+UNSAFE_ANYWHERE = "`\n\r"
+UNSAFE_ANYWHERE_WINDOWS = "^%<>|&"
+
+READ_CHUNK = 64 * 1024
+MAX_LINE_CHARS = 4096
+
+class OutputRingBuffer:
+    """Keeps only the most recent lines of a stream, bounded by line count and characters"""
+    
+    def __init__(self, max_lines: Optional[int] = None, max_chars: Optional[int] = None):
+        self.max_lines = max_lines or int(os.getenv("DESKMATE_SHELL_MAX_LINES", "500"))
+        self.max_chars = max_chars or int(os.getenv("DESKMATE_SHELL_MAX_CHARS", str(64 * 1024)))
+        self._lines = deque()
+        self._chars = 0
+        self.total_lines = 0
+        self.dropped_lines = 0
+    
+    def append(self, line: str):
+        self._lines.append(line)
+        self._chars += len(line) + 1
+        self.total_lines += 1
+        while len(self._lines) > self.max_lines or (self._chars > self.max_chars and len(self._lines) > 1):
+            self._chars -= len(self._lines.popleft()) + 1
+            self.dropped_lines += 1
+    
+    @property
+    def truncated(self) -> bool:
+        return self.dropped_lines > 0
+    
+    def text(self) -> str:
+        return "\n".join(self._lines) + ("\n" if self._lines else "")
+
+class ShellSessions:
+    """Running shell processes by job id, so a job's command can be cancelled from any thread"""
+    
+    def __init__(self):
+        self._sessions: Dict[str, tuple] = {}
+        self._cancelled = set()
+        self._lock = threading.Lock()
+    
+    def register(self, job_id: str, loop: asyncio.AbstractEventLoop, process):
+        with self._lock:
+            self._sessions[job_id] = (loop, process)
+    
+    def unregister(self, job_id: str) -> bool:
+        """Forget the job's process; True if it was cancelled"""
+        with self._lock:
+            self._sessions.pop(job_id, None)
+            cancelled = job_id in self._cancelled
+            self._cancelled.discard(job_id)
+        return cancelled
+    
+    def is_running(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._sessions
+    
+    def cancel(self, job_id: str) -> bool:
+        """Kill the job's process (and its children); False when nothing is running for it"""
+        with self._lock:
+            session = self._sessions.get(job_id)
+            if session is None:
+                return False
+            self._cancelled.add(job_id)
+        loop, process = session
+        loop.call_soon_threadsafe(_kill, process)
+        return True
+
+def _kill(process):
+    if process.returncode is not None:
+        return
+    try:
+        if platform.system() == "Windows":
+            process.kill()
+        else:
+            # The shell runs in its own session; take down everything it started
+            os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+shell_sessions = ShellSessions()
 
 class ShellRunnerPlugin:
     """Plugin for running safe shell commands with Windows support"""
@@ -26,8 +118,30 @@ class ShellRunnerPlugin:
                 'mkdir', 'cd', 'python', 'python3', 'pip'
             }
     
+    @observe_plugin
     def run_shell_command(self, command: str) -> dict:
         """Execute a shell command if it's whitelisted"""
+        from app.core.job_runner import current_job_id
+        return _run_coroutine(self.execute(command, job_id=current_job_id.get()))
+    
+    def parse_command(self, command: str) -> Optional[List[str]]:
+        """argv for a command, or None when it is empty, has unbalanced quotes or uses shell operators"""
+        if not command or not command.strip():
+            return None
+        unsafe = UNSAFE_ANYWHERE + (UNSAFE_ANYWHERE_WINDOWS if self.is_windows else "")
+        if any(c in command for c in unsafe):
+            return None
+        try:
+            lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+            lexer.commenters = ""
+            if any(token and set(token) <= SHELL_OPERATORS for token in lexer):
+                return None
+            return shlex.split(command) or None
+        except ValueError:
+            return None
+    
+    def check_command(self, command: str) -> Optional[dict]:
+        """Error result for an empty, chained or non-whitelisted command, None when it may run"""
         if not command or not command.strip():
             return {
                 "success": False,
@@ -35,64 +149,197 @@ class ShellRunnerPlugin:
                 "output": None
             }
         
-        # Parse command to get the base command
-        base_command = command.split()[0] if command.split() else ""
+        argv = self.parse_command(command)
+        if argv is None:
+            return {
+                "success": False,
+                "error": "Shell operators, substitutions and unbalanced quotes are not allowed; run one command at a time.",
+                "output": None,
+                "friendly_message": "❌ Command refused: it chains or redirects commands"
+            }
         
         if not self.is_command_safe(command):
             return {
                 "success": False,
-                "error": f"Command '{base_command}' is not whitelisted for safety reasons.",
+                "error": f"Command '{argv[0]}' is not whitelisted for safety reasons.",
                 "output": None,
                 "whitelisted_commands": list(self.whitelisted_commands)
             }
+        return None
+    
+    def expand_arguments(self, command: str) -> List[str]:
+        """POSIX argv with unquoted ~ and glob patterns expanded per argument, as a shell would.
+        
+        Environment variables are not expanded: "echo $HOME" prints $HOME.
+        A pattern that matches nothing is passed on unchanged.
+        """
+        argv = self.parse_command(command)
+        try:
+            # Non-POSIX splitting keeps quotes and backslashes, so a token that differs
+            # from its POSIX form was quoted or escaped and must stay literal
+            raw = shlex.split(command, posix=False)
+        except ValueError:
+            raw = []
+        if len(raw) != len(argv):
+            return argv
+        expanded = argv[:1]
+        for word, raw_word in zip(argv[1:], raw[1:]):
+            if word != raw_word:
+                expanded.append(word)
+                continue
+            if word.startswith("~"):
+                word = os.path.expanduser(word)
+            matches = sorted(glob.glob(word)) if any(c in word for c in "*?[") else []
+            expanded.extend(matches or [word])
+        return expanded
+    
+    async def execute(self, command: str, on_line: Optional[Callable[[str, str], None]] = None,
+                      job_id: Optional[str] = None, timeout: float = 30) -> dict:
+        """Run a whitelisted command with asyncio, streaming lines to on_line(stream, line).
+        
+        Only the tail of stdout/stderr is kept (OutputRingBuffer); a job id
+        makes the command cancellable through shell_sessions.cancel(job_id).
+        On POSIX no shell is involved: globs and ~ are expanded here, cd is
+        handled as a builtin, and $VARIABLES are passed through literally.
+        """
+        rejected = self.check_command(command)
+        if rejected:
+            return rejected
+        
+        shell_cmd = command
+        buffers = {"stdout": OutputRingBuffer(), "stderr": OutputRingBuffer()}
+        argv = None if self.is_windows else self.expand_arguments(command)
+        
+        if argv and argv[0] == "cd":
+            completed = self._change_directory(argv)
+            for name, text in (("stdout", completed.stdout), ("stderr", completed.stderr)):
+                for line in text.splitlines():
+                    buffers[name].append(line)
+                    if on_line:
+                        on_line(name, line)
+            return self._completed_result(command, completed, buffers)
         
         try:
-            # Use appropriate shell based on platform
-            shell_cmd = command
-            
-            # Auto-translate common Unix commands to Windows equivalents
             if self.is_windows:
+                # The translations are cmd built-ins, so Windows still needs the shell;
+                # parse_command has already refused its operators, escapes and variables
                 shell_cmd = self._translate_unix_to_windows(command)
-            
-            # Execute the command safely
-            result = subprocess.run(
-                shell_cmd, 
-                shell=True, 
-                capture_output=True, 
-                text=True,
-                timeout=30,  # 30 second timeout
-                cwd=".",  # Current directory
-                encoding='utf-8',
-                errors='ignore'
-            )
-            
-            # Create friendly message based on command
-            friendly_message = self._create_friendly_message(command, result)
-            
+                process = await asyncio.create_subprocess_shell(
+                    shell_cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd="."  # Current directory
+                )
+            else:
+                # No shell: arguments reach the program as-is, so nothing in them is interpreted
+                process = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=".",  # Current directory
+                    start_new_session=True
+                )
+        except Exception as e:
             return {
-                "success": True,
-                "output": result.stdout,
-                "error": result.stderr,
-                "return_code": result.returncode,
-                "command_executed": shell_cmd,
-                "friendly_message": friendly_message,
-                "platform": "Windows" if self.is_windows else "Unix"
+                "success": False,
+                "error": f"Error executing command: {str(e)}",
+                "output": None,
+                "friendly_message": f"❌ Failed to execute command: {str(e)}"
             }
-            
-        except subprocess.TimeoutExpired:
+        
+        if job_id:
+            shell_sessions.register(job_id, asyncio.get_running_loop(), process)
+        
+        async def pump(name: str, stream: asyncio.StreamReader):
+            pending = ""
+            while True:
+                chunk = await stream.read(READ_CHUNK)
+                if not chunk:
+                    break
+                pending += chunk.decode("utf-8", errors="ignore")
+                *lines, pending = pending.split("\n")
+                # Keep pathological newline-free output from growing without bound
+                if len(pending) > MAX_LINE_CHARS:
+                    lines.append(pending)
+                    pending = ""
+                for line in lines:
+                    line = line.rstrip("\r")[:MAX_LINE_CHARS]
+                    buffers[name].append(line)
+                    if on_line:
+                        on_line(name, line)
+            if pending:
+                buffers[name].append(pending[:MAX_LINE_CHARS])
+                if on_line:
+                    on_line(name, pending[:MAX_LINE_CHARS])
+        
+        timed_out = False
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(pump("stdout", process.stdout), pump("stderr", process.stderr), process.wait()),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            timed_out = True
+            _kill(process)
+            await process.wait()
+        except asyncio.CancelledError:
+            # The caller went away (e.g. the client disconnected); do not leave the process behind
+            _kill(process)
+            raise
+        finally:
+            cancelled = shell_sessions.unregister(job_id) if job_id else False
+        
+        stdout, stderr = buffers["stdout"], buffers["stderr"]
+        if timed_out:
             return {
                 "success": False,
-                "error": "Command timed out after 30 seconds",
-                "output": None,
+                "error": f"Command timed out after {timeout:g} seconds",
+                "output": stdout.text(),
+                "truncated": stdout.truncated,
                 "friendly_message": "❌ Command took too long to execute"
             }
-        except Exception as e:
+        
+        if cancelled:
             return {
                 "success": False,
-                "error": f"Error executing command: {str(e)}",
-                "output": None,
-                "friendly_message": f"❌ Failed to execute command: {str(e)}"
+                "error": "Command was cancelled",
+                "output": stdout.text(),
+                "truncated": stdout.truncated,
+                "cancelled": True,
+                "friendly_message": "🛑 Command cancelled"
             }
+        
+        completed = subprocess.CompletedProcess(shell_cmd, process.returncode, stdout.text(), stderr.text())
+        return self._completed_result(command, completed, buffers)
+    
+    def _completed_result(self, command: str, completed: subprocess.CompletedProcess,
+                          buffers: Dict[str, OutputRingBuffer]) -> dict:
+        stdout, stderr = buffers["stdout"], buffers["stderr"]
+        return {
+            "success": True,
+            "output": completed.stdout,
+            "error": completed.stderr,
+            "return_code": completed.returncode,
+            "command_executed": completed.args,
+            "friendly_message": self._create_friendly_message(command, completed),
+            "platform": "Windows" if self.is_windows else "Unix",
+            "output_lines": stdout.total_lines,
+            "truncated": stdout.truncated or stderr.truncated
+        }
+    
+    def _change_directory(self, argv: List[str]) -> subprocess.CompletedProcess:
+        """cd without a shell: report the directory it resolves to.
+        
+        Every command runs in a fresh process, so (as before, when each one
+        had its own shell) the directory does not carry over to later commands.
+        """
+        command = " ".join(argv)
+        if len(argv) > 2:
+            return subprocess.CompletedProcess(command, 1, "", "cd: too many arguments\n")
+        target = os.path.abspath(argv[1] if len(argv) > 1 else os.path.expanduser("~"))
+        if not os.path.isdir(target):
+            return subprocess.CompletedProcess(command, 1, "", f"cd: {argv[1]}: No such file or directory\n")
+        return subprocess.CompletedProcess(command, 0, target + "\n", "")
     
     def _translate_unix_to_windows(self, command: str) -> str:
         """Translate common Unix commands to Windows equivalents"""
@@ -138,11 +385,12 @@ class ShellRunnerPlugin:
                 return f"❌ Command failed: {result.stderr.strip() or 'Unknown error'}"
     
     def is_command_safe(self, command: str) -> bool:
-        """Check if a command is in the whitelist"""
-        if not command or not command.strip():
+        """Check that a command is a single whitelisted command with no shell operators"""
+        argv = self.parse_command(command)
+        if argv is None:
             return False
             
-        base_command = command.split()[0] if command.split() else ""
+        base_command = argv[0]
         
         # Also check if it's a translatable Unix command on Windows
         if self.is_windows and base_command in ['ls', 'pwd', 'cat', 'grep']:
@@ -158,4 +406,13 @@ class ShellRunnerPlugin:
         if self.is_windows:
             commands.extend(['ls', 'pwd', 'cat', 'grep'])
         
-        return sorted(set(commands))
\ No newline at end of file
+        return sorted(set(commands))
+
+def _run_coroutine(coroutine):
+    """Run a coroutine to completion from synchronous code, even if this thread already has a loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
\ No newline at end of file
@@ -3,6 +3,7 @@ import os
 import platform
 import subprocess
 from typing import Dict, Any
+from app.core.metrics import observe_plugin
 
 class SystemControlPlugin:
     """Plugin for system automation tasks like opening URLs, apps, and files"""
@@ -10,6 +11,7 @@ class SystemControlPlugin:
     def __init__(self):
         self.system = platform.system()
         
+    @observe_plugin
     def open_url(self, url: str) -> Dict[str, Any]:
         """Open a URL in the default browser with smart fallback"""
         try:
@@ -90,6 +92,7 @@ class SystemControlPlugin:
                 "error": f"Failed to open URL: {str(e)}"
             }
 
+    @observe_plugin
     def open_application(self, app_name: str) -> Dict[str, Any]:
         """Open a common application"""
         try:
@@ -134,6 +137,7 @@ class SystemControlPlugin:
                 "error": f"Failed to open application: {str(e)}"
             }
 
+    @observe_plugin
     def open_file_explorer(self, path: str = None) -> Dict[str, Any]:
         """Open file explorer at specific path"""
         try:
@@ -167,6 +171,7 @@ class SystemControlPlugin:
                 "error": f"Failed to open file explorer: {str(e)}"
             }
 
+    @observe_plugin
     def create_folder(self, path: str) -> Dict[str, Any]:
         """Create a new folder with explicit path feedback"""
         try:
@@ -198,6 +203,7 @@ class SystemControlPlugin:
                 "error": f"Failed to create folder: {str(e)}"
             }
 
+    @observe_plugin
     def create_file(self, path: str, content: str = "") -> Dict[str, Any]:
         """Create a new file with explicit path feedback"""
         try:
@@ -237,6 +243,7 @@ class SystemControlPlugin:
                 "error": f"Failed to create file: {str(e)}"
             }
 
+    @observe_plugin
     def open_terminal(self, path: str = None) -> Dict[str, Any]:
         """Open a new terminal window"""
         try:
@@ -263,102 +270,45 @@ class SystemControlPlugin:
                 "error": f"Failed to open terminal: {str(e)}"
             }
 
+    @observe_plugin
     def get_system_info(self) -> Dict[str, Any]:
         """Get detailed system information including RAM, storage, CPU"""
+        from app.core.metrics_sampler import host_info, metrics_sampler
+        
         try:
-            import sys
-            import shutil
-            
-            # Detect Windows 11 properly
-            os_name = platform.system()
-            os_release = platform.release()
-            os_version = platform.version()
-            
-            # Windows 11 detection: Check build number
-            if os_name == "Windows" and os_release == "10":
-                # Windows 11 has build number >= 22000
-                build_number = int(os_version.split('.')[-1]) if os_version else 0
-                if build_number >= 22000:
-                    os_display = "Windows 11"
-                else:
-                    os_display = "Windows 10"
-            else:
-                os_display = f"{os_name} {os_release}"
-            
-            # Get processor info
-            machine = platform.machine()
-            processor = platform.processor()
+            host = host_info()
+            info = {key: host[key] for key in ("system", "release", "version", "machine",
+                                               "processor", "python_version", "architecture")}
             
-            # Simplify processor name if too long
-            if len(processor) > 50:
-                processor = processor.split(',')[0]
-            
-            # Try to get detailed info with psutil
-            try:
-                import psutil
-                
-                # CPU info
-                cpu_count = psutil.cpu_count(logical=False)  # Physical cores
-                cpu_count_logical = psutil.cpu_count(logical=True)  # Logical cores
-                cpu_freq = psutil.cpu_freq()
-                cpu_percent = psutil.cpu_percent(interval=0.1)
-                
-                # RAM info
-                ram = psutil.virtual_memory()
-                ram_total_gb = ram.total / (1024**3)
-                ram_used_gb = ram.used / (1024**3)
-                ram_available_gb = ram.available / (1024**3)
-                ram_percent = ram.percent
-                
-                # Storage info (C: drive on Windows, / on Unix)
-                disk_path = "C:\\" if os_name == "Windows" else "/"
-                disk = psutil.disk_usage(disk_path)
-                disk_total_gb = disk.total / (1024**3)
-                disk_used_gb = disk.used / (1024**3)
-                disk_free_gb = disk.free / (1024**3)
-                disk_percent = disk.percent
-                
-                info = {
-                    "system": os_display,
-                    "release": os_release,
-                    "version": os_version,
-                    "machine": machine,
-                    "processor": processor,
-                    "python_version": platform.python_version(),
-                    "architecture": "64-bit" if sys.maxsize > 2**32 else "32-bit",
+            # Live numbers come from the background sampler, never a blocking psutil call
+            sample = metrics_sampler.latest()
+            if sample is not None:
+                info.update({
                     "cpu": {
-                        "cores": cpu_count,
-                        "logical_cores": cpu_count_logical,
-                        "frequency_mhz": round(cpu_freq.current) if cpu_freq else 0,
-                        "max_frequency_mhz": round(cpu_freq.max) if cpu_freq else 0,
-                        "usage_percent": round(cpu_percent, 1)
+                        "cores": host["cpu_cores"],
+                        "logical_cores": host["cpu_logical_cores"],
+                        "frequency_mhz": sample["cpu_frequency_mhz"],
+                        "max_frequency_mhz": host["cpu_max_frequency_mhz"],
+                        "usage_percent": sample["cpu_percent"]
                     },
                     "ram": {
-                        "total_gb": round(ram_total_gb, 2),
-                        "used_gb": round(ram_used_gb, 2),
-                        "available_gb": round(ram_available_gb, 2),
-                        "percent": round(ram_percent, 1)
+                        "total_gb": host["ram_total_gb"],
+                        "used_gb": sample["ram_used_gb"],
+                        "available_gb": sample["ram_available_gb"],
+                        "percent": sample["ram_percent"]
                     },
                     "storage": {
-                        "drive": disk_path,
-                        "total_gb": round(disk_total_gb, 2),
-                        "used_gb": round(disk_used_gb, 2),
-                        "free_gb": round(disk_free_gb, 2),
-                        "percent": round(disk_percent, 1)
-                    }
-                }
-            except ImportError:
+                        "drive": host["disk_path"],
+                        "total_gb": host["disk_total_gb"],
+                        "used_gb": sample["disk_used_gb"],
+                        "free_gb": sample["disk_free_gb"],
+                        "percent": sample["disk_percent"]
+                    },
+                    "sampled_at": sample["timestamp"]
+                })
+            else:
                 # Fallback if psutil not available
-                info = {
-                    "system": os_display,
-                    "release": os_release,
-                    "version": os_version,
-                    "machine": machine,
-                    "processor": processor,
-                    "python_version": platform.python_version(),
-                    "architecture": "64-bit" if sys.maxsize > 2**32 else "32-bit",
-                    "note": "Install psutil for detailed RAM/CPU/Storage info"
-                }
+                info["note"] = "Install psutil for detailed RAM/CPU/Storage info"
             
             return {
                 "success": True,
@@ -372,6 +322,7 @@ class SystemControlPlugin:
                 "error": f"Failed to get system info: {str(e)}"
             }
 
+    @observe_plugin
     def get_time(self) -> Dict[str, Any]:
         """Get current local time"""
         from datetime import datetime
@@ -0,0 +1,50 @@
+"""Latency of the offline extractive summarizer on large inputs.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_summarizer [--words N] [--iterations N]
+
+The budget is 500 ms for a 100k-word document; the script exits non-zero
+when the mean summarize_text() time is over budget.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.plugins.file_reader import FileReaderPlugin
+from benchmarks.fixtures import synthetic_report
+
+BUDGET_MS = 500.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    text = synthetic_report(args.words)
+    reader = FileReaderPlugin()
+    reader.summarize_text(text)  # warm up regexes and numpy
+
+    timings = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        result = reader.summarize_text(text, "detailed")
+        timings.append((time.perf_counter() - start) * 1000)
+
+    mean_ms = sum(timings) / len(timings)
+    print(f"Document: {result['original_length']} words, {result['sentence_count']} sentences")
+    print(f"  summary            : {result['summary_length']} words")
+    print(f"  mean latency       : {mean_ms:8.1f} ms (best {min(timings):.1f} ms)")
+    print(f"  budget ({args.words} words): {BUDGET_MS * args.words / 100_000:8.1f} ms")
+    if mean_ms > BUDGET_MS * args.words / 100_000:
+        print("❌ Over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Synthetic documents for benchmarks and tests, generated without extra dependencies."""
+from typing import List
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: str, page_texts: List[str]) -> str:
+    """Write a minimal PDF with one Helvetica text line per entry in page_texts"""
+    font_id = 3
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        font_id: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    next_id = 4
+    for text in page_texts:
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        stream = f"BT /F1 12 Tf 72 720 Td ({_escape_pdf_text(text)}) Tj ET".encode("latin-1")
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id)
+        )
+        kids.append(b"%d 0 R" % page_id)
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id])
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+    return path
+
+
+def synthetic_report(word_count: int, seed: int = 7) -> str:
+    """Report-like prose of roughly word_count words: topical sentences drawn from a few themes"""
+    import random
+    rng = random.Random(seed)
+    themes = [
+        ["revenue", "quarter", "growth", "sales", "margin", "forecast"],
+        ["hiring", "team", "engineers", "onboarding", "retention", "culture"],
+        ["security", "audit", "compliance", "incident", "access", "policy"],
+        ["customers", "support", "tickets", "satisfaction", "churn", "feedback"],
+    ]
+    filler = ["the", "report", "notes", "that", "our", "shows", "during", "with", "across", "steady", "new", "plan"]
+    sentences, words = [], 0
+    while words < word_count:
+        theme = themes[rng.randrange(len(themes))]
+        length = rng.randint(8, 22)
+        tokens = [rng.choice(theme) if rng.random() < 0.4 else rng.choice(filler) for _ in range(length)]
+        sentences.append(" ".join(tokens).capitalize() + ".")
+        words += length
+    return " ".join(sentences)
@@ -0,0 +1,241 @@
+"""Load generator for a running DeskMate API.
+
+Start the server against the local Gemini stand-in so results do not
+depend on (or spend) the real API:
+
+    DESKMATE_GEMINI_STANDIN=1 DESKMATE_STANDIN_LATENCY=lognormal:0.4,0.5 \\
+        uvicorn app.main:app --port 8000
+
+then, from the repository root:
+
+    python -m benchmarks.load_generator --concurrency 16 --requests 500
+    python -m benchmarks.load_generator --duration 60 --mix query=3,upload=1 --wait-jobs
+
+Each worker thread sends one request at a time, picking the scenario by
+the --mix weights. "query" posts a command to /api/v1/agent/query (and with
+--wait-jobs also waits for the job, which measures end-to-end latency);
+"upload" posts a small generated TXT file to /api/v1/files/upload. The
+report gives throughput plus p50/p95/p99 latency and errors per scenario.
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_intent_parser import COMMAND_CORPUS
+from benchmarks.fixtures import synthetic_report
+
+# Commands that would open windows or run programs on the server are left out, and so are
+# corpus file commands, whose files do not exist there; FILE_COMMANDS use the report uploaded by prepare()
+SAFE_INTENTS = {"general_qa", "search_files", "draft_email", "get_system_info", "get_time"}
+REPORT_NAME = "loadtest_report.txt"
+FILE_COMMANDS = [f"summarize {REPORT_NAME}", f"give me a detailed summary of {REPORT_NAME}", f"read the file {REPORT_NAME}"]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    unknown = set(weights) - {"query", "upload"}
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+    return weights
+
+
+class Recorder:
+    """Latencies and errors per scenario, shared by the worker threads"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, scenario: str, seconds: float, ok: bool):
+        with self._lock:
+            self.latencies.setdefault(scenario, []).append(seconds)
+            if not ok:
+                self.errors[scenario] = self.errors.get(scenario, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        report = {}
+        with self._lock:
+            for scenario, values in sorted(self.latencies.items()):
+                values = sorted(values)
+                report[scenario] = {
+                    "requests": len(values),
+                    "errors": self.errors.get(scenario, 0),
+                    "throughput_rps": round(len(values) / elapsed, 2),
+                    "p50_ms": round(percentile(values, 50) * 1000, 1),
+                    "p95_ms": round(percentile(values, 95) * 1000, 1),
+                    "p99_ms": round(percentile(values, 99) * 1000, 1),
+                    "max_ms": round(values[-1] * 1000, 1)
+                }
+        return report
+
+
+class LoadGenerator:
+    def __init__(self, base_url: str, mix: Dict[str, float], wait_jobs: bool = False,
+                 timeout: float = 60.0, seed: Optional[int] = None):
+        self.base_url = base_url.rstrip("/")
+        self.scenarios = list(mix)
+        self.weights = [mix[name] for name in self.scenarios]
+        self.wait_jobs = wait_jobs
+        self.timeout = timeout
+        self.commands = [command for command, intent in COMMAND_CORPUS if intent in SAFE_INTENTS] + FILE_COMMANDS
+        self.upload_body = synthetic_report(2000).encode("utf-8")
+        self.recorder = Recorder()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._local = threading.local()
+
+    def prepare(self):
+        """Upload the report FILE_COMMANDS summarize and read"""
+        files = {"file": (REPORT_NAME, synthetic_report(20000).encode("utf-8"), "text/plain")}
+        requests.post(f"{self.base_url}/api/v1/files/upload", files=files, timeout=self.timeout).raise_for_status()
+
+    def _session(self) -> requests.Session:
+        # One keep-alive connection per worker thread
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _pick(self):
+        with self._rng_lock:
+            scenario = self._rng.choices(self.scenarios, self.weights)[0]
+            command = self._rng.choice(self.commands)
+        return scenario, command
+
+    def one_request(self, index: int):
+        scenario, command = self._pick()
+        start = time.perf_counter()
+        ok = False
+        try:
+            if scenario == "query":
+                ok = self._query(command)
+            else:
+                ok = self._upload(index)
+        except Exception:
+            # Timeouts, refused connections and malformed responses all count as errors
+            ok = False
+        self.recorder.record(scenario, time.perf_counter() - start, ok)
+
+    def _query(self, command: str) -> bool:
+        response = self._session().post(f"{self.base_url}/api/v1/agent/query", json={"command": command}, timeout=self.timeout)
+        if response.status_code != 200:
+            return False
+        if not self.wait_jobs:
+            return True
+        job_id = response.json()["job_id"]
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            job = self._session().get(f"{self.base_url}/api/v1/jobs/{job_id}",
+                                      params={"wait": 10, "include_result": "false"}, timeout=self.timeout).json()
+            if job["status"] not in ("pending", "running"):
+                return job["status"] == "completed"
+        return False
+
+    def _upload(self, index: int) -> bool:
+        # A per-request header line keeps uploads from all being one deduplicated file
+        body = f"Load test upload {index} {time.time_ns()}\n".encode("utf-8") + self.upload_body
+        files = {"file": (f"loadtest_{index}.txt", body, "text/plain")}
+        response = self._session().post(f"{self.base_url}/api/v1/files/upload", files=files, timeout=self.timeout)
+        return response.status_code == 200
+
+    def run(self, concurrency: int, total: Optional[int], duration: Optional[float]) -> Dict:
+        counter = iter(range(total)) if total else None
+        lock = threading.Lock()
+        stop_at = time.perf_counter() + duration if duration else None
+
+        def next_index() -> Optional[int]:
+            with lock:
+                if counter is not None:
+                    return next(counter, None)
+                next_index.count += 1
+                return next_index.count if time.perf_counter() < stop_at else None
+        next_index.count = 0
+
+        def worker():
+            while True:
+                index = next_index()
+                if index is None:
+                    return
+                self.one_request(index)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadgen") as pool:
+            workers = [pool.submit(worker) for _ in range(concurrency)]
+        # A worker that died would otherwise just shrink the concurrency silently
+        for future in workers:
+            future.result()
+        elapsed = time.perf_counter() - start
+
+        scenarios = self.recorder.summary(elapsed)
+        completed = sum(s["requests"] for s in scenarios.values())
+        return {
+            "concurrency": concurrency,
+            "elapsed_s": round(elapsed, 2),
+            "requests": completed,
+            "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+            "errors": sum(s["errors"] for s in scenarios.values()),
+            "scenarios": scenarios
+        }
+
+
+def print_report(report: Dict):
+    print(f"{report['requests']} requests in {report['elapsed_s']}s at concurrency {report['concurrency']}: "
+          f"{report['throughput_rps']} req/s, {report['errors']} error(s)")
+    print(f"  {'scenario':10s} {'requests':>9s} {'errors':>7s} {'req/s':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    for name, s in report["scenarios"].items():
+        print(f"  {name:10s} {s['requests']:9d} {s['errors']:7d} {s['throughput_rps']:8.2f} "
+              f"{s['p50_ms']:9.1f} {s['p95_ms']:9.1f} {s['p99_ms']:9.1f} {s['max_ms']:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, help="Total requests to send (default 200 unless --duration)")
+    parser.add_argument("--duration", type=float, help="Send requests for this many seconds instead")
+    parser.add_argument("--mix", default="query=1", help="Scenario weights, e.g. query=3,upload=1")
+    parser.add_argument("--wait-jobs", action="store_true", help="Time queries until their job finishes")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    total = args.requests or (None if args.duration else 200)
+    generator = LoadGenerator(args.url, parse_mix(args.mix), args.wait_jobs, args.timeout, args.seed)
+    try:
+        requests.get(f"{generator.base_url}/health", timeout=5).raise_for_status()
+        generator.prepare()
+    except requests.RequestException as e:
+        print(f"❌ DeskMate API not reachable at {generator.base_url}: {e}")
+        sys.exit(1)
+
+    report = generator.run(args.concurrency, total, args.duration)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Startup benchmark: import time of app.main and time to the first 200 from /health.
+
+Run from the repository root:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --rounds 10 --output startup.json
+
+Every round starts a fresh interpreter, so nothing is warm except the OS
+file cache. "import" is the time to import app.main in-process; "first_200"
+is the wall-clock time from launching uvicorn until /health answers 200,
+which is what the desktop shell waits for. Each round uses a new scratch
+database and Gemini is disabled, so the numbers do not depend on the
+network. The modules listed as "heavy" should only load on first use.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import tempfile
+from typing import Dict, List
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY_MODULES = ("PyPDF2", "numpy", "google.generativeai")
+
+IMPORT_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def scratch_env(workdir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "GEMINI_API_KEY": "",
+        "DESKMATE_DATABASE_URL": f"sqlite:///{workdir}/startup.db",
+        "DESKMATE_UPLOAD_DIR": os.path.join(workdir, "uploads"),
+        "DESKMATE_ARCHIVE_DIR": os.path.join(workdir, "archive"),
+        "PYTHONPATH": ROOT
+    })
+    return env
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def measure_import() -> Dict:
+    with tempfile.TemporaryDirectory(prefix="deskmate-startup-") as workdir:
+        output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=ROOT, env=scratch_env(workdir),
+                                capture_output=True, text=True, check=True).stdout
+    # The probe's JSON is the last line; anything before it is startup logging
+    return json.loads(output.strip().splitlines()[-1])
+
+def measure_first_200(timeout: float = 30.0) -> float:
+    port = free_port()
+    with tempfile.TemporaryDirectory(prefix="deskmate-startup-") as workdir:
+        start = time.perf_counter()
+        server = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+                                  cwd=ROOT, env=scratch_env(workdir),
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                        return time.perf_counter() - start
+                except requests.ConnectionError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+                time.sleep(0.005)
+            raise TimeoutError(f"/health did not answer within {timeout}s")
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "min_ms": round(min(values) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    imports, heavy = [], set()
+    first_200 = []
+    for _ in range(args.rounds):
+        probe = measure_import()
+        imports.append(probe["seconds"])
+        heavy.update(probe["heavy"])
+        first_200.append(measure_first_200())
+
+    results = {
+        "rounds": args.rounds,
+        "import": summarize(imports),
+        "first_200": summarize(first_200),
+        "heavy_modules_at_import": sorted(heavy)
+    }
+    print(f"Startup over {args.rounds} round(s):")
+    for name in ("import", "first_200"):
+        r = results[name]
+        print(f"  {name:10s} median {r['median_ms']:8.1f} ms   min {r['min_ms']:8.1f} ms   max {r['max_ms']:8.1f} ms")
+    if heavy:
+        print(f"⚠️ Imported at startup: {', '.join(sorted(heavy))}")
+    else:
+        print("✅ No heavy modules imported at startup")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Offline microbenchmark suite with stored baselines and a regression gate.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                     # compare against benchmarks/baseline.json
+    python -m benchmarks.suite --update-baseline   # record new baselines
+    python -m benchmarks.suite --only read_pdf     # benchmarks whose name contains "read_pdf"
+
+Covers RobustMockLLMClient.parse_intent over the labeled command corpus,
+FileReaderPlugin extraction of 1/100/1000-page TXT and PDF files,
+summarize_text at several sizes and ActionExecutor.execute_step dispatch.
+Gemini is disabled so every number is reproducible without network access.
+
+The median time of each benchmark is compared with its baseline; the
+script exits non-zero when one is slower by more than --threshold
+(DESKMATE_BENCH_THRESHOLD, default 0.25 = 25%). Baselines are only
+meaningful on the machine that recorded them; a warning is printed when
+the host differs.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# Offline and isolated: no Gemini, and nothing written next to the real database or uploads
+os.environ["GEMINI_API_KEY"] = ""
+_scratch = tempfile.mkdtemp(prefix="deskmate-bench-")
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{_scratch}/bench.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", os.path.join(_scratch, "uploads"))
+
+from app.core.llm_client import RobustMockLLMClient
+from app.core.executor import ActionExecutor
+from app.core.schema import ActionStep
+from app.plugins.file_reader import FileReaderPlugin
+from benchmarks.bench_intent_parser import COMMAND_CORPUS
+from benchmarks.fixtures import synthetic_report, write_text_pdf
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+PAGE_COUNTS = (1, 100, 1000)
+SUMMARY_WORDS = (1_000, 10_000, 100_000)
+
+
+class NoCache:
+    """Extraction cache that never hits, so reads measure extraction itself"""
+
+    def key_for(self, file_path: str, version: int, **options) -> str:
+        return ""
+
+    def get(self, key: str) -> Optional[dict]:
+        return None
+
+    def put(self, key: str, result: dict):
+        pass
+
+
+class Benchmark:
+    """A named timed callable; setup runs once, outside the measurement"""
+
+    def __init__(self, name: str, setup: Callable[[str], Callable[[], Any]], ops: int = 1):
+        self.name = name
+        self.setup = setup
+        self.ops = ops  # operations per call, e.g. commands in the corpus
+
+    def run(self, workdir: str, min_time: float, rounds: int) -> Dict[str, float]:
+        # Log lines printed on the measured path would time the terminal, not the code
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            return self._measure(self.setup(workdir), min_time, rounds)
+
+    def _measure(self, func: Callable[[], Any], min_time: float, rounds: int) -> Dict[str, float]:
+        func()  # warm up caches, regexes and imports
+
+        # Calls per round so that a round takes about min_time / rounds
+        start = time.perf_counter()
+        func()
+        once = max(time.perf_counter() - start, 1e-7)
+        number = max(1, int(min_time / rounds / once))
+
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - start) / (number * self.ops))
+        return {
+            "median_us": round(statistics.median(timings) * 1e6, 3),
+            "min_us": round(min(timings) * 1e6, 3),
+            "calls": number * rounds
+        }
+
+
+def _parse_corpus(workdir: str):
+    client = RobustMockLLMClient()
+    commands = [command for command, _ in COMMAND_CORPUS]
+    for command, expected in COMMAND_CORPUS:
+        # A faster parser that gets the answer wrong is not an improvement
+        if client.parse_intent(command).intent != expected:
+            raise AssertionError(f"parse_intent({command!r}) is not {expected}")
+
+    def run():
+        for command in commands:
+            client.parse_intent(command)
+    return run
+
+def _page_text(page: int) -> str:
+    return f"Page {page}. " + synthetic_report(400, seed=page)
+
+def _read_txt(pages: int):
+    def setup(workdir: str):
+        path = os.path.join(workdir, f"pages_{pages}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\f".join(_page_text(page) for page in range(pages)))
+        reader = FileReaderPlugin(text_cache=NoCache())
+        return lambda: reader.read_file(path)
+    return setup
+
+def _read_pdf(pages: int):
+    def setup(workdir: str):
+        path = write_text_pdf(os.path.join(workdir, f"pages_{pages}.pdf"),
+                              [_page_text(page)[:90] for page in range(pages)])
+        reader = FileReaderPlugin(text_cache=NoCache())
+        return lambda: reader.read_file(path)
+    return setup
+
+def _summarize(words: int):
+    def setup(workdir: str):
+        text = synthetic_report(words)
+        reader = FileReaderPlugin()
+        return lambda: reader.summarize_text(text, "detailed")
+    return setup
+
+def _dispatch(action: str, params: Dict[str, Any]):
+    def setup(workdir: str):
+        executor = ActionExecutor()
+        step = ActionStep(action=action, params=params)
+        return lambda: executor.execute_step(step)
+    return setup
+
+BENCHMARKS: List[Benchmark] = (
+    [Benchmark("parse_intent.corpus", _parse_corpus, ops=len(COMMAND_CORPUS))]
+    + [Benchmark(f"read_txt.{pages}_pages", _read_txt(pages)) for pages in PAGE_COUNTS]
+    + [Benchmark(f"read_pdf.{pages}_pages", _read_pdf(pages)) for pages in PAGE_COUNTS]
+    + [Benchmark(f"summarize_text.{words}_words", _summarize(words)) for words in SUMMARY_WORDS]
+    + [
+        Benchmark("execute_step.get_time", _dispatch("get_time", {})),
+        Benchmark("execute_step.answer_question", _dispatch("answer_question", {"question": "what is a benchmark"})),
+        Benchmark("execute_step.unknown_action", _dispatch("frobnicate", {"question": "hello"})),
+    ]
+)
+
+
+def host() -> Dict[str, str]:
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "python": platform.python_version(),
+        "system": platform.system()
+    }
+
+def compare(baseline: Dict[str, Dict[str, float]], results: Dict[str, Dict[str, float]],
+            threshold: float) -> Tuple[List[str], List[str]]:
+    """(regressions, report lines) of results against baseline medians"""
+    regressions, lines = [], []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            lines.append(f"  {name:36s} {result['median_us']:14.1f} us   (no baseline)")
+            continue
+        change = result["median_us"] / base["median_us"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  ❌ regression"
+        lines.append(f"  {name:36s} {result['median_us']:14.1f} us   {change:+7.1%} vs {base['median_us']:.1f} us{flag}")
+    return regressions, lines
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"host": None, "benchmarks": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("DESKMATE_BENCH_THRESHOLD", "0.25")))
+    parser.add_argument("--only", help="Run benchmarks whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Target seconds per benchmark")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    selected = [b for b in BENCHMARKS if not args.only or args.only in b.name]
+    results = {}
+    try:
+        for benchmark in selected:
+            workdir = tempfile.mkdtemp(dir=_scratch)
+            results[benchmark.name] = benchmark.run(workdir, args.min_time, args.rounds)
+            print(f"  ran {benchmark.name}", file=sys.stderr)
+    finally:
+        shutil.rmtree(_scratch, ignore_errors=True)
+
+    baseline = load_baseline(args.baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"host": host(), "benchmarks": results}, f, indent=2)
+
+    if args.update_baseline:
+        baseline["host"] = host()
+        baseline["benchmarks"].update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"✅ Stored {len(results)} baseline(s) in {args.baseline}")
+        return
+
+    if baseline.get("host") and baseline["host"] != host():
+        print(f"⚠️ Baseline was recorded on {baseline['host']}; this host is {host()}")
+    regressions, lines = compare(baseline["benchmarks"], results, args.threshold)
+    print(f"Median time per operation (threshold +{args.threshold:.0%}):")
+    print("\n".join(lines))
+    if regressions:
+        print(f"❌ {len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
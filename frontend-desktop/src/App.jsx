@@ -69,15 +69,24 @@ function App() {
     try {
       console.log('Sending command:', userCommand);
 
-      const response = await api.post('/api/v1/agent/query', {
+      const queued = await api.post('/api/v1/agent/query', {
         command: userCommand
       });
 
-      console.log('Received response:', response.data);
+      // The backend queues the command; wait on the job until a worker finishes it
+      let job = { status: queued.data.status };
+      while (job.status === 'pending' || job.status === 'running') {
+        const response = await api.get(`/api/v1/jobs/${queued.data.job_id}`, {
+          params: { wait: 25, include_result: true }
+        });
+        job = response.data;
+      }
+
+      console.log('Received response:', job);
 
       const assistantMessage = {
         type: 'assistant',
-        content: response.data,
+        content: JSON.parse(job.result),
         timestamp: new Date()
       };
 
@@ -89,7 +89,15 @@ def chat_with_agent():
 def process_command(command):
     """Process a command through the agent"""
     with st.spinner("Processing your command..."):
-        result = call_api("/api/v1/agent/query", "POST", {"command": command})
+        queued = call_api("/api/v1/agent/query", "POST", {"command": command})
+        
+        # The backend queues the command; wait on the job until a worker finishes it
+        result = None
+        job = queued
+        while job and job.get("status") in ("pending", "running"):
+            job = call_api(f"/api/v1/jobs/{queued['job_id']}?wait=25&include_result=true")
+        if job and job.get("result"):
+            result = json.loads(job["result"])
         
         if result:
             # Store job in session state with proper structure
@@ -253,10 +261,12 @@ def job_history():
                 st.write(f"**Status:** {job['status']}")
                 st.write(f"**Created:** {job['created_at']}")
                 
-                if job['result']:
+                # The listing omits results; fetch the full job on demand
+                if job['status'] not in ("pending", "running"):
                     if st.button("View Details", key=job['job_id']):
+                        details = call_api(f"/api/v1/jobs/{job['job_id']}?include_result=true") or {}
                         try:
-                            result_data = json.loads(job['result'])
+                            result_data = json.loads(details['result'])
                             # Create a temporary job structure for display
                             temp_job = {
                                 "command": command_text,
@@ -264,7 +274,7 @@ def job_history():
                             }
                             display_job_result(temp_job)
                         except:
-                            st.text(job['result'])
+                            st.text(details.get('result') or "No result recorded")
     else:
         st.info("No job history found")
 
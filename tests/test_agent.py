@@ -1,11 +1,14 @@
 import unittest
 import os
 import sys
+import tempfile
 
 # Add the app directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
 
-from app.core.llm_client import MockLLMClient
+from app.core.llm_client import RobustMockLLMClient
 from app.core.agent_core import DeskMateAgent
 from app.plugins.file_reader import FileReaderPlugin
 from app.plugins.shell_runner import ShellRunnerPlugin
@@ -13,7 +16,7 @@ from app.plugins.shell_runner import ShellRunnerPlugin
 class TestDeskMateAgent(unittest.TestCase):
     
     def setUp(self):
-        self.llm_client = MockLLMClient()
+        self.llm_client = RobustMockLLMClient()
         self.agent = DeskMateAgent()
         self.file_reader = FileReaderPlugin()
         self.shell_runner = ShellRunnerPlugin()
@@ -22,9 +25,14 @@ class TestDeskMateAgent(unittest.TestCase):
         """Test that commands are correctly parsed into intents"""
         
         # Test summarize intent
-        intent = self.llm_client.parse_intent("summarize my document")
+        intent = self.llm_client.parse_intent("summarize report.pdf")
         self.assertEqual(intent.intent, "summarize_file")
         
+        # Without a file name the parser asks which file to summarize
+        intent = self.llm_client.parse_intent("summarize my document")
+        self.assertEqual(intent.intent, "general_qa")
+        self.assertIsNotNone(intent.clarification_question)
+        
         # Test read file intent
         intent = self.llm_client.parse_intent("read the file notes.txt")
         self.assertEqual(intent.intent, "read_file")
@@ -0,0 +1,54 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import create_tables
+from app.api import agent as agent_api
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+class TestAnswerStream(unittest.TestCase):
+    
+    def setUp(self):
+        create_tables()
+        self.client = TestClient(app)
+    
+    def test_tokens_are_streamed_and_job_persisted(self):
+        original = agent_api.agent.executor.stream_answer
+        agent_api.agent.executor.stream_answer = lambda q: iter([("Para", "ai_generated"), ("llel", "ai_generated")])
+        try:
+            response = self.client.post("/api/v1/agent/answer/stream", json={"command": "what is concurrency"})
+        finally:
+            agent_api.agent.executor.stream_answer = original
+        
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = parse_events(response.text)
+        self.assertEqual([e for e, _ in events], ["job", "token", "token", "done"])
+        self.assertEqual(events[-1][1]["results"][0]["result"]["output"]["answer"], "Parallel")
+        
+        job = self.client.get(f"/api/v1/jobs/{events[0][1]['job_id']}").json()
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(json.loads(job["result"])["results"][0]["result"]["output"]["answer"], "Parallel")
+    
+    def test_fallback_without_gemini(self):
+        response = self.client.post("/api/v1/agent/answer/stream", json={"command": "hello"})
+        events = parse_events(response.text)
+        self.assertEqual(events[1][0], "token")
+        self.assertEqual(events[-1][1]["results"][0]["result"]["output"]["answer_type"], "fallback")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import threading
+import time
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import agent as agent_api
+from app.db.database import SessionLocal, create_tables
+from app.db.models import Job
+
+class CountingAgent:
+    """Agent stand-in that records calls and how many ran at once"""
+
+    def __init__(self):
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def process_command(self, command):
+        with self.lock:
+            self.calls.append(command)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        if command == "explode":
+            raise RuntimeError("boom")
+        return {"command": command, "intent": {"intent": "general_qa"}, "results": [], "success": command != "fail"}
+
+class TestBatchEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        create_tables()
+        self.client = TestClient(app)
+        self.original_agent = agent_api.agent
+        self.agent = agent_api.agent = CountingAgent()
+
+    def tearDown(self):
+        agent_api.agent = self.original_agent
+
+    def post(self, commands, **extra):
+        return self.client.post("/api/v1/agent/batch", json=dict(commands=commands, **extra))
+
+    def test_results_in_submitted_order_with_duplicates_run_once(self):
+        commands = ["batch one", "batch two", " batch one ", "fail", "batch two"]
+        response = self.post(commands)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+
+        self.assertEqual(sorted(self.agent.calls), ["batch one", "batch two", "fail"])
+        self.assertEqual(data["total"], 5)
+        self.assertEqual(data["unique"], 3)
+        self.assertEqual([r["command"] for r in data["results"]], commands)
+        self.assertEqual([r["duplicate"] for r in data["results"]], [False, False, True, False, True])
+        self.assertEqual(data["results"][0]["job_id"], data["results"][2]["job_id"])
+        self.assertEqual([r["status"] for r in data["results"]],
+                         ["completed", "completed", "completed", "failed", "completed"])
+
+    def test_rows_are_committed_before_the_response(self):
+        data = self.post(["batch rows a", "batch rows b", "explode"]).json()
+        job_ids = {r["job_id"] for r in data["results"]}
+
+        db = SessionLocal()
+        try:
+            jobs = {j.job_id: j for j in db.query(Job).filter(Job.job_id.in_(job_ids))}
+        finally:
+            db.close()
+        self.assertEqual(set(jobs), job_ids)
+        failed = jobs[data["results"][2]["job_id"]]
+        self.assertEqual(failed.status, "failed")
+        self.assertIn("boom", json.loads(failed.result)["error"])
+
+    def test_results_survive_a_failed_batch_insert(self):
+        def fail(rows):
+            raise RuntimeError("database is locked")
+        original = agent_api.job_writer.insert_many
+        agent_api.job_writer.insert_many = fail
+        try:
+            response = self.post(["batch fallback a", "batch fallback b"])
+        finally:
+            agent_api.job_writer.insert_many = original
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["persisted"])
+        self.assertEqual([r["result"]["command"] for r in data["results"]], ["batch fallback a", "batch fallback b"])
+        db = SessionLocal()
+        try:
+            stored = db.query(Job).filter(Job.job_id.in_([r["job_id"] for r in data["results"]])).count()
+        finally:
+            db.close()
+        self.assertEqual(stored, 2)
+
+    def test_concurrency_is_limited(self):
+        self.post([f"batch parallel {i}" for i in range(8)], max_concurrency=2)
+        self.assertEqual(len(self.agent.calls), 8)
+        self.assertLessEqual(self.agent.peak, 2)
+        self.assertGreater(self.agent.peak, 1)
+
+    def test_rejects_empty_and_oversized_batches(self):
+        self.assertEqual(self.post([]).status_code, 400)
+        self.assertEqual(self.post(["x"] * (agent_api.BATCH_MAX_COMMANDS + 1)).status_code, 400)
+        self.assertEqual(self.agent.calls, [])
+
+if __name__ == '__main__':
+    unittest.main()
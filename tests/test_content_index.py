@@ -0,0 +1,73 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import SessionLocal, create_tables
+from app.db.models import File as FileModel
+from app.core.content_index import content_index, to_match_query
+from app.core.llm_client import RobustMockLLMClient
+
+class TestContentIndex(unittest.TestCase):
+    
+    def setUp(self):
+        create_tables()
+        self.client = TestClient(app)
+    
+    def test_uploads_are_searchable(self):
+        """Upload indexes the text; search returns ranked snippets for matching files only"""
+        self.client.post("/api/v1/files/upload", files={"file": ("gst.txt", b"Invoice 42 includes GST of 18 percent.", "text/plain")})
+        self.client.post("/api/v1/files/upload", files={"file": ("trip.txt", b"Packing list for the mountain trip.", "text/plain")})
+        
+        body = self.client.get("/api/v1/files/search", params={"q": "gst invoice"}).json()
+        self.assertEqual([r["filename"] for r in body["results"]], ["gst.txt"])
+        self.assertIn("**GST**", body["results"][0]["snippet"])
+        
+        # Prefix match on the last word, and punctuation in the query is harmless
+        body = self.client.get("/api/v1/files/search", params={"q": 'mount"ain)'}).json()
+        self.assertEqual(body["result_count"], 0)
+        body = self.client.get("/api/v1/files/search", params={"q": "mount"}).json()
+        self.assertEqual([r["filename"] for r in body["results"]], ["trip.txt"])
+    
+    def test_match_query_is_sanitized(self):
+        self.assertEqual(to_match_query('gst "OR" NEAR('), '"gst" "or" "near"*')
+        self.assertEqual(to_match_query("!!!"), "")
+    
+    def test_mock_routes_document_search(self):
+        intent = RobustMockLLMClient().parse_intent("find GST invoices in my documents")
+        self.assertEqual(intent.intent, "search_content")
+        self.assertEqual(intent.steps[0]["params"]["query"], "gst invoices")
+    
+    def test_filename_searches_stay_filename_searches(self):
+        intent = RobustMockLLMClient().parse_intent("find report in my files")
+        self.assertEqual(intent.intent, "search_files")
+    
+    def test_legacy_uploads_are_hashed_and_indexed(self):
+        """Rows stored before content hashing get a hash and become searchable"""
+        path = os.path.join(tempfile.mkdtemp(), "legacy.txt")
+        with open(path, "w") as f:
+            f.write("Quarterly zeppelin maintenance schedule.")
+        db = SessionLocal()
+        db.add(FileModel(filename="legacy.txt", file_path=path, file_type=".txt"))
+        db.commit()
+        db.close()
+        
+        content_index.index_missing()
+        
+        db = SessionLocal()
+        row = db.query(FileModel).filter(FileModel.file_path == path).one()
+        db.close()
+        self.assertEqual(len(row.content_hash), 64)
+        body = self.client.get("/api/v1/files/search", params={"q": "zeppelin"}).json()
+        self.assertEqual([r["filename"] for r in body["results"]], ["legacy.txt"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+import json
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.core.document_summarizer import MapReduceSummarizer, chunk_text, estimate_tokens
+from app.core.gemini_registry import GeminiModelRegistry
+from app.core.job_runner import current_job_id, progress_reporter
+from app.core.agent_core import DeskMateAgent
+from app.core.schema import ActionStep, ExecutionResult
+from app.db.database import SessionLocal, create_tables
+from app.db.models import Job
+from app.db.job_writer import job_writer
+from benchmarks.fixtures import synthetic_report
+
+class Reply:
+    def __init__(self, text):
+        self.text = text
+
+class SummaryModel:
+    """Model stand-in: answers each prompt with a short line and records overlap"""
+    
+    def __init__(self, delay=0.02, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def generate_content(self, prompt):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("quota exceeded")
+        return Reply(f"summary of {len(prompt)} chars.")
+
+class FakeRegistry(GeminiModelRegistry):
+    def __init__(self, model):
+        super().__init__(api_key="", max_concurrency=32)
+        self.model = model
+    
+    def model_for(self, candidates):
+        return candidates[0], self.model
+
+class TestMapReduceSummarizer(unittest.TestCase):
+    
+    def setUp(self):
+        create_tables()
+    
+    def test_chunks_fit_budget(self):
+        text = synthetic_report(20000)
+        chunks = chunk_text(text, 500)
+        self.assertGreater(len(chunks), 10)
+        self.assertTrue(all(estimate_tokens(c) <= 501 for c in chunks))
+        self.assertEqual(" ".join(chunks).split(), text.split())
+    
+    def test_map_reduce_with_progress(self):
+        model = SummaryModel()
+        events = []
+        summarizer = MapReduceSummarizer(FakeRegistry(model), max_concurrency=4, chunk_tokens=300)
+        result = summarizer.summarize(synthetic_report(20000), "short", "report.pdf",
+                                      progress=lambda **p: events.append(p))
+        
+        self.assertTrue(result["summary"].startswith("summary of"))
+        self.assertGreater(result["chunks"], 20)
+        self.assertGreaterEqual(result["reduce_levels"], 1)
+        self.assertLessEqual(model.peak, 4)
+        # One event per finished chunk, plus the start of each level
+        map_events = [e for e in events if e["stage"] == "map"]
+        self.assertEqual([e["done"] for e in map_events], list(range(result["chunks"] + 1)))
+        self.assertEqual(events[-1]["stage"], f"reduce_{result['reduce_levels']}")
+    
+    def test_wall_clock_follows_concurrency(self):
+        text = synthetic_report(8000)
+        timings = {}
+        for cap in (1, 8):
+            summarizer = MapReduceSummarizer(FakeRegistry(SummaryModel(delay=0.05)), max_concurrency=cap, chunk_tokens=400)
+            start = time.time()
+            summarizer.summarize(text)
+            timings[cap] = time.time() - start
+        self.assertLess(timings[8], timings[1] / 3)
+    
+    def test_failed_chunk_falls_back_to_extractive(self):
+        summarizer = MapReduceSummarizer(FakeRegistry(SummaryModel(fail_on="(1 of")), chunk_tokens=400)
+        result = summarizer.summarize(synthetic_report(4000))
+        self.assertEqual(result["fallback_chunks"], 1)
+    
+    def test_progress_is_recorded_on_the_job(self):
+        db = SessionLocal()
+        db.add(Job(job_id="summary-progress", command="summarize", status="running"))
+        db.commit()
+        token = current_job_id.set("summary-progress")
+        try:
+            progress_reporter()(stage="map", done=3, total=7)
+        finally:
+            current_job_id.reset(token)
+        job_writer.flush()
+        db.expire_all()
+        job = db.query(Job).filter(Job.job_id == "summary-progress").first()
+        self.assertEqual(json.loads(job.progress), {"stage": "map", "done": 3, "total": 7})
+        db.close()
+    
+    def test_summarize_step_receives_read_text(self):
+        agent = DeskMateAgent()
+        read = ExecutionResult(success=True, output={"success": True, "content": "Full document text."})
+        step = agent._with_inputs(ActionStep(action="summarize", params={"style": "short"}), [read])
+        self.assertEqual(step.params, {"style": "short", "text": "Full document text."})
+
+if __name__ == '__main__':
+    unittest.main()
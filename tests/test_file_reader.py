@@ -0,0 +1,81 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.plugins.file_reader import FileReaderPlugin
+from app.core.extraction_cache import ExtractionCache
+from benchmarks.fixtures import write_text_pdf
+
+class TestFileReaderPlugin(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.text_cache = ExtractionCache(cache_dir=os.path.join(self.tmpdir, ".extracted"))
+        self.file_reader = FileReaderPlugin(text_cache=self.text_cache)
+        self.pdf_path = write_text_pdf(
+            os.path.join(self.tmpdir, "manual.pdf"),
+            [f"Page {n} text" for n in range(1, 6)]
+        )
+    
+    def test_page_count_and_streaming(self):
+        """Pages are yielded one at a time and the count comes from metadata"""
+        self.assertEqual(self.file_reader.get_page_count(self.pdf_path), 5)
+        pages = list(self.file_reader.iter_pdf_pages(self.pdf_path, start_page=2, end_page=3))
+        self.assertEqual([n for n, _ in pages], [2, 3])
+        self.assertIn("Page 2 text", pages[0][1])
+    
+    def test_read_pdf_page_range(self):
+        result = self.file_reader.read_file(self.pdf_path, start_page=4)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["page_count"], 5)
+        self.assertEqual(result["pages_read"], [4, 5])
+        self.assertIn("Page 5 text", result["content"])
+        self.assertNotIn("Page 3 text", result["content"])
+        self.assertFalse(result["truncated"])
+    
+    def test_max_chars_budget(self):
+        """Extraction stops at the character budget instead of reading every page"""
+        result = self.file_reader.read_file(self.pdf_path, max_chars=15)
+        self.assertTrue(result["truncated"])
+        self.assertLessEqual(len(result["content"]), 15)
+        self.assertEqual(result["pages_read"], [1, 2])
+        
+        txt_path = os.path.join(self.tmpdir, "notes.txt")
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write("abcdefghij")
+        result = self.file_reader.read_file(txt_path, max_chars=4)
+        self.assertEqual(result["content"], "abcd")
+        self.assertTrue(result["truncated"])
+    
+    def test_extraction_cache(self):
+        """Repeat reads are served from cache, from disk after a restart, and invalidation drops them"""
+        first = self.file_reader.read_file(self.pdf_path)
+        self.assertNotIn("cached", first)
+        second = self.file_reader.read_file(self.pdf_path)
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["content"], first["content"])
+        
+        # A different page range is a different entry
+        self.assertNotIn("cached", self.file_reader.read_file(self.pdf_path, end_page=2))
+        
+        restarted = FileReaderPlugin(text_cache=ExtractionCache(cache_dir=self.text_cache.cache_dir))
+        self.assertTrue(restarted.read_file(self.pdf_path)["cached"])
+        
+        self.assertGreater(self.text_cache.invalidate(self.pdf_path), 0)
+        self.assertNotIn("cached", self.file_reader.read_file(self.pdf_path))
+    
+    def test_memory_tier_is_size_bounded(self):
+        cache = ExtractionCache(cache_dir=os.path.join(self.tmpdir, ".small"), max_bytes=200)
+        cache.put("a", {"content": "x" * 100})
+        cache.put("b", {"content": "y" * 100})
+        self.assertLessEqual(cache.stats()["bytes"], 200)
+        self.assertEqual(cache.stats()["entries"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.core.filename_index import FilenameIndex, search_directory
+from app.core.executor import ActionExecutor
+
+class TestFilenameIndex(unittest.TestCase):
+    
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for rel in ["report.pdf", "old_report.txt", "reports/q1_report.pdf", "reports/deep/annual-report.docx",
+                    "notes.txt", "myreport.log", "node_modules/report.js", ".hidden/report.md"]:
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("x")
+        self.index = FilenameIndex(roots=[self.root], poll_seconds=60)
+        self.index.build()
+    
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    def names(self, result):
+        return [name for name, _, _ in result["results"]]
+    
+    def test_recursive_ranked_search(self):
+        """Matches come from the whole subtree, best ranked first, skipped folders excluded"""
+        names = self.names(self.index.search("report", limit=10))
+        self.assertEqual(names[:2], ["reports", "report.pdf"])
+        self.assertIn("q1_report.pdf", names)
+        self.assertIn("annual-report.docx", names)
+        self.assertNotIn("report.js", names)
+        self.assertNotIn("report.md", names)
+        # Word-start matches rank ahead of plain substring matches
+        self.assertLess(names.index("annual-report.docx"), names.index("myreport.log"))
+    
+    def test_prefix_mode_and_subtree_filter(self):
+        self.assertEqual(sorted(self.names(self.index.search("rep", mode="prefix"))), ["report.pdf", "reports"])
+        under = self.names(self.index.search("report", directory=os.path.join(self.root, "reports")))
+        self.assertEqual(sorted(under), ["annual-report.docx", "q1_report.pdf"])
+    
+    def test_pagination(self):
+        first = self.index.search("report", limit=2)
+        second = self.index.search("report", limit=2, offset=2)
+        self.assertTrue(first["has_more"])
+        self.assertFalse(set(self.names(first)) & set(self.names(second)))
+        everything = self.names(self.index.search("report", limit=50))
+        self.assertEqual(self.names(first) + self.names(second), everything[:4])
+    
+    def test_refresh_picks_up_changes(self):
+        """Only directories whose mtime changed are rescanned"""
+        self.assertEqual(self.index.refresh(), 0)
+        time.sleep(0.01)
+        os.makedirs(os.path.join(self.root, "reports", "new"))
+        with open(os.path.join(self.root, "reports", "new", "budget.xlsx"), "w") as f:
+            f.write("x")
+        os.remove(os.path.join(self.root, "notes.txt"))
+        
+        self.assertGreaterEqual(self.index.refresh(), 1)
+        self.assertEqual(self.names(self.index.search("budget")), ["budget.xlsx"])
+        self.assertEqual(self.names(self.index.search("notes")), [])
+        
+        shutil.rmtree(os.path.join(self.root, "reports"))
+        self.index.refresh()
+        self.assertEqual(self.names(self.index.search("q1_")), [])
+    
+    def test_unindexed_directory_scan(self):
+        names = self.names(search_directory(self.root, "annual"))
+        self.assertEqual(names, ["annual-report.docx"])
+    
+    def test_executor_keeps_result_shape(self):
+        result = ActionExecutor()._search_files("report", self.root, limit=3)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["result_count"], 3)
+        self.assertTrue(result["has_more"])
+        self.assertEqual(set(result["results"][0]), {"name", "path", "type", "size", "modified"})
+        self.assertEqual(result["results"][0]["type"], "directory")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.gemini_registry import GeminiModelRegistry
+
+class SlowModel:
+    """Model stand-in that records how many calls overlap"""
+    
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def generate_content(self, prompt):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        return prompt
+
+class FakeGenAI:
+    """genai module stand-in that builds every model except the unavailable ones"""
+    
+    def __init__(self, unavailable=()):
+        self.unavailable = set(unavailable)
+    
+    def GenerativeModel(self, name):
+        if name in self.unavailable:
+            raise ValueError(f"{name} is not available")
+        return name
+
+class TestGeminiModelRegistry(unittest.TestCase):
+    
+    def test_unconfigured_registry_has_no_models(self):
+        registry = GeminiModelRegistry(api_key="")
+        self.assertEqual(registry.model_for(["models/gemini-2.0-flash"]), (None, None))
+    
+    def test_in_flight_requests_are_capped(self):
+        registry = GeminiModelRegistry(api_key="", max_concurrency=2)
+        model = SlowModel()
+        threads = [threading.Thread(target=registry.generate, args=(model, "hi")) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(model.peak, 2)
+    
+    def test_preference_order_does_not_depend_on_call_order(self):
+        """A model built for another call site does not win over a preferred one"""
+        registry = GeminiModelRegistry(api_key="", genai=FakeGenAI())
+        self.assertEqual(registry.model_for(["flash"])[0], "flash")
+        self.assertEqual(registry.model_for(["flash-lite", "flash"])[0], "flash-lite")
+    
+    def test_unavailable_model_falls_through(self):
+        registry = GeminiModelRegistry(api_key="", genai=FakeGenAI(unavailable={"flash-lite"}))
+        self.assertEqual(registry.model_for(["flash-lite", "flash"])[0], "flash")
+
+if __name__ == '__main__':
+    unittest.main()
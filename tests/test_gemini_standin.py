@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+import uuid
+import tempfile
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.db.database import create_tables
+from app.core.gemini_registry import GeminiModelRegistry
+from app.core.gemini_standin import MODEL_PREFIX, LatencyModel, StandInConfig, StandInGenAI
+from app.core.intent_cache import cache_namespace
+from app.core.llm_client import INTENT_PROMPT, GeminiLLMClient
+from app.core.document_summarizer import MapReduceSummarizer
+from benchmarks.fixtures import synthetic_report
+
+def standin_registry(**options):
+    return GeminiModelRegistry(api_key="", genai=StandInGenAI(StandInConfig(seed=1, **options)))
+
+def unique(command: str) -> str:
+    # Parsed intents are cached across tests; a fresh command always reaches the model
+    return f"{command} {uuid.uuid4().hex[:8]}"
+
+class TestGeminiStandIn(unittest.TestCase):
+
+    def setUp(self):
+        # The intent cache persists parses
+        create_tables()
+
+    def test_client_parses_through_the_standin(self):
+        client = GeminiLLMClient(registry=standin_registry())
+        self.assertTrue(client.is_available)
+        self.assertEqual(client._parse_intent(unique("what time is it"))[1], "gemini")
+
+    def test_standin_parses_are_cached_apart_from_gemini(self):
+        client = GeminiLLMClient(registry=standin_registry())
+        self.assertTrue(client.model.model_name.startswith(MODEL_PREFIX))
+        self.assertNotEqual(client.intent_cache.namespace, cache_namespace(INTENT_PROMPT, client.model_name))
+
+    def test_canned_intent_is_returned(self):
+        command = unique("check my disk")
+        canned = {"intent": "get_system_info", "target": "disk", "steps": [{"action": "get_system_info", "params": {}}]}
+        client = GeminiLLMClient(registry=standin_registry(intents={command: canned}))
+        intent, source = client._parse_intent(command)
+        self.assertEqual(source, "gemini")
+        self.assertEqual(intent.intent, "get_system_info")
+        self.assertEqual(intent.target, "disk")
+
+    def test_simulated_errors_fall_back_to_the_offline_parser(self):
+        client = GeminiLLMClient(registry=standin_registry(error_rate=1.0))
+        intent, source = client._parse_intent(unique("what is the weather"))
+        self.assertEqual(source, "mock")
+        self.assertIsNotNone(intent.intent)
+
+    def test_latency_distributions(self):
+        self.assertEqual(LatencyModel("fixed:0.25").sample(), 0.25)
+        samples = [LatencyModel("uniform:0.1,0.2").sample() for _ in range(50)]
+        self.assertTrue(all(0.1 <= s <= 0.2 for s in samples))
+        self.assertTrue(all(LatencyModel("normal:0,1").sample() >= 0 for _ in range(50)))
+        self.assertGreater(LatencyModel("lognormal:0.5,0.1").sample(), 0)
+        with self.assertRaises(ValueError):
+            LatencyModel("pareto:1")
+
+    def test_streaming_yields_chunks(self):
+        registry = standin_registry(stream_chunks=4)
+        _, model = registry.model_for(["gemini-standin"])
+        chunks = [chunk.text for chunk in registry.generate_stream(model, "Tell me about load tests")]
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), model.respond("Tell me about load tests"))
+
+    def test_map_reduce_summary_with_the_standin(self):
+        summarizer = MapReduceSummarizer(registry=standin_registry(), chunk_tokens=500)
+        result = summarizer.summarize(synthetic_report(3000), style="short", title="report")
+        self.assertGreater(result["chunks"], 1)
+        self.assertEqual(result["fallback_chunks"], 0)
+        self.assertLessEqual(len(result["summary"].split()), 120)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.db.database import create_tables
+from app.core.schema import Intent
+from app.core import intent_cache
+from app.core.intent_cache import IntentCache, normalize_command, cache_namespace
+
+class BrokenSession:
+    """A session whose every query fails, like a locked or corrupt database"""
+    
+    def query(self, *args):
+        raise RuntimeError("database is locked")
+    
+    def rollback(self):
+        pass
+    
+    def close(self):
+        pass
+
+def make_intent(target):
+    return Intent(intent="open_website", target=target, steps=[{"action": "open_url", "params": {"url": target}}])
+
+class TestIntentCache(unittest.TestCase):
+    
+    def setUp(self):
+        create_tables()
+        self.namespace = cache_namespace("prompt {command}", "models/test")
+        IntentCache(self.namespace).invalidate()
+    
+    def test_normalization(self):
+        """Repeated commands share a key; file paths keep their casing"""
+        self.assertEqual(normalize_command("  Open   YouTube? "), "open youtube")
+        self.assertEqual(normalize_command("read Report.pdf"), "read Report.pdf")
+    
+    def test_hit_miss_and_persistence(self):
+        """Entries survive a new cache instance for the same namespace"""
+        cache = IntentCache(self.namespace)
+        self.assertIsNone(cache.get("open youtube"))
+        cache.put("open youtube", make_intent("youtube"))
+        self.assertEqual(cache.get("Open YouTube").target, "youtube")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        
+        restarted = IntentCache(self.namespace)
+        self.assertEqual(restarted.get("open youtube").target, "youtube")
+    
+    def test_namespace_change_invalidates(self):
+        """A different prompt or model drops entries written under the old one"""
+        IntentCache(self.namespace).put("open youtube", make_intent("youtube"))
+        other = IntentCache(cache_namespace("new prompt {command}", "models/test"))
+        self.assertIsNone(other.get("open youtube"))
+        self.assertIsNone(IntentCache(self.namespace).get("open youtube"))
+    
+    def test_lru_eviction_and_ttl(self):
+        """Least recently used entries are evicted and expired entries miss"""
+        cache = IntentCache(self.namespace, max_entries=2)
+        cache.put("a", make_intent("a"))
+        cache.put("b", make_intent("b"))
+        cache.get("a")
+        cache.put("c", make_intent("c"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        
+        short = IntentCache(self.namespace, ttl_seconds=0.01)
+        short.put("d", make_intent("d"))
+        time.sleep(0.02)
+        self.assertIsNone(short.get("d"))
+    
+    def test_invalidate_survives_database_errors(self):
+        """A failing delete is logged; the memory tier is still cleared"""
+        cache = IntentCache(self.namespace)
+        cache.put("open youtube", make_intent("youtube"))
+        original = intent_cache.SessionLocal
+        intent_cache.SessionLocal = BrokenSession
+        try:
+            self.assertEqual(cache.invalidate(), 1)
+        finally:
+            intent_cache.SessionLocal = original
+        self.assertIsNone(cache.get("open youtube"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.core.keyword_matcher import KeywordMatcher
+from app.core.llm_client import RobustMockLLMClient
+from benchmarks.bench_intent_parser import LegacyRobustMockLLMClient, check_equivalence
+
+class TestKeywordMatcher(unittest.TestCase):
+    
+    def test_overlapping_and_nested_keywords(self):
+        """Every keyword contained in the text is reported, including nested and overlapping ones"""
+        matcher = KeywordMatcher({"dir": 1, "directory": 2, "gpt": 4, "chatgpt": 8, "on": 16, "cat": 32})
+        mask, found = matcher.scan("ask chatgpt on my directory")
+        self.assertEqual(found, {"dir", "directory", "gpt", "chatgpt", "on"})
+        self.assertEqual(mask, 1 | 2 | 4 | 8 | 16)
+        
+        mask, found = matcher.scan("nothing here")
+        self.assertEqual((mask, found), (0, set()))
+
+class TestRobustMockLLMClient(unittest.TestCase):
+    
+    def test_matches_legacy_parser(self):
+        """The compiled matcher keeps the priority order of the keyword-scan parser"""
+        self.assertEqual(check_equivalence(RobustMockLLMClient(), LegacyRobustMockLLMClient()), [])
+    
+    def test_priority_order(self):
+        client = RobustMockLLMClient()
+        self.assertEqual(client.parse_intent("create file notes.txt").intent, "create_file")
+        self.assertEqual(client.parse_intent("search iphone on amazon").intent, "open_url")
+        self.assertEqual(client.parse_intent("open read.txt and summarize").intent, "summarize_file")
+        self.assertEqual(client.parse_intent("hello").intent, "general_qa")
+
+if __name__ == '__main__':
+    unittest.main()
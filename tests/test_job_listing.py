@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from sqlalchemy import text
+from app.db.database import SessionLocal, create_tables, engine
+from app.db.models import Job
+
+class TestJobListing(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        create_tables()
+        cls.client = TestClient(app)
+        db = SessionLocal()
+        db.query(Job).filter(Job.job_id.like("list-%")).delete(synchronize_session=False)
+        base = datetime(2030, 1, 1)
+        for i in range(25):
+            # Pairs of jobs share a timestamp so the id tiebreaker matters
+            db.add(Job(
+                job_id=f"list-{i:02d}",
+                command=f"command {i}",
+                intent="general_qa" if i % 2 else "search_files",
+                status="completed" if i % 3 else "failed",
+                result="x" * 1000,
+                created_at=base + timedelta(seconds=i // 2)
+            ))
+        db.commit()
+        db.close()
+    
+    def list_all(self, **params):
+        ids, cursor, pages = [], None, 0
+        while True:
+            response = self.client.get("/api/v1/jobs/", params=dict(params, cursor=cursor) if cursor else params)
+            self.assertEqual(response.status_code, 200)
+            ids += [j["job_id"] for j in response.json() if j["job_id"].startswith("list-")]
+            pages += 1
+            cursor = response.headers.get("x-next-cursor")
+            if not cursor:
+                return ids, pages
+    
+    def test_pages_cover_every_job_once_newest_first(self):
+        ids, pages = self.list_all(limit=4)
+        self.assertEqual(ids, [f"list-{i:02d}" for i in reversed(range(25))])
+        self.assertGreaterEqual(pages, 7)
+    
+    def test_second_precision_rows_page_once(self):
+        """Rows stamped by SQLite's CURRENT_TIMESTAMP have no fractional seconds"""
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM jobs WHERE job_id LIKE 'coarse-%'"))
+            for i in range(5):
+                conn.execute(text("INSERT INTO jobs (job_id, command, status, created_at) "
+                                  "VALUES (:job_id, 'hi', 'completed', '2031-01-01 00:00:00')"),
+                             {"job_id": f"coarse-{i}"})
+        
+        ids, cursor = [], None
+        for _ in range(50):  # bounded: a cursor that repeats its own row never ends
+            response = self.client.get("/api/v1/jobs/", params={"limit": 2, "cursor": cursor} if cursor else {"limit": 2})
+            ids += [j["job_id"] for j in response.json() if j["job_id"].startswith("coarse-")]
+            cursor = response.headers.get("x-next-cursor")
+            if not cursor:
+                break
+        self.assertEqual(ids, [f"coarse-{i}" for i in reversed(range(5))])
+    
+    def test_filters(self):
+        ids, _ = self.list_all(limit=5, status="failed", intent="search_files")
+        self.assertEqual(ids, [f"list-{i:02d}" for i in reversed(range(25)) if i % 3 == 0 and i % 2 == 0])
+    
+    def test_projection_excludes_result(self):
+        jobs = self.client.get("/api/v1/jobs/", params={"limit": 1}).json()
+        self.assertEqual(set(jobs[0]), {"job_id", "command", "intent", "status", "created_at"})
+    
+    def test_bad_cursor(self):
+        self.assertEqual(self.client.get("/api/v1/jobs/", params={"cursor": "not-a-cursor"}).status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
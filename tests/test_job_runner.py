@@ -0,0 +1,89 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.db.database import SessionLocal, create_tables
+from app.db.models import Job
+from app.core.job_runner import JobRunner
+
+class GatedAgent:
+    """Agent stand-in that blocks until the test releases it"""
+    
+    def __init__(self):
+        self.release = threading.Event()
+    
+    def process_command(self, command):
+        self.release.wait(5)
+        if command == "explode":
+            raise RuntimeError("boom")
+        return {"command": command, "intent": {"intent": "general_qa"}, "results": [], "success": True}
+
+class TestJobRunner(unittest.TestCase):
+    
+    def setUp(self):
+        create_tables()
+        self.agent = GatedAgent()
+        self.runner = JobRunner(self.agent, max_workers=2)
+    
+    def tearDown(self):
+        self.agent.release.set()
+        self.runner.shutdown()
+    
+    def _create_job(self, job_id, command):
+        db = SessionLocal()
+        db.add(Job(job_id=job_id, command=command, status="pending"))
+        db.commit()
+        db.close()
+    
+    def _get_job(self, job_id):
+        db = SessionLocal()
+        try:
+            return db.query(Job).filter(Job.job_id == job_id).first()
+        finally:
+            db.close()
+    
+    def test_job_moves_through_states(self):
+        """A queued job is running while the agent works and completed afterwards"""
+        self._create_job("job-states", "hello")
+        future = self.runner.submit("job-states", "hello")
+        
+        # Wait until the worker has picked the job up
+        for _ in range(100):
+            if self._get_job("job-states").status == "running":
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(self._get_job("job-states").status, "running")
+        self.assertFalse(asyncio.run(self.runner.wait("job-states", 0.05)))
+        
+        self.agent.release.set()
+        future.result(timeout=5)
+        
+        job = self._get_job("job-states")
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(job.intent, "general_qa")
+        self.assertEqual(json.loads(job.result)["job_id"], "job-states")
+        self.assertTrue(asyncio.run(self.runner.wait("job-states", 0.05)))
+    
+    def test_failed_job_is_recorded(self):
+        """An exception inside the agent marks the job failed instead of leaving it running"""
+        self._create_job("job-failed", "explode")
+        self.agent.release.set()
+        future = self.runner.submit("job-failed", "explode")
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=5)
+        
+        job = self._get_job("job-failed")
+        self.assertEqual(job.status, "failed")
+        self.assertIn("boom", json.loads(job.result)["error"])
+
+if __name__ == '__main__':
+    unittest.main()
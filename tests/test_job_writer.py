@@ -0,0 +1,102 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from sqlalchemy import event, text
+from app.db.database import SessionLocal, create_tables, engine
+from app.db.models import Job
+from app.db.job_writer import JobWriter
+
+class TestJobWriter(unittest.TestCase):
+    
+    def setUp(self):
+        create_tables()
+        self.writer = JobWriter(batch_window=0.05)
+        self.commits = 0
+        event.listen(engine, "commit", self._count_commit)
+    
+    def tearDown(self):
+        event.remove(engine, "commit", self._count_commit)
+        self.writer.close()
+    
+    def _count_commit(self, conn):
+        self.commits += 1
+    
+    def _get_job(self, job_id):
+        db = SessionLocal()
+        try:
+            return db.query(Job).filter(Job.job_id == job_id).first()
+        finally:
+            db.close()
+    
+    def test_wal_mode(self):
+        with engine.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+    
+    def test_writes_are_batched_and_merged(self):
+        """Concurrent inserts and updates land in one transaction, merged per job"""
+        threads = [threading.Thread(target=self.writer.insert, args=(f"batch-{i}",), kwargs={"command": "hi", "status": "pending"})
+                   for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.writer.update("batch-0", status="running")
+        self.writer.update("batch-0", status="completed", result="{}")
+        
+        self.assertIsNone(self._get_job("batch-0"))
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertLessEqual(self.commits, 2)
+        self.assertEqual(self._get_job("batch-0").status, "completed")
+        self.assertEqual(self._get_job("batch-19").status, "pending")
+    
+    def test_pending_changes_are_visible(self):
+        self.writer.insert("overlay", command="hi", status="pending")
+        self.writer.update("overlay", status="running")
+        pending = self.writer.pending("overlay")
+        self.assertEqual(pending["status"], "running")
+        self.assertTrue(pending["_insert"])
+        self.writer.flush()
+        self.assertIsNone(self.writer.pending("overlay"))
+    
+    def test_wait_commits_before_returning(self):
+        self.writer.insert("waited", command="hi", status="pending")
+        self.writer.update("waited", wait=True, status="completed")
+        self.assertEqual(self._get_job("waited").status, "completed")
+    
+    def test_bad_row_does_not_sink_its_batch(self):
+        """A row that can never be written is abandoned alone; the rest of its batch commits"""
+        self.writer.insert("dupe", command="first", status="pending")
+        self.assertTrue(self.writer.flush(timeout=5))
+        
+        self.writer.insert("dupe", command="again", status="pending")
+        for i in range(3):
+            self.writer.insert(f"neighbour-{i}", command="hi", status="pending")
+        
+        self.assertFalse(self.writer.flush(timeout=10))
+        self.assertEqual(self.writer.abandoned(), 1)
+        self.assertEqual(self._get_job("dupe").command, "first")
+        for i in range(3):
+            self.assertIsNotNone(self._get_job(f"neighbour-{i}"))
+        
+        # Later writes are unaffected by the earlier loss
+        self.writer.insert("after", command="hi", status="pending")
+        self.assertTrue(self.writer.update("after", wait=True, status="completed"))
+        self.assertTrue(self.writer.flush(timeout=5))
+    
+    def test_close_flushes(self):
+        self.writer.insert("closing", command="bye", status="pending")
+        self.writer.close()
+        self.assertIsNotNone(self._get_job("closing"))
+        with self.assertRaises(RuntimeError):
+            self.writer.insert("late", command="bye")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import create_tables
+from app.core.metrics import MetricsRegistry
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("demo_seconds", "Demo", ["stage"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value, stage="map")
+        text = self.registry.render()
+
+        self.assertIn('demo_seconds_bucket{stage="map",le="0.1"} 2', text)
+        self.assertIn('demo_seconds_bucket{stage="map",le="1"} 3', text)
+        self.assertIn('demo_seconds_bucket{stage="map",le="+Inf"} 4', text)
+        self.assertIn('demo_seconds_count{stage="map"} 4', text)
+        self.assertIn('demo_seconds_sum{stage="map"} 5.65', text)
+        self.assertIn("# TYPE demo_seconds histogram", text)
+
+    def test_counts_from_many_threads_add_up(self):
+        counter = self.registry.counter("demo_events", "Demo", ["kind"])
+
+        def work():
+            for _ in range(2000):
+                counter.inc(kind="hit")
+
+        # Two waves, so the first wave's shards are folded in when the second registers
+        for _ in range(2):
+            threads = [threading.Thread(target=work) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(counter.labels(kind="hit").value, 32000)
+        text = self.registry.render()
+        self.assertIn('demo_events_total{kind="hit"} 32000', text)
+        # The family name matches its samples, as prometheus_client exposes counters
+        self.assertIn("# HELP demo_events_total Demo", text)
+        self.assertIn("# TYPE demo_events_total counter", text)
+        self.assertLessEqual(len(counter.labels(kind="hit")._values._shards), 9)
+
+    def test_label_values_are_escaped(self):
+        self.registry.counter("demo_escaped", "Demo", ["path"]).inc(path='a"b\\c')
+        self.assertIn('demo_escaped_total{path="a\\"b\\\\c"} 1', self.registry.render())
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def test_pipeline_metrics_are_exposed(self):
+        create_tables()
+        client = TestClient(app)
+        client.post("/api/v1/agent/batch", json={"commands": ["what is a metric"]})
+        client.get("/api/v1/jobs/not-a-real-job")
+        # A job id equal to a literal segment of its own path
+        client.get("/api/v1/jobs/jobs/profile")
+
+        response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        text = response.text
+        self.assertIn("deskmate_parse_intent_seconds_count{source=", text)
+        self.assertIn('deskmate_action_seconds_count{action="answer_question",outcome="success"}', text)
+        self.assertIn('deskmate_db_commit_seconds_count{kind="batch"}', text)
+        # Route templates, not raw paths, so ids do not become label values
+        self.assertIn('route="/api/v1/jobs/{job_id}",status="404"', text)
+        self.assertNotIn("not-a-real-job", text)
+        self.assertIn('route="/api/v1/jobs/{job_id}/profile",status="404"', text)
+
+if __name__ == '__main__':
+    unittest.main()
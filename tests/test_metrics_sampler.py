@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import create_tables
+from app.core.metrics_sampler import MetricsSampler, host_info, psutil
+from app.plugins.system_control import SystemControlPlugin
+
+@unittest.skipIf(psutil is None, "psutil is not installed")
+class TestMetricsSampler(unittest.TestCase):
+    
+    def test_ring_buffer_is_bounded(self):
+        sampler = MetricsSampler(interval=60, capacity=3)
+        for _ in range(5):
+            sampler.sample()
+        self.assertEqual(len(sampler.history(60)), 3)
+    
+    def test_history_window(self):
+        sampler = MetricsSampler(interval=60, capacity=10)
+        sampler.sample()
+        sampler._samples[0]["timestamp"] -= 600
+        sampler.sample()
+        self.assertEqual(len(sampler.history(5)), 1)
+        self.assertEqual(len(sampler.history(15)), 2)
+    
+    def test_background_thread_samples(self):
+        sampler = MetricsSampler(interval=0.05, capacity=100)
+        sampler.start()
+        time.sleep(0.4)
+        sampler.stop()
+        self.assertGreaterEqual(len(sampler.history(1)), 2)
+    
+    def test_concurrent_first_samples_prime_once(self):
+        """Only one caller takes the blocking priming reading"""
+        sampler = MetricsSampler(interval=60, capacity=10)
+        original = psutil.cpu_percent
+        primes = []
+        
+        def counting_cpu_percent(interval=None):
+            if interval:
+                primes.append(interval)
+            return original(interval=interval)
+        
+        psutil.cpu_percent = counting_cpu_percent
+        try:
+            threads = [threading.Thread(target=sampler.sample) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            psutil.cpu_percent = original
+        self.assertEqual(len(primes), 1)
+        self.assertEqual(len(sampler.history(1)), 8)
+    
+    def test_system_info_does_not_block(self):
+        """After the first sample, get_system_info only reads the buffer"""
+        plugin = SystemControlPlugin()
+        plugin.get_system_info()
+        start = time.perf_counter()
+        result = plugin.get_system_info()
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["output"]["system"], host_info()["system"])
+        self.assertIn("usage_percent", result["output"]["cpu"])
+        self.assertIn("total_gb", result["output"]["storage"])
+    
+    def test_history_endpoint(self):
+        create_tables()
+        client = TestClient(app)
+        self.assertEqual(client.get("/api/v1/system/history", params={"minutes": 0}).status_code, 422)
+        body = client.get("/api/v1/system/history", params={"minutes": 10}).json()
+        self.assertEqual(body["minutes"], 10)
+        self.assertEqual(body["count"], len(body["samples"]))
+
+if __name__ == '__main__':
+    unittest.main()
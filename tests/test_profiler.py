@@ -0,0 +1,101 @@
+import unittest
+import os
+import sys
+import pstats
+import tempfile
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import create_tables
+from app.core.profiler import PROFILE_HEADER, profiling, run_profiled, should_profile
+
+def step_in_other_thread():
+    return sum(i * i for i in range(1000))
+
+def function_names(stats: pstats.Stats):
+    return {name for (_, _, name) in stats.stats}
+
+class TestProfiler(unittest.TestCase):
+
+    def test_header_or_sampling_enables_profiling(self):
+        self.assertTrue(should_profile("1", sample_every=0))
+        self.assertFalse(should_profile(None, sample_every=0))
+        self.assertFalse(should_profile("no", sample_every=0))
+        sampled = [should_profile(None, sample_every=3) for _ in range(9)]
+        self.assertEqual(sum(sampled), 3)
+
+    def test_step_threads_are_merged_into_the_profile(self):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            with profiling() as collector:
+                pool.submit(contextvars.copy_context().run, run_profiled, step_in_other_thread).result()
+        self.assertIn("step_in_other_thread", function_names(collector.stats()))
+
+    def test_concurrent_profiled_commands_each_get_a_profile(self):
+        collectors = []
+
+        def command():
+            with profiling() as collector:
+                step_in_other_thread()
+            collectors.append(collector)
+
+        threads = [threading.Thread(target=command) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for collector in collectors:
+            self.assertIsNone(collector.error)
+            self.assertIn("step_in_other_thread", function_names(collector.stats()))
+
+    def test_profile_that_cannot_be_taken_says_why(self):
+        with profiling():
+            with profiling(wait=0) as skipped:
+                step_in_other_thread()
+        self.assertIsNone(skipped.stats())
+        self.assertIn("still running", skipped.error)
+
+    def test_not_profiled_outside_a_profiled_command(self):
+        self.assertEqual(run_profiled(step_in_other_thread), step_in_other_thread())
+
+class TestProfileEndpoint(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        create_tables()
+        cls.client = TestClient(app)
+
+    def run_command(self, headers=None):
+        queued = self.client.post("/api/v1/agent/query", json={"command": "what is profiling"}, headers=headers or {}).json()
+        self.client.get(f"/api/v1/jobs/{queued['job_id']}", params={"wait": 10})
+        return queued
+
+    def test_profiled_job_profile_downloads(self):
+        queued = self.run_command({PROFILE_HEADER: "1"})
+        self.assertTrue(queued["profiled"])
+
+        response = self.client.get(f"/api/v1/jobs/{queued['job_id']}/profile")
+        self.assertEqual(response.status_code, 200)
+        path = os.path.join(tempfile.mkdtemp(), "job.prof")
+        with open(path, "wb") as f:
+            f.write(response.content)
+        self.assertIn("process_command", function_names(pstats.Stats(path)))
+
+        # From Python 3.12 the profile also holds other threads' calls, so ask for the whole listing
+        text = self.client.get(f"/api/v1/jobs/{queued['job_id']}/profile", params={"format": "text", "limit": 500}).text
+        self.assertIn("process_command", text)
+
+    def test_unprofiled_job_has_no_profile(self):
+        queued = self.run_command()
+        self.assertFalse(queued["profiled"])
+        self.assertEqual(self.client.get(f"/api/v1/jobs/{queued['job_id']}/profile").status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import SessionLocal, create_tables
+from app.db.models import Job, JobResult
+from app.db.job_writer import job_writer
+from app.db.result_store import pack_result, RESULT_INLINE_BYTES
+
+def large_result(tag: str) -> str:
+    lines = [f"{tag} line {i}: the quick brown fox jumps over the lazy dog" for i in range(4000)]
+    return json.dumps({"success": True, "output": "\n".join(lines)})
+
+class TestResultStore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        create_tables()
+        cls.client = TestClient(app)
+
+    def write_job(self, job_id: str, result: str):
+        job_writer.insert(job_id, command="test", intent="general_qa", status="running")
+        job_writer.update(job_id, wait=True, status="completed", result=result)
+
+    def test_small_result_stays_inline(self):
+        columns, blob = pack_result('{"success": true}')
+        self.assertIsNone(blob)
+        self.assertEqual(columns["result"], '{"success": true}')
+        self.assertIsNone(columns["result_ref"])
+
+    def test_large_result_is_offloaded_compressed(self):
+        result = large_result("offload")
+        self.assertGreater(len(result), RESULT_INLINE_BYTES)
+        self.write_job("store-large", result)
+
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.job_id == "store-large").one()
+            self.assertIsNone(job.result)
+            self.assertEqual(job.result_size, len(result.encode()))
+            blob = db.query(JobResult).filter(JobResult.content_hash == job.result_ref).one()
+            self.assertLess(blob.compressed_size, blob.size / 5)
+        finally:
+            db.close()
+
+        data = self.client.get("/api/v1/jobs/store-large", params={"include_result": "true"}).json()
+        self.assertEqual(data["result"], result)
+        self.assertTrue(data["result_offloaded"])
+        self.assertEqual(data["result_size"], len(result.encode()))
+
+    def test_offloaded_result_is_only_loaded_on_request(self):
+        self.write_job("store-lazy", large_result("lazy"))
+        data = self.client.get("/api/v1/jobs/store-lazy").json()
+        self.assertEqual(data["status"], "completed")
+        self.assertIsNone(data["result"])
+        self.assertTrue(data["result_offloaded"])
+
+    def test_identical_results_are_stored_once(self):
+        result = large_result("dedup")
+        self.write_job("store-dedup-1", result)
+        self.write_job("store-dedup-2", result)
+
+        db = SessionLocal()
+        try:
+            refs = {j.result_ref for j in db.query(Job).filter(Job.job_id.like("store-dedup-%"))}
+            self.assertEqual(len(refs), 1)
+            self.assertEqual(db.query(JobResult).filter(JobResult.content_hash.in_(refs)).count(), 1)
+        finally:
+            db.close()
+
+    def test_small_result_round_trips_inline(self):
+        self.write_job("store-small", '{"success": true}')
+        data = self.client.get("/api/v1/jobs/store-small").json()
+        self.assertEqual(data["result"], '{"success": true}')
+        self.assertFalse(data["result_offloaded"])
+
+if __name__ == '__main__':
+    unittest.main()
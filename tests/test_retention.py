@@ -0,0 +1,151 @@
+import unittest
+import os
+import sys
+import json
+import gzip
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from sqlalchemy import text
+from app.db.database import SessionLocal, create_tables, engine
+from app.db.models import Job, JobResult
+from app.db.job_writer import job_writer, utcnow
+from app.db.retention import RetentionManager, in_window, parse_window
+
+def read_archive(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+class TestRetention(unittest.TestCase):
+
+    def setUp(self):
+        create_tables()
+        self.archive_dir = tempfile.mkdtemp()
+        db = SessionLocal()
+        db.query(Job).filter(Job.job_id.like("old-%")).delete(synchronize_session=False)
+        # Older than anything other tests create, so the policies only ever touch these
+        base = datetime(2001, 1, 1)
+        for i in range(5):
+            db.add(Job(job_id=f"old-{i}", command=f"old command {i}", intent="general_qa",
+                       status="completed", result='{"success": true}', created_at=base + timedelta(days=i)))
+        db.add(Job(job_id="old-running", command="still going", intent="general_qa",
+                   status="running", created_at=base))
+        db.commit()
+        db.close()
+        job_writer.flush()
+
+    def remaining(self):
+        db = SessionLocal()
+        try:
+            return sorted(j.job_id for j in db.query(Job).filter(Job.job_id.like("old-%")))
+        finally:
+            db.close()
+
+    def test_age_policy_archives_then_deletes(self):
+        manager = RetentionManager(max_age_days=365, max_rows=0, archive_dir=self.archive_dir)
+        run = manager.run()
+
+        self.assertEqual(self.remaining(), ["old-running"])
+        self.assertGreaterEqual(run["jobs_archived"], 5)
+        archived = {r["job_id"]: r for r in read_archive(run["archive_path"])}
+        self.assertEqual(archived["old-3"]["command"], "old command 3")
+        self.assertEqual(archived["old-3"]["result"], '{"success": true}')
+        self.assertNotIn("old-running", archived)
+
+    def test_row_policy_keeps_newest(self):
+        db = SessionLocal()
+        total = db.query(Job).count()
+        db.close()
+
+        # Everything but the three oldest completed jobs fits
+        manager = RetentionManager(max_age_days=0, max_rows=total - 4, archive_dir=self.archive_dir)
+        run = manager.run(vacuum=False)
+
+        self.assertEqual(run["jobs_archived"], 3)
+        self.assertEqual(self.remaining(), ["old-3", "old-4", "old-running"])
+
+    def test_age_policy_with_mixed_timestamp_formats(self):
+        """Python-written, CURRENT_TIMESTAMP and ISO "T" timestamps expire by their actual age"""
+        day = (utcnow() - timedelta(days=365)).date()
+        rows = {
+            "old-format-coarse": f"{day - timedelta(days=1)} 00:00:00",
+            "old-format-iso": f"{day}T00:00:00",
+            "old-format-fine": f"{day - timedelta(days=1)} 00:00:00.250000",
+            "old-format-recent": f"{day + timedelta(days=2)} 00:00:00",
+        }
+        with engine.begin() as conn:
+            for job_id, created_at in rows.items():
+                conn.execute(text("INSERT INTO jobs (job_id, command, intent, status, created_at) "
+                                  "VALUES (:job_id, 'format', 'general_qa', 'completed', :created_at)"),
+                             {"job_id": job_id, "created_at": created_at})
+
+        manager = RetentionManager(max_age_days=365, max_rows=0, archive_dir=self.archive_dir)
+        manager.run(vacuum=False)
+
+        self.assertEqual([j for j in self.remaining() if j.startswith("old-format")], ["old-format-recent"])
+
+    def test_row_policy_with_second_precision_rows(self):
+        """Rows stamped by SQLite's CURRENT_TIMESTAMP have no fractional seconds"""
+        with engine.begin() as conn:
+            for i in range(3):
+                conn.execute(text("INSERT INTO jobs (job_id, command, intent, status, created_at) "
+                                  "VALUES (:job_id, 'coarse', 'general_qa', 'completed', '2000-06-01 00:00:00')"),
+                             {"job_id": f"old-coarse-{i}"})
+        db = SessionLocal()
+        total = db.query(Job).count()
+        db.close()
+
+        # Two of the three same-second rows fall outside the limit, lowest id first
+        manager = RetentionManager(max_age_days=0, max_rows=total - 2, archive_dir=self.archive_dir)
+        run = manager.run(vacuum=False)
+
+        self.assertEqual(run["jobs_archived"], 2)
+        self.assertEqual([j for j in self.remaining() if j.startswith("old-coarse")], ["old-coarse-2"])
+
+    def test_offloaded_results_are_archived_and_orphans_removed(self):
+        result = json.dumps({"output": "archived line\n" * 5000})
+        job_writer.insert("old-big", command="big", intent="general_qa", status="completed", result=result,
+                          created_at=datetime(2001, 6, 1))
+        job_writer.flush()
+
+        manager = RetentionManager(max_age_days=365, max_rows=0, archive_dir=self.archive_dir)
+        run = manager.run()
+
+        archived = {r["job_id"]: r for r in read_archive(run["archive_path"])}
+        self.assertEqual(archived["old-big"]["result"], result)
+        self.assertGreaterEqual(run["results_deleted"], 1)
+        db = SessionLocal()
+        try:
+            self.assertEqual(db.query(JobResult).filter(JobResult.content_hash == archived["old-big"]["result_ref"]).count(), 0)
+        finally:
+            db.close()
+
+    def test_no_policy_deletes_nothing(self):
+        run = RetentionManager(max_age_days=0, max_rows=0, archive_dir=self.archive_dir).run(vacuum=False)
+        self.assertEqual(run["jobs_archived"], 0)
+        self.assertIsNone(run["archive_path"])
+        self.assertEqual(len(self.remaining()), 6)
+
+    def test_maintenance_window(self):
+        self.assertTrue(in_window(3, parse_window("2-5")))
+        self.assertFalse(in_window(5, parse_window("2-5")))
+        self.assertTrue(in_window(23, parse_window("22-4")))
+        self.assertTrue(in_window(1, parse_window("22-4")))
+        self.assertFalse(in_window(12, parse_window("22-4")))
+
+    def test_admin_storage_report(self):
+        client = TestClient(app)
+        data = client.get("/api/v1/admin/storage").json()
+        self.assertGreater(data["database"]["size_bytes"], 0)
+        self.assertGreaterEqual(data["database"]["jobs"], 6)
+        self.assertIn("max_age_days", data["retention"])
+
+if __name__ == '__main__':
+    unittest.main()
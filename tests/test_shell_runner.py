@@ -0,0 +1,181 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.db.database import create_tables
+from app.plugins.shell_runner import ShellRunnerPlugin, OutputRingBuffer, shell_sessions
+from app.core.job_runner import current_job_id
+from app.core.llm_client import RobustMockLLMClient
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+PRINT_LINES = 'python3 -c "print(chr(10).join(str(i) for i in range({})))"'
+SLEEPER = 'python3 -c "import time; print(1, flush=True); time.sleep(20)"'
+
+@unittest.skipIf(sys.platform == "win32", "uses POSIX shell commands")
+class TestShellRunner(unittest.TestCase):
+    
+    def setUp(self):
+        self.runner = ShellRunnerPlugin()
+        create_tables()
+        self.client = TestClient(app)
+    
+    def test_ring_buffer_keeps_the_tail(self):
+        buffer = OutputRingBuffer(max_lines=3, max_chars=1000)
+        for i in range(10):
+            buffer.append(str(i))
+        self.assertEqual(buffer.text(), "7\n8\n9\n")
+        self.assertEqual((buffer.total_lines, buffer.dropped_lines), (10, 7))
+        
+        buffer = OutputRingBuffer(max_lines=100, max_chars=10)
+        for line in ["aaaa", "bbbb", "cccc"]:
+            buffer.append(line)
+        self.assertEqual(buffer.text(), "bbbb\ncccc\n")
+    
+    def test_output_is_capped(self):
+        result = self.runner.run_shell_command(PRINT_LINES.format(20000))
+        self.assertTrue(result["success"])
+        self.assertEqual(result["output_lines"], 20000)
+        self.assertTrue(result["truncated"])
+        self.assertTrue(result["output"].endswith("19999\n"))
+        self.assertLessEqual(len(result["output"].splitlines()), 500)
+    
+    def test_whitelist_still_applies(self):
+        result = self.runner.run_shell_command("rm -rf /tmp/nothing")
+        self.assertFalse(result["success"])
+        self.assertIn("not whitelisted", result["error"])
+        
+        response = self.client.post("/api/v1/agent/shell/stream", json={"command": "curl example.com"})
+        events = parse_events(response.text)
+        self.assertEqual([e for e, _ in events], ["job", "done"])
+        self.assertFalse(events[-1][1]["success"])
+    
+    def test_injected_commands_are_refused(self):
+        for command in ["echo hi; id", "echo hi && id", "echo hi | sh", "echo `id`", "echo $(id)",
+                        "echo hi > /tmp/deskmate-injected", "echo hi\nid", 'echo "unbalanced']:
+            result = self.runner.run_shell_command(command)
+            self.assertFalse(result["success"], command)
+            self.assertIn("not allowed", result["error"])
+            self.assertFalse(self.runner.is_command_safe(command))
+        self.assertFalse(os.path.exists("/tmp/deskmate-injected"))
+        
+        response = self.client.post("/api/v1/agent/shell/stream", json={"command": "echo hi; id"})
+        events = parse_events(response.text)
+        self.assertEqual([e for e, _ in events], ["job", "done"])
+        self.assertFalse(events[-1][1]["success"])
+    
+    def test_quoted_operators_are_plain_arguments(self):
+        result = self.runner.run_shell_command('echo "a; b | c"')
+        self.assertTrue(result["success"])
+        self.assertEqual(result["output"], "a; b | c\n")
+    
+    def test_cd_is_a_builtin(self):
+        directory = tempfile.mkdtemp()
+        result = self.runner.run_shell_command(f"cd {directory}")
+        self.assertEqual(result["return_code"], 0)
+        self.assertEqual(result["output"], directory + "\n")
+        self.assertIn(directory, result["friendly_message"])
+        
+        result = self.runner.run_shell_command(f"cd {directory}/missing")
+        self.assertEqual(result["return_code"], 1)
+        self.assertIn("No such file or directory", result["error"])
+    
+    def test_unquoted_globs_are_expanded(self):
+        directory = tempfile.mkdtemp()
+        for name in ("a.txt", "b.txt", "c.log"):
+            open(os.path.join(directory, name), "w").close()
+        
+        result = self.runner.run_shell_command(f"ls {directory}/*.txt")
+        self.assertEqual(result["return_code"], 0)
+        self.assertEqual([os.path.basename(line) for line in result["output"].splitlines()], ["a.txt", "b.txt"])
+        
+        # Quoted patterns reach the program untouched, as with a shell
+        result = self.runner.run_shell_command(f'find {directory} -name "*.log"')
+        self.assertEqual(result["output"], os.path.join(directory, "c.log") + "\n")
+        # Patterns that match nothing stay literal
+        self.assertEqual(self.runner.expand_arguments(f"ls {directory}/*.pdf"), ["ls", f"{directory}/*.pdf"])
+    
+    def test_variables_are_not_expanded(self):
+        result = self.runner.run_shell_command("echo $HOME")
+        self.assertEqual(result["output"], "$HOME\n")
+    
+    def test_lines_are_streamed_and_job_persisted(self):
+        response = self.client.post("/api/v1/agent/shell/stream", json={"command": PRINT_LINES.format(3)})
+        events = parse_events(response.text)
+        self.assertEqual(events[1:4], [("stdout", {"line": "0"}), ("stdout", {"line": "1"}), ("stdout", {"line": "2"})])
+        self.assertEqual(events[-1][0], "done")
+        
+        job = self.client.get(f"/api/v1/jobs/{events[0][1]['job_id']}").json()
+        self.assertEqual(job["status"], "completed")
+        self.assertEqual(json.loads(job["result"])["results"][0]["result"]["output"]["output"], "0\n1\n2\n")
+    
+    def test_cancel_by_job_id(self):
+        token = current_job_id.set("shell-cancel-test")
+        timer = threading.Timer(0.5, shell_sessions.cancel, args=("shell-cancel-test",))
+        timer.start()
+        try:
+            start = time.time()
+            result = self.runner.run_shell_command(SLEEPER)
+        finally:
+            current_job_id.reset(token)
+        self.assertLess(time.time() - start, 10)
+        self.assertTrue(result["cancelled"])
+        self.assertEqual(result["output"], "1\n")
+    
+    def test_cancel_stream_through_api(self):
+        command = SLEEPER + " # stream-cancel"
+        
+        def cancel_when_started():
+            deadline = time.time() + 10
+            while time.time() < deadline:
+                running = [j for j in self.client.get("/api/v1/jobs/").json()
+                           if j["command"] == command and shell_sessions.is_running(j["job_id"])]
+                if running:
+                    self.client.post(f"/api/v1/jobs/{running[0]['job_id']}/cancel")
+                    return
+                time.sleep(0.05)
+        
+        canceller = threading.Thread(target=cancel_when_started)
+        canceller.start()
+        start = time.time()
+        response = self.client.post("/api/v1/agent/shell/stream", json={"command": command})
+        canceller.join(10)
+        
+        events = parse_events(response.text)
+        self.assertLess(time.time() - start, 15)
+        self.assertTrue(events[-1][1]["results"][0]["result"]["output"]["cancelled"])
+        job = self.client.get(f"/api/v1/jobs/{events[0][1]['job_id']}").json()
+        self.assertEqual(job["status"], "cancelled")
+
+class TestWindowsShellCommands(unittest.TestCase):
+    
+    def setUp(self):
+        self.runner = ShellRunnerPlugin()
+        self.runner.is_windows = True
+        self.runner._setup_whitelist()
+    
+    def test_mock_parser_commands_pass_the_windows_checks(self):
+        parser = RobustMockLLMClient()
+        for request in ("show pwd", "whoami", "list files", "open terminal"):
+            command = parser._determine_shell_command(request, is_windows=True)
+            self.assertIsNone(self.runner.check_command(command), command)
+        self.assertEqual(self.runner._translate_unix_to_windows("pwd"), "echo %CD%")
+
+if __name__ == '__main__':
+    unittest.main()
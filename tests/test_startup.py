@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.core.agent_core import DeskMateAgent
+from app.core.executor import ActionExecutor
+from benchmarks.startup import HEAVY_MODULES, ROOT, scratch_env
+
+# Imports the app in a fresh interpreter; the lifespan only runs inside the TestClient block
+STARTUP_PROBE = """
+import sys, os, json
+import app.main
+heavy = [m for m in %r if m in sys.modules]
+db_path = os.environ["DESKMATE_DATABASE_URL"].replace("sqlite:///", "")
+db_at_import = os.path.exists(db_path)
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+from app.db.database import engine
+with TestClient(app.main.app) as client:
+    status = client.get("/health").status_code
+    tables = inspect(engine).get_table_names()
+print(json.dumps({"heavy": heavy, "db_at_import": db_at_import, "status": status, "tables": tables}))
+""" % (HEAVY_MODULES,)
+
+class TestStartup(unittest.TestCase):
+
+    def test_import_is_light_and_tables_are_created_on_startup(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            output = subprocess.run([sys.executable, "-c", STARTUP_PROBE], cwd=ROOT, env=scratch_env(workdir),
+                                    capture_output=True, text=True, timeout=120, check=True).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        self.assertEqual(probe["heavy"], [])
+        self.assertFalse(probe["db_at_import"])
+        self.assertEqual(probe["status"], 200)
+        self.assertIn("jobs", probe["tables"])
+
+    def test_plugins_are_built_once_on_first_use(self):
+        executor = ActionExecutor()
+        self.assertNotIn("file_reader", executor.__dict__)
+        reader = executor.file_reader
+        self.assertIs(executor.file_reader, reader)
+        with self.assertRaises(AttributeError):
+            executor.not_a_plugin
+
+    def test_agent_builds_its_intent_parser_lazily(self):
+        agent = DeskMateAgent()
+        self.assertIsNone(agent._llm_client)
+        self.assertIs(agent.llm_client, agent.llm_client)
+
+    def test_warm_builds_the_intent_parser(self):
+        agent = DeskMateAgent()
+        agent.warm()
+        self.assertIsNotNone(agent._llm_client)
+
+if __name__ == '__main__':
+    unittest.main()
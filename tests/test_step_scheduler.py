@@ -0,0 +1,80 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+import threading
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.core.agent_core import DeskMateAgent
+from app.core.schema import Intent, ExecutionResult
+
+class SlowExecutor:
+    """Executor stand-in: every step sleeps, steps named 'fail' fail"""
+    
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.executed = []
+        self._lock = threading.Lock()
+    
+    def execute_step(self, step):
+        time.sleep(self.delay)
+        with self._lock:
+            self.executed.append(step.params["name"])
+        success = step.params["name"] != "fail"
+        return ExecutionResult(success=success, output={"message": step.params["name"]}, error=None if success else "failed")
+
+class FixedPlanClient:
+    def __init__(self, steps):
+        self.steps = steps
+    
+    def parse_intent(self, command):
+        return Intent(intent="multi", steps=self.steps)
+
+def make_agent(steps, executor):
+    agent = DeskMateAgent()
+    agent.llm_client = FixedPlanClient(steps)
+    agent.executor = executor
+    return agent
+
+class TestStepScheduler(unittest.TestCase):
+    
+    def test_independent_steps_run_concurrently(self):
+        """Three independent 0.2s steps take about as long as one"""
+        steps = [{"action": "open_url", "params": {"name": n}, "depends_on": []} for n in "abc"]
+        agent = make_agent(steps, SlowExecutor())
+        
+        start = time.time()
+        result = agent.process_command("open three sites")
+        self.assertLess(time.time() - start, 0.5)
+        self.assertTrue(result["success"])
+        self.assertEqual([r["params"]["name"] for r in result["results"]], ["a", "b", "c"])
+    
+    def test_plans_without_dependencies_stay_sequential(self):
+        """Legacy plans still stop at the first failure"""
+        steps = [{"action": "x", "params": {"name": n}} for n in ["a", "fail", "c"]]
+        executor = SlowExecutor(delay=0)
+        result = make_agent(steps, executor).process_command("chain")
+        
+        self.assertFalse(result["success"])
+        self.assertEqual(executor.executed, ["a", "fail"])
+        self.assertEqual(len(result["results"]), 2)
+    
+    def test_failure_only_stops_dependent_chain(self):
+        steps = [
+            {"action": "x", "params": {"name": "fail"}, "depends_on": []},
+            {"action": "x", "params": {"name": "after_fail"}, "depends_on": [0]},
+            {"action": "x", "params": {"name": "independent"}, "depends_on": []},
+        ]
+        executor = SlowExecutor(delay=0.01)
+        result = make_agent(steps, executor).process_command("mixed")
+        
+        self.assertFalse(result["success"])
+        self.assertEqual(sorted(executor.executed), ["fail", "independent"])
+
+if __name__ == '__main__':
+    unittest.main()
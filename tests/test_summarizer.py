@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from app.core.summarizer import ExtractiveSummarizer, split_sentences, sentences_for
+from app.plugins.file_reader import FileReaderPlugin
+from benchmarks.fixtures import synthetic_report
+
+class TestSummarizer(unittest.TestCase):
+    
+    def test_sentence_segmentation(self):
+        text = 'Dr. Smith said "Stop." Then he left!\n\nA heading without a period\nWhat next? See Fig. 2 now.'
+        self.assertEqual(split_sentences(text), [
+            'Dr. Smith said "Stop."',
+            "Then he left!",
+            "A heading without a period What next?",
+            "See Fig. 2 now."
+        ])
+    
+    def test_picks_central_sentences_in_order(self):
+        """Sentences that share vocabulary with the rest of the document outrank off-topic ones"""
+        sentences = [
+            "Quarterly revenue grew strongly across every sales region this quarter.",
+            "The office plants were watered on Tuesday by the facilities crew.",
+            "Sales growth drove revenue above the quarterly forecast for the region.",
+            "Revenue from sales in each region beat the forecast again.",
+            "Parking permits renew automatically in the spring season.",
+            "The forecast expects revenue and sales growth to continue next quarter.",
+        ]
+        result = ExtractiveSummarizer().summarize(" ".join(sentences), max_sentences=2)
+        self.assertEqual(len(result["selected"]), 2)
+        self.assertEqual(result["selected"], sorted(result["selected"]))
+        self.assertNotIn(1, result["selected"])
+        self.assertNotIn(4, result["selected"])
+    
+    def test_chunked_mode_matches_shape(self):
+        text = synthetic_report(5000)
+        summarizer = ExtractiveSummarizer(chunk_sentences=50)
+        result = summarizer.summarize(text, max_sentences=4)
+        self.assertEqual(len(result["selected"]), 4)
+        self.assertEqual(result["selected"], sorted(result["selected"]))
+        self.assertGreater(result["sentence_count"], 50)
+    
+    def test_summarize_text(self):
+        reader = FileReaderPlugin()
+        self.assertFalse(reader.summarize_text("   ")["success"])
+        self.assertEqual(reader.summarize_text("Short note.")["summary"], "Short note.")
+        
+        text = synthetic_report(20000)
+        short = reader.summarize_text(text, "short")
+        detailed = reader.summarize_text(text, "detailed")
+        self.assertTrue(short["success"])
+        self.assertEqual(short["method"], "extractive")
+        self.assertGreater(short["original_length"], 19000)
+        self.assertLess(short["summary_length"], detailed["summary_length"])
+        self.assertEqual(sentences_for("short", 20000), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import asyncio
+import io
+import os
+import sys
+import tempfile
+
+# Add the app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DESKMATE_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/deskmate_test.db")
+os.environ.setdefault("DESKMATE_UPLOAD_DIR", tempfile.mkdtemp())
+
+from fastapi import FastAPI, UploadFile, File
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.files import UploadSizeLimit
+from app.db.database import create_tables
+from app.core.upload_store import UploadTooLarge, store_upload, resolve_upload_path
+
+class TestUploads(unittest.TestCase):
+    
+    def setUp(self):
+        create_tables()
+        self.client = TestClient(app)
+    
+    def test_duplicate_content_is_stored_once(self):
+        """Identical bytes under two names share one content-addressed file"""
+        first = self.client.post("/api/v1/files/upload", files={"file": ("a.txt", b"same bytes", "text/plain")}).json()
+        second = self.client.post("/api/v1/files/upload", files={"file": ("b.txt", b"same bytes", "text/plain")}).json()
+        
+        self.assertFalse(first["duplicate"])
+        self.assertTrue(second["duplicate"])
+        self.assertEqual(first["file_path"], second["file_path"])
+        self.assertIn(os.path.join(first["content_hash"][:2], first["content_hash"][2:4]), first["file_path"])
+        
+        # Same name, new content no longer overwrites the earlier upload
+        third = self.client.post("/api/v1/files/upload", files={"file": ("a.txt", b"new bytes", "text/plain")}).json()
+        self.assertNotEqual(third["file_path"], first["file_path"])
+        self.assertTrue(os.path.exists(first["file_path"]))
+        self.assertEqual(resolve_upload_path("uploads/A.txt"), third["file_path"])
+    
+    def test_oversized_spooled_upload_is_refused(self):
+        upload_dir = tempfile.mkdtemp()
+        upload = UploadFile(file=io.BytesIO(b"x" * 5000), filename="big.txt")
+        with self.assertRaises(UploadTooLarge):
+            asyncio.run(store_upload(upload, ".txt", upload_dir=upload_dir, max_bytes=1024))
+        self.assertEqual(os.listdir(os.path.join(upload_dir, ".tmp")), [])
+
+class TestUploadSizeLimit(unittest.TestCase):
+    
+    def setUp(self):
+        self.reached = []
+        limited = FastAPI()
+        
+        @limited.post("/api/v1/files/upload")
+        async def upload(file: UploadFile = File(...)):
+            self.reached.append(file.filename)
+            return {"ok": True}
+        
+        limited.add_middleware(UploadSizeLimit, max_bytes=4096)
+        self.client = TestClient(limited)
+    
+    def test_chunked_body_is_cut_off_before_the_endpoint(self):
+        """No Content-Length: the limit is applied to the bytes as they arrive"""
+        def body():
+            yield b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"big.txt\"\r\n\r\n"
+            for _ in range(10):
+                yield b"x" * 1024
+            yield b"\r\n--b--\r\n"
+        response = self.client.post("/api/v1/files/upload", content=body(),
+                                    headers={"Content-Type": "multipart/form-data; boundary=b"})
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.reached, [])
+    
+    def test_declared_size_is_refused_up_front(self):
+        response = self.client.post("/api/v1/files/upload", files={"file": ("big.txt", b"x" * 8192, "text/plain")})
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.reached, [])
+    
+    def test_small_upload_passes(self):
+        response = self.client.post("/api/v1/files/upload", files={"file": ("small.txt", b"x" * 100, "text/plain")})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.reached, ["small.txt"])
+
+if __name__ == '__main__':
+    unittest.main()